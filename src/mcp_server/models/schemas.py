@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List, Literal
-from datetime import datetime
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Dict, Optional, List, Literal, Union
+from datetime import date, datetime
 
 
 class AddInput(BaseModel):
@@ -46,7 +46,240 @@ class ModInput(BaseModel):
 
 
 class FactorialInput(BaseModel):
-    n: int = Field(..., ge=0, le=20, description="Number to calculate factorial (0-20)")
+    n: int = Field(..., ge=0, le=500_000, description="Number to calculate factorial (0-500,000)")
+    output: Literal["auto", "exact", "summary"] = Field(
+        "auto", description="exact integer, summary (digits, log10, leading/trailing digits), or auto by size"
+    )
+
+
+class CombinatoricsInput(BaseModel):
+    n: int = Field(..., ge=0, le=1_000_000_000, description="Total number of items")
+    r: int = Field(..., ge=0, description="Number of items chosen")
+    output: Literal["auto", "exact", "summary"] = Field(
+        "auto", description="exact integer, summary (ln, log10, digits, scientific), or auto by size"
+    )
+
+    @field_validator("r")
+    @classmethod
+    def validate_r(cls, v, info):
+        n = info.data.get("n")
+        if n is not None and v > n:
+            raise ValueError("r cannot be greater than n")
+        return v
+
+
+def _non_empty_points(v):
+    if isinstance(v, list) and len(v) == 0:
+        raise ValueError("At least one point is required")
+    return v
+
+
+class BinomialInput(BaseModel):
+    n: int = Field(..., ge=0, le=1_000_000_000, description="Number of trials")
+    p: float = Field(..., ge=0, le=1, description="Success probability per trial")
+    k: Union[int, List[int]] = Field(..., description="Number(s) of successes")
+
+    @field_validator("k")
+    @classmethod
+    def validate_k(cls, v):
+        return _non_empty_points(v)
+
+
+class PoissonInput(BaseModel):
+    lam: float = Field(..., gt=0, le=1e9, description="Expected number of events")
+    k: Union[int, List[int]] = Field(..., description="Number(s) of events")
+
+    @field_validator("k")
+    @classmethod
+    def validate_k(cls, v):
+        return _non_empty_points(v)
+
+
+class NormalInput(BaseModel):
+    x: Union[float, List[float]] = Field(..., description="Point(s) to evaluate")
+    mean: float = Field(0.0, description="Mean of the distribution")
+    std: float = Field(1.0, gt=0, description="Standard deviation of the distribution")
+
+    @field_validator("x")
+    @classmethod
+    def validate_x(cls, v):
+        return _non_empty_points(v)
+
+
+class NormalPpfInput(BaseModel):
+    q: Union[float, List[float]] = Field(..., description="Cumulative probability(ies), strictly between 0 and 1")
+    mean: float = Field(0.0, description="Mean of the distribution")
+    std: float = Field(1.0, gt=0, description="Standard deviation of the distribution")
+
+    @field_validator("q")
+    @classmethod
+    def validate_q(cls, v):
+        return _non_empty_points(v)
+
+
+class SimulateInput(BaseModel):
+    """Sampling experiment for Monte Carlo simulation."""
+    experiment: Literal["dice", "draw", "binomial", "discrete"] = Field(..., description="Kind of experiment")
+    trials: int = Field(100_000, ge=1, le=100_000_000, description="Number of trials")
+    seed: Optional[int] = Field(None, description="Seed for reproducible results")
+    dice: int = Field(1, ge=1, le=100, description="dice: number of dice rolled per trial")
+    sides: int = Field(6, ge=2, le=1_000_000, description="dice: sides per die")
+    n: int = Field(1, ge=0, le=1_000_000, description="binomial: trials per experiment")
+    p: float = Field(0.5, ge=0, le=1, description="binomial: success probability")
+    values: Optional[List[float]] = Field(None, min_length=1, max_length=100_000, description="draw / discrete: possible values")
+    weights: Optional[List[float]] = Field(None, description="discrete: relative weight of each value")
+    draws: int = Field(1, ge=1, le=1000, description="draw / discrete: values drawn (and summed) per trial")
+    replace: bool = Field(True, description="draw: sample with replacement")
+
+    @model_validator(mode="after")
+    def validate_experiment(self):
+        if self.experiment in ("draw", "discrete") and self.values is None:
+            raise ValueError(f"{self.experiment} requires values")
+        if self.experiment == "draw" and not self.replace and self.draws > len(self.values):
+            raise ValueError("Cannot draw more values than available without replacement")
+        if self.experiment == "discrete":
+            if self.weights is None or len(self.weights) != len(self.values):
+                raise ValueError("discrete requires one weight per value")
+            if any(w < 0 for w in self.weights) or sum(self.weights) <= 0:
+                raise ValueError("Weights must be non-negative with a positive total")
+        return self
+
+
+class AmortizationInput(BaseModel):
+    """Loan for amortization schedule generation."""
+    principal: float = Field(..., gt=0, le=1e12, description="Amount borrowed")
+    annual_rate: float = Field(..., ge=0, le=100, description="Annual interest rate in percent")
+    term_years: int = Field(..., ge=1, le=50, description="Loan term in years")
+    payments_per_year: Literal[1, 2, 4, 12, 24, 26, 52] = Field(12, description="Payment frequency")
+    extra_payment: float = Field(0.0, ge=0, description="Extra principal paid every period")
+    output: Literal["rows", "columns", "summary"] = Field("rows", description="Schedule as rows, as columns, or totals only")
+    offset: int = Field(0, ge=0, description="Number of periods to skip")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of periods to return (default: all)")
+
+
+class LoanComparisonInput(BaseModel):
+    """Grids of loan terms; every combination is one scenario."""
+    principals: List[float] = Field(..., min_length=1, max_length=1000, description="Amounts borrowed")
+    annual_rates: List[float] = Field(..., min_length=1, max_length=1000, description="Annual interest rates in percent")
+    term_years: List[int] = Field(..., min_length=1, max_length=50, description="Loan terms in years")
+    extra_payments: List[float] = Field([0.0], min_length=1, max_length=1000, description="Extra principal paid every period")
+    payments_per_year: Literal[1, 2, 4, 12, 24, 26, 52] = Field(12, description="Payment frequency")
+    output: Literal["rows", "columns"] = Field("rows", description="Scenarios as rows or as columns")
+
+    @model_validator(mode="after")
+    def validate_grid(self):
+        if any(not 0 < p <= 1e12 for p in self.principals):
+            raise ValueError("Principals must be positive")
+        if any(not 0 <= r <= 100 for r in self.annual_rates):
+            raise ValueError("Annual rates must be between 0 and 100")
+        if any(not 1 <= t <= 50 for t in self.term_years):
+            raise ValueError("Terms must be between 1 and 50 years")
+        if any(e < 0 for e in self.extra_payments):
+            raise ValueError("Extra payments cannot be negative")
+        count = len(self.principals) * len(self.annual_rates) * len(self.term_years) * len(self.extra_payments)
+        if count > 100_000:
+            raise ValueError(f"Grid has {count} scenarios, more than 100000")
+        return self
+
+
+def _cashflow_series(v):
+    series = v if v and isinstance(v[0], list) else [v]
+    if not series or any(not item for item in series):
+        raise ValueError("Cash flows must not be empty")
+    return v
+
+
+class NpvInput(BaseModel):
+    rate: float = Field(..., gt=-1, description="Discount rate per period (0.05 = 5%)")
+    cashflows: Union[List[float], List[List[float]]] = Field(..., max_length=100_000, description="Cash flows at periods 0, 1, 2, ... (or a list of such series)")
+
+    @field_validator("cashflows")
+    @classmethod
+    def validate_cashflows(cls, v):
+        return _cashflow_series(v)
+
+
+class IrrInput(BaseModel):
+    cashflows: Union[List[float], List[List[float]]] = Field(..., max_length=100_000, description="Cash flows at periods 0, 1, 2, ... (or a list of such series)")
+    guess: float = Field(0.1, gt=-1, description="Starting rate for the search")
+
+    @field_validator("cashflows")
+    @classmethod
+    def validate_cashflows(cls, v):
+        return _cashflow_series(v)
+
+
+class XirrInput(BaseModel):
+    cashflows: Union[List[float], List[List[float]]] = Field(..., max_length=100_000, description="Cash flows (or a list of such series)")
+    dates: Union[List[date], List[List[date]]] = Field(..., max_length=100_000, description="Date of each cash flow (or one list per series)")
+    guess: float = Field(0.1, gt=-1, description="Starting annual rate for the search")
+
+    @field_validator("cashflows")
+    @classmethod
+    def validate_cashflows(cls, v):
+        return _cashflow_series(v)
+
+
+class PmtInput(BaseModel):
+    rate: float = Field(..., gt=-1, description="Interest rate per period (0.05 = 5%)")
+    nper: float = Field(..., gt=0, description="Number of periods")
+    pv: float = Field(..., description="Present value (amount borrowed is positive)")
+    fv: float = Field(0.0, description="Value left after the last payment")
+    when: Literal["end", "begin"] = Field("end", description="Payments at the end or beginning of each period")
+
+
+class FvInput(BaseModel):
+    rate: float = Field(..., gt=-1, description="Interest rate per period (0.05 = 5%)")
+    nper: float = Field(..., gt=0, description="Number of periods")
+    pmt: float = Field(..., description="Payment per period (paid out is negative)")
+    pv: float = Field(0.0, description="Present value (paid out is negative)")
+    when: Literal["end", "begin"] = Field("end", description="Payments at the end or beginning of each period")
+
+
+class PvInput(BaseModel):
+    rate: float = Field(..., gt=-1, description="Interest rate per period (0.05 = 5%)")
+    nper: float = Field(..., gt=0, description="Number of periods")
+    pmt: float = Field(..., description="Payment per period (received is positive)")
+    fv: float = Field(0.0, description="Value at the end")
+    when: Literal["end", "begin"] = Field("end", description="Payments at the end or beginning of each period")
+
+
+class NperInput(BaseModel):
+    rate: float = Field(..., gt=-1, description="Interest rate per period (0.05 = 5%)")
+    pmt: float = Field(..., description="Payment per period (paid out is negative)")
+    pv: float = Field(..., description="Present value")
+    fv: float = Field(0.0, description="Target value at the end")
+    when: Literal["end", "begin"] = Field("end", description="Payments at the end or beginning of each period")
+
+
+class CompoundGrowthInput(BaseModel):
+    """Compound-interest projection."""
+    principal: float = Field(..., ge=0, le=1e12, description="Starting balance")
+    annual_rate: float = Field(..., gt=-100, le=100, description="Annual interest rate in percent")
+    years: float = Field(..., gt=0, le=100, description="Projection length in years")
+    compounding: Literal["annually", "semiannually", "quarterly", "monthly", "weekly", "daily", "continuous"] = Field(
+        "monthly", description="Compounding frequency"
+    )
+    contribution: float = Field(0.0, description="Amount added every compounding period (every month for continuous)")
+    when: Literal["end", "begin"] = Field("end", description="Contributions at the end or beginning of each period")
+    downsample: Optional[int] = Field(None, ge=2, le=100_000, description="Maximum number of points in the series")
+
+
+class ConvertInput(BaseModel):
+    value: Union[float, List[float]] = Field(..., description="Value(s) to convert")
+    from_unit: str = Field(..., min_length=1, description="Unit of the value, e.g. 'km' or 'fahrenheit'")
+    to_unit: str = Field(..., min_length=1, description="Unit to convert to")
+
+    @field_validator("value")
+    @classmethod
+    def validate_value(cls, v):
+        return _non_empty_points(v)
+
+
+class PackedNumbers(BaseModel):
+    """Data points packed into one string (see tools.packed)."""
+    data: str = Field(..., min_length=1, description="Base64 of little-endian float64 values, or delimited decimal text")
+    encoding: Literal["base64", "text"] = Field("base64", description="base64 (float64 bytes) or text (comma/whitespace separated)")
 
 
 class StatisticsInput(BaseModel):
@@ -54,9 +287,9 @@ class StatisticsInput(BaseModel):
     numbers: Optional[List[float]] = Field(None, min_length=1, description="Alternative field name for data points")
     
     def __init__(self, **data):
-        # Handle both 'data' and 'numbers' fields
+        # Handle both 'data' and 'numbers' fields; keep one copy under 'data'
         if "numbers" in data and "data" not in data:
-            data["data"] = data["numbers"]
+            data["data"] = data.pop("numbers")
         super().__init__(**data)
     
     @field_validator("data")
@@ -72,14 +305,37 @@ class CalculationRecord(BaseModel):
     id: str
     operation: str
     inputs: dict
-    result: float
+    result: Any = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     error: Optional[str] = None
 
 
+class BatchOperation(BaseModel):
+    """One operation in a batch: a tool name and that tool's arguments."""
+    op: str = Field(..., description="Tool name, e.g. 'add' or 'percentile'")
+    args: Dict[str, Any] = Field(default_factory=dict, description="Arguments as the tool takes them")
+
+
 class BatchCalculationInput(BaseModel):
-    numbers: List[float] = Field(..., min_length=2, description="List of numbers to operate on")
-    operation: Literal["sum", "product"] = Field(..., description="Batch operation type")
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=1000, description="Operations to run")
+
+
+class PipelineInput(BaseModel):
+    steps: Dict[str, Union[List[Any], BatchOperation]] = Field(
+        ..., min_length=1, max_length=500,
+        description="Named steps: [op, arg, ...] or {op, args}; arguments may reference '$name'"
+    )
+    inputs: Dict[str, Union[float, List[float]]] = Field(default_factory=dict, description="Named input values referenced as '$name'")
+
+    @field_validator("steps")
+    @classmethod
+    def validate_steps(cls, v):
+        for name, spec in v.items():
+            if not name or "$" in name or "." in name:
+                raise ValueError(f"Invalid step name: {name!r}")
+            if isinstance(spec, list) and (not spec or not isinstance(spec[0], str)):
+                raise ValueError(f"Step {name} must start with an operation name")
+        return v
 
 
 class EquationInput(BaseModel):
@@ -95,4 +351,94 @@ class EquationInput(BaseModel):
             raise ValueError("Linear equation requires exactly 2 coefficients")
         elif equation_type == "quadratic" and len(v) != 3:
             raise ValueError("Quadratic equation requires exactly 3 coefficients")
-        return v
\ No newline at end of file
+        return v
+
+
+class DatasetUploadInput(BaseModel):
+    numbers: List[float] = Field(..., min_length=1, description="Data points to store on the server")
+
+
+class DatasetAppendInput(BaseModel):
+    dataset_id: str = Field(..., description="Handle returned by upload_dataset")
+    numbers: List[float] = Field(..., min_length=1, description="Data points to append")
+
+
+class DatasetRefInput(BaseModel):
+    dataset_id: str = Field(..., description="Handle returned by upload_dataset")
+
+
+class StreamOpenInput(BaseModel):
+    higher_moments: bool = Field(False, description="Also track skewness and kurtosis")
+    quantiles: bool = Field(False, description="Also keep a t-digest for approximate percentiles")
+    compression: float = Field(100, ge=20, le=1000, description="t-digest compression; higher is more accurate")
+    top_k: Optional[int] = Field(None, ge=1, le=10000, description="Track this many heavy hitters (Space-Saving)")
+    distinct: bool = Field(False, description="Also estimate the number of distinct values (HyperLogLog)")
+    precision: int = Field(12, ge=4, le=16, description="HyperLogLog precision; 2^precision bytes of registers")
+
+
+class StreamPushInput(BaseModel):
+    stream_id: str = Field(..., description="Handle returned by stats_stream_open")
+    numbers: List[float] = Field(..., min_length=1, description="Data points to add")
+
+
+class StreamRefInput(BaseModel):
+    stream_id: str = Field(..., description="Handle returned by stats_stream_open")
+
+
+class StreamPercentileInput(BaseModel):
+    stream_id: str = Field(..., description="Handle returned by stats_stream_open")
+    p: Union[float, List[float]] = Field(..., description="Percentile(s) between 0 and 100")
+
+    @field_validator("p")
+    @classmethod
+    def validate_p(cls, v):
+        values = v if isinstance(v, list) else [v]
+        if not values or any(not 0 <= p <= 100 for p in values):
+            raise ValueError("Percentile must be between 0 and 100")
+        return v
+
+
+class StreamFrequenciesInput(BaseModel):
+    stream_id: str = Field(..., description="Handle returned by stats_stream_open")
+    k: Optional[int] = Field(None, ge=1, description="Number of heavy hitters to return (default: all tracked)")
+
+
+class StreamImportInput(BaseModel):
+    state: Dict[str, Any] = Field(..., description="Result of stats_stream_export")
+
+    @field_validator("state")
+    @classmethod
+    def validate_state(cls, v):
+        if "moments" not in v:
+            raise ValueError("Stream state needs a 'moments' entry")
+        return v
+
+
+class StreamMergeInput(BaseModel):
+    stream_ids: List[str] = Field(..., min_length=2, description="Streams to combine")
+
+
+class HistoryQueryInput(BaseModel):
+    operation: Optional[str] = Field(None, description="Only include calls to this tool")
+    since: Optional[datetime] = Field(None, description="Only include calls at or after this time")
+    until: Optional[datetime] = Field(None, description="Only include calls at or before this time")
+    offset: int = Field(0, ge=0, description="Number of matching records to skip (newest first)")
+    limit: int = Field(50, ge=1, le=500, description="Maximum number of records to return")
+
+
+class EvaluateInput(BaseModel):
+    expression: str = Field(..., min_length=1, max_length=2000, description="Arithmetic expression to evaluate")
+    variables: Dict[str, float] = Field(default_factory=dict, description="Values for named variables in the expression")
+
+
+class ElementwiseInput(BaseModel):
+    """Operands for element-wise tools; scalars broadcast against lists."""
+    a: Union[List[float], float] = Field(..., description="First operand (list or number)")
+    b: Union[List[float], float] = Field(..., description="Second operand (list or number)")
+
+    @field_validator("a", "b")
+    @classmethod
+    def validate_not_empty(cls, v):
+        if isinstance(v, list) and len(v) == 0:
+            raise ValueError("Operand lists must not be empty")
+        return v
@@ -29,4 +29,13 @@ Instructions - Use MCP tools for all calculations:
 Formula reminder: A = P(1 + r)^t
 Where: A = final amount, P = principal, r = rate (decimal), t = time
 
-Please use the MCP tools (add, subtract, multiply, divide, power) for ALL calculations."""
+Please use the MCP tools (add, subtract, multiply, divide, power) for ALL calculations.
+To verify the final amount in a single call, use:
+evaluate("P * power(1 + r / 100, t)", {{"P": {principal}, "r": {rate}, "t": {time}}})
+or, with the finance tools (rates as decimals, money paid out negative):
+fv({rate / 100}, {time}, 0, -{principal})
+For step 3, pmt({rate / 100} / 12, {time * 12}, 0, final_amount) gives the monthly deposit (negative = paid in).
+npv, irr, xirr, pv and nper cover other cash-flow questions.
+For the year-by-year balance (e.g. to chart it), use:
+compound_growth({principal}, {rate}, {time}, compounding="annually")
+(compounding may also be "monthly", "quarterly", "daily" or "continuous"; add contribution= for regular deposits)"""
@@ -41,9 +41,10 @@ Don't execute or run any of them.
    - Calculate remainder (余数) when a is divided by b
    - Example: `mod(10, 3)` → `1`
 
-8. **factorial(n: int) -> int**
+8. **factorial(n: int, output: str = "auto") -> int | dict**
    - Calculate factorial of n with progress reporting
-   - Supports n from 0 to 20
+   - Supports n from 0 to 500,000; large n run in worker processes
+   - output: "exact" integer, "summary" (digits, log10, leading digits, trailing zeros, last non-zero digits), or "auto" (summary beyond 4300 digits)
    - Example: `factorial(5)` → `120`
 
 ### Statistical Operations - Basic
@@ -89,9 +90,10 @@ Don't execute or run any of them.
     - Example: `mode([1, 2, 2, 3, 2])` → `2`
 
 ### Statistical Operations - Advanced
-19. **percentile(numbers: List[float], p: float) -> float**
+19. **percentile(numbers: List[float], p: float, approximate: bool = False) -> float**
     - Calculate the pth percentile of a dataset
     - Parameter `p` must be between 0 and 100
+    - `approximate=True` answers from a t-digest sketch (typically within 0.1 percentile points), cached for stored datasets
     - Example: `percentile([1, 2, 3, 4, 5], 50)` → `3.0`
 
 20. **quartiles(numbers: List[float]) -> dict**
@@ -114,6 +116,225 @@ Don't execute or run any of them.
     - Useful for averaging rates
     - Example: `harmonic_mean([1, 2, 4])` → `1.71`
 
+24. **describe(numbers: List[float], stats: List[str] = None) -> dict**
+    - Calculate several summary statistics in one call (single scan, one sort)
+    - `stats` selects from count, sum, mean, median, stddev, variance, min_value, max_value, range_stat, quartiles, iqr (default: all)
+    - Example: `describe([1, 2, 3, 4, 5], ["mean", "iqr"])` → `{"mean": 3.0, "iqr": 2.0}`
+
+### Dataset Management
+Every statistical tool accepts either `numbers` or a `dataset_id` returned by `upload_dataset`.
+
+25. **upload_dataset(numbers: List[float]) -> dict**
+    - Store a dataset on the server once and reference it by handle
+    - Identical uploads return the same `dataset_id`
+    - Example: `upload_dataset([1, 2, 3])` → `{"dataset_id": "5ee17353...", "count": 3, ...}`
+
+26. **append_dataset(dataset_id: str, numbers: List[float]) -> dict**
+    - Append data points to a stored dataset
+    - Example: `append_dataset("5ee17353...", [4, 5])` → `{"count": 5, ...}`
+
+27. **drop_dataset(dataset_id: str) -> dict**
+    - Remove a stored dataset and free its memory
+    - Example: `drop_dataset("5ee17353...")` → `{"status": "dropped", ...}`
+
+28. **summary_cache_stats() -> dict**
+    - Report hit/miss counters and memory use of the per-dataset summary cache
+    - Repeated statistics on a stored dataset reuse cached sums, extremes and the sorted view
+    - Example: `summary_cache_stats()` → `{"entries": 1, "hits": 2, "misses": 3, ...}`
+
+### Calculation History
+29. **query_history(operation: str = None, since: str = None, until: str = None, offset: int = 0, limit: int = 50) -> dict**
+    - Page through past tool calls (newest first), including failed ones
+    - Filter by tool name and ISO 8601 time range; keeps the last MAX_HISTORY_SIZE calls
+    - Example: `query_history(operation="add", limit=2)` → `{"total": 5, "records": [...]}`
+
+### Expression Evaluation
+30. **evaluate(expression: str, variables: dict = None) -> float**
+    - Evaluate a whole formula in one call instead of chaining tool calls
+    - Supports + - * / % ** (or ^), parentheses, pi, e, named variables and the functions add, subtract, multiply, divide, power, root, sqrt, mod, factorial, abs, min, max
+    - Compiled formulas are cached, so re-evaluating with new variables is cheap
+    - Example: `evaluate("P * power(1 + r, t)", {"P": 10000, "r": 0.05, "t": 3})` → `11576.25`
+
+### Element-wise Arithmetic
+Each operand may be a list or a number; a number (or one-element list) is broadcast against the other list.
+
+31. **add_many(a: list | float, b: list | float) -> list**
+    - Example: `add_many([1, 2, 3], [10, 20, 30])` → `[11, 22, 33]`
+
+32. **subtract_many(a: list | float, b: list | float) -> list**
+    - Example: `subtract_many([10, 20], 1)` → `[9, 19]`
+
+33. **multiply_many(a: list | float, b: list | float) -> list**
+    - Example: `multiply_many([1, 2, 3], 1.5)` → `[1.5, 3.0, 4.5]`
+
+34. **divide_many(a: list | float, b: list | float) -> dict**
+    - Zero divisors give None in `result` and True in the `errors` mask instead of failing the call
+    - Example: `divide_many([10, 5], [2, 0])` → `{"result": [5.0, null], "errors": [false, true], "status": "partial", ...}`
+
+35. **power_many(base: list | float, exponent: list | float) -> list**
+    - Example: `power_many([2, 3, 4], 2)` → `[4.0, 9.0, 16.0]`
+
+36. **root_many(numbers: list | float, n: list | float = 2) -> list**
+    - Example: `root_many([16, 27], [2, 3])` → `[4.0, 3.0]`
+
+### Batch Execution
+37. **batch(operations: list) -> dict**
+    - Run many operations in one request; each item is `{"op": tool name, "args": {...}}` with the tool's own argument names
+    - Supports the arithmetic, element-wise, statistics (numbers or dataset_id), evaluate, combinatorics, distribution, finance (npv, irr, pmt, fv, pv, nper) and convert tools
+    - Results come back in request order; a failing item reports its error without affecting the others
+    - Example: `batch([{"op": "add", "args": {"a": 1, "b": 2}}, {"op": "divide", "args": {"a": 1, "b": 0}}])` → `{"results": [{"index": 0, "result": 3.0, ...}, {"index": 1, "error": "Division by zero", ...}], "status": "partial"}`
+
+38. **pipeline(steps: dict, inputs: dict = None) -> dict**
+    - Run a graph of dependent calculations in one call and get every intermediate result back
+    - Steps are `[op, arg, ...]` (tool's argument order) or `{"op": ..., "args": {...}}`; arguments may reference `"$name"` or `"$name.key"`
+    - Independent steps run concurrently; identical steps are computed once; a failed step only fails its dependents
+    - Example: `pipeline({"cf": ["power", "$g", 360], "den": ["subtract", "$cf", 1]}, {"g": 1.005})` → `{"results": {"cf": 6.0226, "den": 5.0226}, ...}`
+
+### Combinatorics
+39. **permutations(n: int, r: int, output: str = "auto") -> int | dict**
+    - Ordered arrangements P(n,r) = n!/(n-r)! from cached factorial tables
+    - Results over 4300 digits return `{ln, log10, digits, scientific}` (output="auto"/"summary")
+    - Example: `permutations(10, 3)` → `720`
+
+40. **combinations(n: int, r: int, output: str = "auto") -> int | dict**
+    - Unordered selections C(n,r) = n!/[r!(n-r)!]
+    - Example: `combinations(12, 5)` → `792`
+
+41. **log_comb(n: int, r: int) -> float**
+    - Natural logarithm of C(n,r) for n up to 10^9, from a log-factorial table
+    - Example: `log_comb(1000000, 500000)` → `693140.047...`
+
+### Probability Distributions
+Every point argument accepts a single value or a list; a list returns a list of the same length.
+
+42. **binomial_pmf(n: int, p: float, k: int | list) -> float | list**
+    - P(X=k) = C(n,k) p^k (1-p)^(n-k), computed in log space (stable for any n up to 10^9)
+    - Example: `binomial_pmf(20, 0.8, 15)` → `0.1746`
+
+43. **binomial_cdf(n: int, p: float, k: int | list) -> float | list**
+    - P(X<=k); a whole distribution of 10^5 points comes back in one call
+    - Example: `binomial_cdf(10, 0.5, 5)` → `0.6230`
+
+44. **poisson_pmf(lam: float, k: int | list) -> float | list**
+    - P(X=k) = lam^k e^-lam / k!
+    - Example: `poisson_pmf(3.5, [0, 1, 2])` → `[0.0302, 0.1057, 0.1850]`
+
+45. **normal_cdf(x: float | list, mean: float = 0, std: float = 1) -> float | list**
+    - Example: `normal_cdf(110, 100, 10)` → `0.8413`
+
+46. **normal_ppf(q: float | list, mean: float = 0, std: float = 1) -> float | list**
+    - Inverse normal CDF (quantile), 0 < q < 1
+    - Example: `normal_ppf(0.975)` → `1.9600`
+
+47. **simulate(experiment: str, trials: int = 100000, seed: int = None, dice: int = 1, sides: int = 6, n: int = 1, p: float = 0.5, values: list = None, weights: list = None, draws: int = 1, replace: bool = True) -> dict**
+    - Monte Carlo simulation: "dice", "binomial", "draw" or "discrete" experiments
+    - Up to 100,000,000 trials, run in worker processes with progress reporting
+    - The same seed and trials always give the same result
+    - Example: `simulate("dice", dice=2, seed=1)` → `{"mean": 7.00, "distribution": [...], ...}`
+
+48. **amortization_schedule(principal: float, annual_rate: float, term_years: int, payments_per_year: int = 12, extra_payment: float = 0, output: str = "rows", offset: int = 0, limit: int = None) -> dict**
+    - Full loan schedule: payment, interest, principal and balance per period
+    - output: "rows", "columns" (compact) or "summary" (totals only); offset/limit page through it
+    - Example: `amortization_schedule(200000, 6, 30, output="summary")` → `{"payment": 1199.10, "total_interest": 231677.04, ...}`
+
+49. **compare_loans(principals: list, annual_rates: list, term_years: list, extra_payments: list = None, payments_per_year: int = 12, output: str = "rows") -> dict**
+    - Every combination of the grids in one call (up to 100,000 scenarios)
+    - Per scenario: payment, total_interest, payoff_period, periods_saved, interest_saved
+    - Example: `compare_loans([200000], [6], [30], [0, 200])` → `{"count": 2, "scenarios": [...]}`
+
+### Cash-Flow Finance
+Rates are per period as decimals (0.05 = 5%); money paid out is negative, money received positive.
+
+50. **npv(rate: float, cashflows: list) -> float | list**
+    - Net present value of cash flows at periods 0, 1, 2, ... (the first is not discounted)
+    - Pass a list of series for one result per series
+    - Example: `npv(0.1, [-100, 60, 60])` → `4.1322`
+
+51. **irr(cashflows: list, guess: float = 0.1) -> float | list**
+    - Internal rate of return (Newton's method with a bracketing Brent fallback)
+    - Pass a list of series (e.g. 10,000 portfolios) for one rate per series, null where none exists
+    - Example: `irr([-100, 39, 59, 55, 20])` → `0.2809`
+
+52. **xirr(cashflows: list, dates: list, guess: float = 0.1) -> float | list**
+    - Annual IRR of cash flows on arbitrary dates (YYYY-MM-DD)
+    - Example: `xirr([-1000, 1100], ["2024-01-01", "2025-01-01"])` → `0.0997`
+
+53. **pmt(rate: float, nper: float, pv: float, fv: float = 0, when: str = "end") -> float**
+    - Payment per period for a loan or savings plan
+    - Example: `pmt(0.005, 360, 200000)` → `-1199.10`
+
+54. **fv(rate: float, nper: float, pmt: float, pv: float = 0, when: str = "end") -> float**
+    - Future value of a present amount plus regular payments
+    - Example: `fv(0.005, 120, -100)` → `16387.93`
+
+55. **pv(rate: float, nper: float, pmt: float, fv: float = 0, when: str = "end") -> float**
+    - Present value of regular payments plus a final amount
+    - Example: `pv(0.005, 360, -1199.10)` → `199999.83`
+
+56. **nper(rate: float, pmt: float, pv: float, fv: float = 0, when: str = "end") -> float**
+    - Number of periods for payments to take pv to fv
+    - Example: `nper(0.005, -1199.10, 200000)` → `360.0`
+
+57. **compound_growth(principal: float, annual_rate: float, years: float, compounding: str = "monthly", contribution: float = 0, when: str = "end", downsample: int = None) -> dict**
+    - Whole balance trajectory under annual/quarterly/monthly/weekly/daily/continuous compounding
+    - Optional contribution every period; downsample caps the number of points returned
+    - Example: `compound_growth(1000, 5, 10, compounding="annually")` → `{"final_balance": 1628.89, "series": {"balance": [1000.0, 1050.0, ...]}, ...}`
+
+### Unit Conversion
+58. **convert(value: float | list, from_unit: str, to_unit: str) -> float | list**
+    - Length, mass, time, area, speed, volume, force, energy, power, pressure and temperature; symbols or names ("km", "mile", "lb", "mph", "L", "celsius")
+    - Compound expressions with SI prefixes ("kg*m/s^2", "N m", "g/cm^3"); inverse dimensions convert reciprocally ("mi/gal" ↔ "L/100km")
+    - Parsed units and conversion factors are cached; lists convert in one call
+    - Example: `convert(100, "celsius", "fahrenheit")` → `212.0`, `convert(30, "mi/gal", "L/100km")` → `7.84`
+
+### Streaming Statistics
+Feed data in chunks of any size; only running moments are kept, so memory stays constant.
+
+59. **stats_stream_open(higher_moments: bool = False, quantiles: bool = False, compression: float = 100, top_k: int = None, distinct: bool = False, precision: int = 12) -> dict**
+    - Start an accumulator; `higher_moments` also tracks skewness and kurtosis
+    - `quantiles` keeps a mergeable t-digest of a few KB; higher `compression` (20-1000) is more accurate
+    - `top_k` tracks that many heavy hitters (Space-Saving); `distinct` estimates distinct values (HyperLogLog, ~1.6% error at precision 12)
+    - Example: `stats_stream_open()` → `{"stream_id": "9f2c41d0...", "count": 0, "higher_moments": false, "quantiles": false}`
+
+60. **stats_stream_push(stream_id: str, numbers: List[float]) -> dict**
+    - Add a chunk of data points (numerically stable Welford/Chan update)
+    - Example: `stats_stream_push("9f2c41d0...", [1, 2, 3])` → `{"count": 3, ...}`
+
+61. **stats_stream_result(stream_id: str) -> dict**
+    - count, sum, mean, variance, stddev, min_value, max_value (and skewness, kurtosis)
+    - Example: `stats_stream_result("9f2c41d0...")` → `{"count": 3, "mean": 2.0, "variance": 1.0, ...}`
+
+62. **stats_stream_percentile(stream_id: str, p: float | list) -> float | list**
+    - Approximate percentile(s) of a stream opened with `quantiles=True`
+    - Example: `stats_stream_percentile("9f2c41d0...", [50, 99])` → `[2.0, 3.0]`
+
+63. **stats_stream_frequencies(stream_id: str, k: int = None) -> dict**
+    - Heavy hitters with counts and error bounds, and the distinct-value estimate, of a stream opened with `top_k` or `distinct`
+    - Every value occurring more than count/top_k times is guaranteed to be listed; `count - error` is a lower bound
+    - Example: `stats_stream_frequencies("9f2c41d0...", 2)` → `{"count": 6, "top": [{"value": 1.0, "count": 3, "error": 0}, ...], "distinct": 3}`
+
+64. **stats_stream_merge(stream_ids: List[str]) -> dict**
+    - Combine per-shard streams (moments and sketches) into a new stream; sources are unchanged
+    - Example: `stats_stream_merge(["9f2c41d0...", "a71be5c2..."])` → `{"stream_id": "...", "count": 6, ...}`
+
+65. **stats_stream_export(stream_id: str) -> dict**
+    - Serialize a stream's moments and sketch to plain JSON for persisting
+    - Example: `stats_stream_export("9f2c41d0...")` → `{"moments": {...}, "digest": {...}}`
+
+66. **stats_stream_import(state: dict) -> dict**
+    - Restore an exported stream under a new handle
+    - Example: `stats_stream_import({"moments": {...}, "digest": {...}})` → `{"stream_id": "...", "count": 3, ...}`
+
+67. **stats_stream_close(stream_id: str) -> dict**
+    - Remove a stream and free its state
+    - Example: `stats_stream_close("9f2c41d0...")` → `{"status": "closed", ...}`
+
+### Value Frequencies
+68. **frequencies(numbers: List[float], k: int = 10) -> dict**
+    - Count, number of distinct values and the k most common values with their counts (`k=None` for all)
+    - One counting pass, shared with `mode` and cached for stored datasets
+    - Example: `frequencies([1, 2, 2, 3, 3, 3], 2)` → `{"count": 6, "distinct": 3, "top": [{"value": 3.0, "count": 3}, {"value": 2.0, "count": 2}]}`
+
 ## 📝 Prompts
 
 1. **list_all_assets() -> str**
@@ -192,6 +413,11 @@ Don't execute or run any of them.
 - All arithmetic operations support floating-point numbers
 - Division returns both quotient and remainder for completeness
 - Statistical operations require at least one data point
+- Upload large datasets once with upload_dataset and pass dataset_id to avoid resending them
+- For data too large to send at once, push chunks to a stats_stream_open stream and read stats_stream_result
+- Use frequencies for top-k counts of a dataset; for unbounded streams open the stream with top_k/distinct instead
+- Statistical tools accept backend="python" or "numpy" (default "auto": NumPy for 512+ inline values when installed)
+- Send large data as packed={"data": <base64 of little-endian float64>} (or encoding "text" for "1,2,3") instead of numbers to skip per-element validation; works for statistics, upload_dataset, append_dataset and stats_stream_push
 - Factorial supports values from 0 to 20 for safety
 - Financial calculations use compound interest formula
 - Equation solver provides step-by-step explanations
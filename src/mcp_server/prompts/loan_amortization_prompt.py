@@ -106,6 +106,7 @@ Where: P = Principal, r = Monthly interest rate, n = Total payments
    - Method: Calculate if monthly payment exactly pays off loan in {total_months} months
    - Track remaining balance after each payment
    - Validation: Balance should be exactly $0 after final payment
+   - Full table in one call: amortization_schedule({principal}, {annual_rate}, {term_years}, output="columns")
 
 **Step 4.2**: Interest rate check
    - Calculate effective annual rate: power(add(1, {monthly_rate:.6f}), 12)
@@ -133,7 +134,11 @@ Where: P = Principal, r = Monthly interest rate, n = Total payments
 ### ⚙️ Execution Instructions
 Please use MCP tools (add, subtract, multiply, divide, power) for ALL calculations.
 Follow the sequential steps, using each result for subsequent calculations.
-Maintain precision to at least 6 decimal places for interest rate calculations."""
+Maintain precision to at least 6 decimal places for interest rate calculations.
+To verify the final payment in a single call, use:
+evaluate("P * r * power(1 + r, n) / (power(1 + r, n) - 1)", {{"P": {principal}, "r": {monthly_rate}, "n": {total_months}}})
+To run Steps 1.3-1.7 in one call while keeping every intermediate, use:
+pipeline({{"growth": ["add", 1, "$r"], "cf": ["power", "$growth", "$n"], "num": ["multiply", "$r", "$cf"], "den": ["subtract", "$cf", 1], "ratio": ["divide", "$num", "$den"], "payment": ["multiply", "$P", "$ratio"]}}, {{"P": {principal}, "r": {monthly_rate}, "n": {total_months}}})"""
 
     elif calc_type == "total_interest" or calc_type == "interest":
         return f"""## Loan Analysis Task: Total Interest Calculation
@@ -187,7 +192,8 @@ Determine the total interest cost for a loan of ${principal:,.2f} at {annual_rat
 
 ### ⚙️ Execution Instructions
 Please use MCP tools for ALL calculations.
-Calculate monthly payment first, then use it to determine total interest."""
+Calculate monthly payment first, then use it to determine total interest.
+To verify the totals in a single call, use: amortization_schedule({principal}, {annual_rate}, {term_years}, output="summary")"""
 
     elif calc_type == "early_payoff" or calc_type == "prepayment":
         extra_payment = 100  # Default extra payment amount
@@ -241,7 +247,9 @@ Analyze the impact of extra payments on a ${principal:,.2f} loan at {annual_rate
 
 ### ⚙️ Execution Instructions
 Model both scenarios using MCP tools.
-Compare results to show prepayment benefits."""
+Compare results to show prepayment benefits.
+To compare several extra-payment amounts in a single call, use:
+compare_loans([{principal}], [{annual_rate}], [{term_years}], extra_payments=[0, 100, 200, 500])"""
 
     elif calc_type == "comparison" or calc_type == "equal_principal":
         return f"""## Loan Comparison Task: Payment Method Analysis
@@ -302,7 +310,9 @@ Compare Equal Monthly Payment (EMP) vs Equal Principal Payment (EPP) methods for
 
 ### ⚙️ Execution Instructions
 Calculate both methods using MCP tools.
-Compare total interest and payment patterns."""
+Compare total interest and payment patterns.
+To compare the equal-payment loan across other rates and terms in a single call, use:
+compare_loans([{principal}], [{annual_rate}], [10, 15, 20, {term_years}])"""
 
     else:
         return f"""## Loan Calculation Guide: Multiple Analysis Options
@@ -83,7 +83,8 @@ Calculate the number of permutations P(n,r) = n!/(n-r)! for arranging {r} items
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (factorial, divide) for ALL calculations.
-Handle large factorials with care - they grow very quickly."""
+Handle large factorials with care - they grow very quickly.
+To verify the result in a single call, use: permutations({n if n else 'n'}, {r if r else 'r'})"""
 
     elif calc_type == "combination" or calc_type == "choose":
         return f"""## Probability Task: Combination Calculation
@@ -173,7 +174,9 @@ Calculate the number of combinations C(n,r) = n!/[r!(n-r)!] for choosing {r} ite
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (factorial, multiply, divide) for ALL calculations.
-Be careful with large factorials - consider cancellation when possible."""
+Be careful with large factorials - consider cancellation when possible.
+To verify the result in a single call, use: combinations({n if n else 'n'}, {r if r else 'r'})
+For very large n, log_comb(n, r) gives ln C(n,r) without building huge integers."""
 
     elif calc_type == "binomial" or calc_type == "binomial_probability":
         return f"""## Probability Task: Binomial Distribution Calculation
@@ -212,6 +215,7 @@ Calculate binomial probability P(X=k) for exactly {r if r else 'k'} successes in
      - factorial({r if r else 'k'})
      - factorial({(trials-r) if trials and r else 'n-k'})
    - Apply formula: divide(n_factorial, multiply(k_factorial, n_minus_k_factorial))
+   - Shortcut: combinations({trials if trials else 'n'}, {r if r else 'k'}) returns C(n,k) directly
 
 #### Goal 3: Probability Components
 **Objective**: Calculate probability of specific success/failure pattern
@@ -266,7 +270,9 @@ Calculate binomial probability P(X=k) for exactly {r if r else 'k'} successes in
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (factorial, multiply, divide, power, subtract) for ALL calculations.
-Maintain precision for probability values (at least 4 decimal places)."""
+Maintain precision for probability values (at least 4 decimal places).
+To verify in a single call, use: binomial_pmf({trials if trials else 'n'}, {probability if probability else 'p'}, {r if r else 'k'})
+(binomial_cdf gives P(X <= k); pass a list of k values to get many points at once.)"""
 
     elif calc_type == "expected_value" or calc_type == "expectation":
         return f"""## Probability Task: Expected Value Calculation
@@ -353,7 +359,10 @@ Calculate the expected value (mean) of a probability distribution, representing
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (multiply, add, subtract, power, root) for ALL calculations.
-Process each outcome-probability pair systematically."""
+Process each outcome-probability pair systematically.
+
+To check the result empirically, use: simulate("discrete", values=[outcomes], weights=[probabilities], seed=1)
+(the simulated mean should agree with E(X) to within a few standard errors)."""
 
     elif calc_type == "bayes" or calc_type == "conditional":
         return f"""## Probability Task: Bayesian Probability Calculation
@@ -442,7 +451,10 @@ Calculate conditional probability P(A|B) using Bayes' Theorem, updating beliefs
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (multiply, divide, add, subtract) for ALL calculations.
-Be precise with probability values - small changes can significantly affect results."""
+Be precise with probability values - small changes can significantly affect results.
+
+To sanity-check the posterior, simulate the joint outcomes: e.g. simulate("discrete", values=[1, 0], weights=[P(A)×P(B|A), P(¬A)×P(B|¬A)], seed=1)
+gives the share of positive evidence that comes from A as its mean."""
 
     else:
         return f"""## Probability Calculation Guide: Multiple Analysis Options
@@ -66,7 +66,8 @@ Convert {value}° {from_unit} to {to_unit} using precise mathematical formulas a
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (add, subtract, multiply, divide) for ALL calculations.
-Break down complex formulas into simple steps for accuracy."""
+Break down complex formulas into simple steps for accuracy.
+{_convert_hint(value, from_unit, to_unit)}"""
         
     elif conversion_lower == "length":
         return f"""## Unit Conversion Task: Length/Distance Measurement
@@ -147,7 +148,8 @@ miles → yards (×1760) → feet (×3) → inches (×12)
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (multiply, divide) for ALL conversions.
-Show each step explicitly when doing multi-step conversions."""
+Show each step explicitly when doing multi-step conversions.
+{_convert_hint(value, from_unit, to_unit)}"""
         
     elif conversion_lower == "weight" or conversion_lower == "mass":
         return f"""## Unit Conversion Task: Weight/Mass Measurement
@@ -229,7 +231,8 @@ Convert {value} {from_unit if from_unit else 'units'} of mass/weight to {to_unit
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (multiply, divide) for ALL calculations.
-For complex conversions, show intermediate steps clearly."""
+For complex conversions, show intermediate steps clearly.
+{_convert_hint(value, from_unit, to_unit)}"""
         
     elif conversion_lower == "speed" or conversion_lower == "velocity":
         return f"""## Unit Conversion Task: Speed/Velocity Transformation
@@ -304,7 +307,8 @@ Convert {value} {from_unit if from_unit else 'units'} to {to_unit if to_unit els
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (multiply, divide) for ALL calculations.
-Show clear steps for compound unit conversions."""
+Show clear steps for compound unit conversions.
+{_convert_hint(value, from_unit, to_unit)}"""
         
     elif conversion_lower == "volume":
         return f"""## Unit Conversion Task: Volume/Capacity Measurement
@@ -400,7 +404,8 @@ Convert {value} {from_unit if from_unit else 'units'} to {to_unit if to_unit els
 
 ### ⚙️ Execution Instructions
 Please use MCP tools (multiply, divide) for ALL calculations.
-When converting between systems, show intermediate steps."""
+When converting between systems, show intermediate steps.
+{_convert_hint(value, from_unit, to_unit)}"""
         
     else:
         return f"""## Unit Conversion Task: General Conversion Guide
@@ -465,7 +470,16 @@ Specify the exact conversion needed:
 - From unit: {from_unit if from_unit else 'not specified'}
 - To unit: {to_unit if to_unit else 'not specified'}
 
-Please use MCP tools (add, subtract, multiply, divide) for ALL calculations."""
+Please use MCP tools (add, subtract, multiply, divide) for ALL calculations.
+{_convert_hint(value, from_unit, to_unit)}"""
+
+def _convert_hint(value: float, from_unit: str, to_unit: str) -> str:
+    """One-call alternative using the convert tool."""
+    return (
+        f'To verify the result in a single call, use: convert({value}, '
+        f'"{from_unit if from_unit else "from_unit"}", "{to_unit if to_unit else "to_unit"}")\n'
+        'Compound units such as "km/h", "kg*m/s^2" or "L/100km" are accepted as written.'
+    )
 
 def _get_temperature_conversion_steps(from_unit: str, to_unit: str, value: float) -> str:
     """Generate specific conversion steps for temperature."""
@@ -1,6 +1,10 @@
 from fastmcp import FastMCP, Context
+from fastmcp.server.middleware import Middleware, MiddlewareContext
 from contextlib import asynccontextmanager
-from typing import Dict, Any, AsyncIterator, List, Union
+import asyncio
+from datetime import date
+from typing import Dict, Any, AsyncIterator, List, Literal, Optional, Union
+import hashlib
 import logging
 import sys
 import os
@@ -19,6 +23,30 @@ from mcp_server.tools import root_tool
 from mcp_server.tools import mod_tool
 from mcp_server.tools import factorial_tool
 from mcp_server.tools import statistics_tool
+from mcp_server.tools import statistics_backend
+from mcp_server.tools import dataset_tool
+from mcp_server.tools import history_tool
+from mcp_server.tools import evaluate_tool
+from mcp_server.tools import elementwise_tool
+from mcp_server.tools import batch_tool
+from mcp_server.tools import pipeline_tool
+from mcp_server.tools import process_pool
+from mcp_server.tools import combinatorics_tool
+from mcp_server.tools import distribution_tool
+from mcp_server.tools import simulate_tool
+from mcp_server.tools import loan_tool
+from mcp_server.tools import finance_tool
+from mcp_server.tools import growth_tool
+from mcp_server.tools import convert_tool
+from mcp_server.tools import stream_tool
+from mcp_server.tools import packed as packed_tool
+
+# Import server-side state
+from mcp_server.state.datasets import DatasetRegistry, DEFAULT_MAX_BYTES
+from mcp_server.state.streams import StreamRegistry, DEFAULT_MAX_STREAMS
+from mcp_server.state.summary_cache import SummaryCache, DEFAULT_MAX_BYTES as DEFAULT_SUMMARY_BYTES
+from mcp_server.state.history import HistoryStore, DEFAULT_MAX_SIZE as DEFAULT_HISTORY_SIZE
+from mcp_server.state.history_log import HistoryLog, DEFAULT_RETAIN as DEFAULT_HISTORY_RETAIN
 
 # Import prompt implementations
 from mcp_server.prompts import multiplication_table_prompt
@@ -41,23 +69,162 @@ from mcp_server.models.schemas import (
     RootInput,
     ModInput,
     FactorialInput,
-    StatisticsInput
+    StatisticsInput,
+    PackedNumbers,
+    DatasetUploadInput,
+    DatasetAppendInput,
+    DatasetRefInput,
+    HistoryQueryInput,
+    EvaluateInput,
+    ElementwiseInput,
+    BatchOperation,
+    BatchCalculationInput,
+    PipelineInput,
+    CombinatoricsInput,
+    BinomialInput,
+    PoissonInput,
+    NormalInput,
+    NormalPpfInput,
+    SimulateInput,
+    AmortizationInput,
+    LoanComparisonInput,
+    NpvInput,
+    IrrInput,
+    XirrInput,
+    PmtInput,
+    FvInput,
+    PvInput,
+    NperInput,
+    CompoundGrowthInput,
+    ConvertInput,
+    StreamOpenInput,
+    StreamPushInput,
+    StreamRefInput,
+    StreamMergeInput,
+    StreamPercentileInput,
+    StreamImportInput,
+    StreamFrequenciesInput
 )
 
 @asynccontextmanager
 async def calculator_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     """Initialize calculator server with persistent state."""
     # Initialize calculation history
-    history_store = []
+    history_store = HistoryStore(
+        max_size=int(os.environ.get("MAX_HISTORY_SIZE", DEFAULT_HISTORY_SIZE))
+    )
+
+    # Optionally persist history to an append-only log and replay it
+    history_log = None
+    history_log_path = os.environ.get("HISTORY_LOG_PATH")
+    if history_log_path:
+        history_log = HistoryLog(
+            history_log_path,
+            retain=int(os.environ.get("HISTORY_LOG_RETAIN", DEFAULT_HISTORY_RETAIN))
+        )
+        records = await asyncio.to_thread(history_log.open, history_store.max_size)
+        history_store.replay(records)
+        history_store.attach_log(history_log)
+
+    # Memoized per-dataset summaries keyed by content hash
+    summaries = SummaryCache(
+        max_bytes=int(os.environ.get("MAX_SUMMARY_CACHE_BYTES", DEFAULT_SUMMARY_BYTES))
+    )
+    # Initialize dataset registry for handle-based statistics; evicting a
+    # dataset also discards its summary so the buffer can be freed
+    datasets = DatasetRegistry(
+        max_bytes=int(os.environ.get("MAX_DATASET_BYTES", DEFAULT_MAX_BYTES)),
+        on_forget=summaries.discard
+    )
+
+    # Default statistics backend: auto (NumPy for large inputs when installed), python or numpy
+    statistics_backend.configure(os.environ.get("STATISTICS_BACKEND", "auto"))
+
+    # Streaming statistics accumulators, fed in chunks
+    streams = StreamRegistry(
+        max_streams=int(os.environ.get("MAX_STREAMS", DEFAULT_MAX_STREAMS))
+    )
 
     # Setup logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger("calculator_mcp")
 
-    yield {
-        "history": history_store,
-        "logger": logger
-    }
+    try:
+        yield {
+            "history": history_store,
+            "datasets": datasets,
+            "summaries": summaries,
+            "streams": streams,
+            "logger": logger
+        }
+    finally:
+        await asyncio.to_thread(process_pool.shutdown)
+        if history_log is not None:
+            await asyncio.to_thread(history_log.close)
+
+def _state(ctx: Context) -> Dict[str, Any]:
+    """Return the state created by calculator_lifespan."""
+    return ctx.request_context.lifespan_context
+
+# Tools whose calls are not written to the calculation history
+_UNRECORDED_TOOLS = {"query_history"}
+# Lists longer than this are recorded as a count instead of their contents
+_MAX_RECORDED_ITEMS = 20
+# Likewise for strings (packed numbers) longer than this
+_MAX_RECORDED_CHARS = 200
+# Results whose serialized form is larger than this are recorded as a size and digest
+_MAX_RECORDED_RESULT_BYTES = 4096
+
+def _recorded(value: Any) -> Any:
+    if isinstance(value, list) and len(value) > _MAX_RECORDED_ITEMS:
+        return f"<{len(value)} items>"
+    if isinstance(value, str) and len(value) > _MAX_RECORDED_CHARS:
+        return f"<{len(value)} characters>"
+    if isinstance(value, dict):
+        return {key: _recorded(item) for key, item in value.items()}
+    return value
+
+def _history_inputs(arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy tool arguments for the history, summarizing large payloads."""
+    if not arguments:
+        return {}
+    return {key: _recorded(value) for key, value in arguments.items()}
+
+def _history_result(tool_result) -> Any:
+    """Extract the value a tool returned from its MCP result.
+
+    Results larger than _MAX_RECORDED_RESULT_BYTES are recorded as their
+    size and a digest of the serialized content instead of the value.
+    """
+    text = "".join(getattr(block, "text", "") for block in tool_result.content or ())
+    if len(text) > _MAX_RECORDED_RESULT_BYTES:
+        encoded = text.encode()
+        return {
+            "truncated": True,
+            "bytes": len(encoded),
+            "digest": hashlib.blake2b(encoded, digest_size=16).hexdigest(),
+        }
+    structured = tool_result.structured_content
+    if isinstance(structured, dict) and structured.keys() == {"result"}:
+        return structured["result"]
+    return structured
+
+class HistoryMiddleware(Middleware):
+    """Record every tool call, successful or not, in the calculation history."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        name = context.message.name
+        if name in _UNRECORDED_TOOLS:
+            return await call_next(context)
+        history = _state(context.fastmcp_context)["history"]
+        inputs = _history_inputs(context.message.arguments)
+        try:
+            result = await call_next(context)
+        except Exception as exc:
+            history.record(name, inputs, error=str(exc))
+            raise
+        history.record(name, inputs, _history_result(result))
+        return result
 
 # Create server instance
 mcp = FastMCP(
@@ -66,6 +233,44 @@ mcp = FastMCP(
     version="1.0.0",
     lifespan=calculator_lifespan
 )
+mcp.add_middleware(HistoryMiddleware())
+
+# Per-call choice of statistics backend; None uses STATISTICS_BACKEND
+StatisticsBackend = Optional[Literal["auto", "python", "numpy"]]
+
+def _packed_input(model, numbers: Optional[List[float]], packed: Optional[PackedNumbers], **fields):
+    """Build a model from inline numbers, or from packed numbers without per-element validation."""
+    if packed is None:
+        return model(numbers=numbers, **fields)
+    if numbers is not None:
+        raise ValueError("Provide either numbers or packed, not both")
+    # 解码后的 float64 缓冲区直接放入模型，不再逐元素校验
+    return model.model_construct(numbers=packed_tool.unpack(packed.data, packed.encoding), **fields)
+
+def _statistics_input(
+    ctx: Context,
+    numbers: Optional[List[float]],
+    dataset_id: Optional[str],
+    packed: Optional[PackedNumbers] = None
+):
+    """Build statistics input from inline numbers, packed numbers or a stored dataset.
+
+    Returns the input and, for stored datasets, their cached summary.
+    """
+    given = [name for name, value in (("numbers", numbers), ("packed", packed), ("dataset_id", dataset_id)) if value is not None]
+    if len(given) > 1:
+        raise ValueError(f"Provide either {given[0]} or {given[1]}, not both")
+    if packed is not None:
+        return StatisticsInput.model_construct(data=packed_tool.unpack(packed.data, packed.encoding)), None
+    if dataset_id is not None:
+        state = _state(ctx)
+        dataset = state["datasets"].get(dataset_id)
+        summary = state["summaries"].get(dataset.digest, dataset.values)
+        # Stored datasets were validated on upload
+        return StatisticsInput.model_construct(data=dataset.values), summary
+    if numbers is None:
+        raise ValueError("Provide numbers, packed or dataset_id")
+    return StatisticsInput(numbers=numbers), None
 
 # Register tools with decorators
 @mcp.tool()
@@ -101,7 +306,7 @@ async def power(base: float, exponent: float) -> float:
 @mcp.tool()
 async def root(number: float, n: int = 2) -> float:
     """Calculate the nth root of a number (开方)."""
-    root_input = RootInput(number=number, n=n)
+    root_input = RootInput(number=number, degree=n)
     return await root_tool.root(root_input)
 
 @mcp.tool()
@@ -111,100 +316,636 @@ async def mod(a: int, b: int) -> int:
     return await mod_tool.mod(mod_input)
 
 @mcp.tool()
-async def factorial(n: int, ctx: Context) -> int:
-    """Calculate factorial of n with progress reporting."""
-    factorial_input = FactorialInput(n=n)
+async def factorial(n: int, output: Literal["auto", "exact", "summary"] = "auto", ctx: Context = None) -> Union[int, dict]:
+    """Calculate factorial of n (0-500,000) with progress reporting.
+
+    Args:
+        n: Non-negative integer
+        output: "exact" for the integer, "summary" for {digits, log10,
+            leading_digits, trailing_zeros, trailing_digits}, or "auto"
+            (exact up to 4300 digits, summary beyond)
+    """
+    factorial_input = FactorialInput(n=n, output=output)
     return await factorial_tool.factorial(factorial_input, ctx)
 
 @mcp.tool()
-async def mean(numbers: List[float]) -> float:
+async def permutations(n: int, r: int, output: Literal["auto", "exact", "summary"] = "auto") -> Union[int, dict]:
+    """Number of ordered arrangements of r items from n: P(n,r) = n!/(n-r)!.
+
+    Results over 4300 digits come back as {ln, log10, digits, scientific}
+    unless output="exact".
+    """
+    combinatorics_input = CombinatoricsInput(n=n, r=r, output=output)
+    return await combinatorics_tool.permutations(combinatorics_input)
+
+@mcp.tool()
+async def combinations(n: int, r: int, output: Literal["auto", "exact", "summary"] = "auto") -> Union[int, dict]:
+    """Number of unordered selections of r items from n: C(n,r) = n!/[r!(n-r)!].
+
+    Results over 4300 digits come back as {ln, log10, digits, scientific}
+    unless output="exact".
+    """
+    combinatorics_input = CombinatoricsInput(n=n, r=r, output=output)
+    return await combinatorics_tool.combinations(combinatorics_input)
+
+@mcp.tool()
+async def log_comb(n: int, r: int) -> float:
+    """Natural logarithm of C(n,r); works for n up to 10^9 without building huge integers."""
+    combinatorics_input = CombinatoricsInput(n=n, r=r)
+    return await combinatorics_tool.log_combinations(combinatorics_input)
+
+@mcp.tool()
+async def binomial_pmf(n: int, p: float, k: Union[int, List[int]]) -> Union[float, List[float]]:
+    """Probability of exactly k successes in n trials, P(X=k) = C(n,k) p^k (1-p)^(n-k).
+
+    k may be a list to get many points (e.g. the whole distribution) in one call.
+    """
+    binomial_input = BinomialInput(n=n, p=p, k=k)
+    return await distribution_tool.binomial_pmf(binomial_input)
+
+@mcp.tool()
+async def binomial_cdf(n: int, p: float, k: Union[int, List[int]]) -> Union[float, List[float]]:
+    """Probability of at most k successes in n trials, P(X<=k); k may be a list."""
+    binomial_input = BinomialInput(n=n, p=p, k=k)
+    return await distribution_tool.binomial_cdf(binomial_input)
+
+@mcp.tool()
+async def poisson_pmf(lam: float, k: Union[int, List[int]]) -> Union[float, List[float]]:
+    """Probability of exactly k events when lam are expected, lam^k e^-lam / k!; k may be a list."""
+    poisson_input = PoissonInput(lam=lam, k=k)
+    return await distribution_tool.poisson_pmf(poisson_input)
+
+@mcp.tool()
+async def normal_cdf(x: Union[float, List[float]], mean: float = 0.0, std: float = 1.0) -> Union[float, List[float]]:
+    """P(X<=x) for a normal distribution; x may be a list."""
+    normal_input = NormalInput(x=x, mean=mean, std=std)
+    return await distribution_tool.normal_cdf(normal_input)
+
+@mcp.tool()
+async def normal_ppf(q: Union[float, List[float]], mean: float = 0.0, std: float = 1.0) -> Union[float, List[float]]:
+    """Inverse normal CDF: the x with P(X<=x) = q (0 < q < 1); q may be a list."""
+    normal_input = NormalPpfInput(q=q, mean=mean, std=std)
+    return await distribution_tool.normal_ppf(normal_input)
+
+@mcp.tool()
+async def simulate(
+    experiment: Literal["dice", "draw", "binomial", "discrete"],
+    trials: int = 100_000,
+    seed: Optional[int] = None,
+    dice: int = 1,
+    sides: int = 6,
+    n: int = 1,
+    p: float = 0.5,
+    values: Optional[List[float]] = None,
+    weights: Optional[List[float]] = None,
+    draws: int = 1,
+    replace: bool = True,
+    ctx: Context = None
+) -> dict:
+    """Monte Carlo simulation of a sampling experiment (up to 100,000,000 trials).
+
+    Args:
+        experiment: "dice" (sum of dice), "binomial" (successes in n trials),
+            "draw" (sum of draws from values) or "discrete" (sum of draws
+            from values with the given weights)
+        seed: Fixed seed for reproducible results (the same seed and trials
+            always give the same answer)
+
+    Returns mean, variance, stddev, standard_error, min, max and the
+    outcome distribution (when there are at most 1000 distinct outcomes).
+    """
+    simulate_input = SimulateInput(
+        experiment=experiment, trials=trials, seed=seed, dice=dice, sides=sides, n=n, p=p,
+        values=values, weights=weights, draws=draws, replace=replace
+    )
+    return await simulate_tool.simulate(simulate_input, ctx)
+
+@mcp.tool()
+async def amortization_schedule(
+    principal: float,
+    annual_rate: float,
+    term_years: int,
+    payments_per_year: Literal[1, 2, 4, 12, 24, 26, 52] = 12,
+    extra_payment: float = 0.0,
+    output: Literal["rows", "columns", "summary"] = "rows",
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> dict:
+    """Full loan amortization schedule: payment, interest, principal and balance per period.
+
+    Args:
+        principal: Amount borrowed
+        annual_rate: Annual interest rate in percent (e.g. 6.5)
+        term_years: Loan term in years
+        payments_per_year: 12 monthly, 26 biweekly, 52 weekly, ...
+        extra_payment: Extra principal paid every period
+        output: "rows" (list of per-period objects), "columns" (one list per
+            field, more compact) or "summary" (totals only)
+        offset, limit: Return only periods offset+1 .. offset+limit
+
+    Returns payment, periods, payoff_period, total_paid, total_interest and,
+    unless output="summary", total, offset and schedule. Amounts are in
+    cents-rounded currency; the final payment absorbs rounding.
+    """
+    amortization_input = AmortizationInput(
+        principal=principal, annual_rate=annual_rate, term_years=term_years,
+        payments_per_year=payments_per_year, extra_payment=extra_payment,
+        output=output, offset=offset, limit=limit
+    )
+    return await loan_tool.amortization_schedule(amortization_input)
+
+@mcp.tool()
+async def compare_loans(
+    principals: List[float],
+    annual_rates: List[float],
+    term_years: List[int],
+    extra_payments: Optional[List[float]] = None,
+    payments_per_year: Literal[1, 2, 4, 12, 24, 26, 52] = 12,
+    output: Literal["rows", "columns"] = "rows"
+) -> dict:
+    """Compare every combination of principals, rates, terms and extra payments in one call.
+
+    Args:
+        principals: Amounts borrowed
+        annual_rates: Annual interest rates in percent
+        term_years: Loan terms in years
+        extra_payments: Extra principal paid every period (default: none)
+        output: "rows" (one object per scenario) or "columns" (one list per
+            field, more compact for large grids)
+
+    Each scenario has payment, total_interest, payoff_period, periods_saved
+    and interest_saved (versus the same loan without extra payments).
+    Up to 100,000 scenarios.
+    """
+    comparison_input = LoanComparisonInput(
+        principals=principals, annual_rates=annual_rates, term_years=term_years,
+        extra_payments=extra_payments or [0.0], payments_per_year=payments_per_year, output=output
+    )
+    return await loan_tool.compare_loans(comparison_input)
+
+@mcp.tool()
+async def npv(rate: float, cashflows: Union[List[float], List[List[float]]]) -> Union[float, List[float]]:
+    """Net present value of cash flows at periods 0, 1, 2, ... (the first is not discounted).
+
+    Args:
+        rate: Discount rate per period as a decimal (0.08 = 8%)
+        cashflows: One series, or a list of series for one result each
+    """
+    npv_input = NpvInput(rate=rate, cashflows=cashflows)
+    return await finance_tool.npv(npv_input)
+
+@mcp.tool()
+async def irr(cashflows: Union[List[float], List[List[float]]], guess: float = 0.1) -> Union[float, List[Optional[float]]]:
+    """Internal rate of return per period (decimal) of cash flows at periods 0, 1, 2, ...
+
+    Pass a list of series to get one rate per series (null where none exists).
+    """
+    irr_input = IrrInput(cashflows=cashflows, guess=guess)
+    return await finance_tool.irr(irr_input)
+
+@mcp.tool()
+async def xirr(
+    cashflows: Union[List[float], List[List[float]]],
+    dates: Union[List[date], List[List[date]]],
+    guess: float = 0.1
+) -> Union[float, List[Optional[float]]]:
+    """Annual internal rate of return of cash flows on the given dates (YYYY-MM-DD).
+
+    Pass lists of series and of date lists to get one rate per series.
+    """
+    xirr_input = XirrInput(cashflows=cashflows, dates=dates, guess=guess)
+    return await finance_tool.xirr(xirr_input)
+
+@mcp.tool()
+async def pmt(rate: float, nper: float, pv: float, fv: float = 0.0, when: Literal["end", "begin"] = "end") -> float:
+    """Payment per period (negative = paid out) for a loan or savings plan.
+
+    Example: pmt(0.05/12, 360, 200000) = -1073.64
+    """
+    pmt_input = PmtInput(rate=rate, nper=nper, pv=pv, fv=fv, when=when)
+    return await finance_tool.pmt(pmt_input)
+
+@mcp.tool()
+async def fv(rate: float, nper: float, pmt: float, pv: float = 0.0, when: Literal["end", "begin"] = "end") -> float:
+    """Future value of a present amount plus a payment every period (cash paid out is negative)."""
+    fv_input = FvInput(rate=rate, nper=nper, pmt=pmt, pv=pv, when=when)
+    return await finance_tool.fv(fv_input)
+
+@mcp.tool()
+async def pv(rate: float, nper: float, pmt: float, fv: float = 0.0, when: Literal["end", "begin"] = "end") -> float:
+    """Present value of a payment every period plus a final amount."""
+    pv_input = PvInput(rate=rate, nper=nper, pmt=pmt, fv=fv, when=when)
+    return await finance_tool.pv(pv_input)
+
+@mcp.tool()
+async def nper(rate: float, pmt: float, pv: float, fv: float = 0.0, when: Literal["end", "begin"] = "end") -> float:
+    """Number of periods for payments to take a present value to a future value."""
+    nper_input = NperInput(rate=rate, pmt=pmt, pv=pv, fv=fv, when=when)
+    return await finance_tool.nper(nper_input)
+
+@mcp.tool()
+async def compound_growth(
+    principal: float,
+    annual_rate: float,
+    years: float,
+    compounding: Literal["annually", "semiannually", "quarterly", "monthly", "weekly", "daily", "continuous"] = "monthly",
+    contribution: float = 0.0,
+    when: Literal["end", "begin"] = "end",
+    downsample: Optional[int] = None
+) -> dict:
+    """Project a balance under compound interest, returning the whole trajectory.
+
+    Args:
+        principal: Starting balance
+        annual_rate: Annual interest rate in percent (e.g. 5 for 5%)
+        years: Projection length in years; must be a whole number of compounding periods
+        compounding: How often interest is credited ("continuous" is sampled monthly)
+        contribution: Amount added every compounding period (monthly for continuous)
+        when: Contributions at the "end" or "begin" of each period
+        downsample: Maximum number of points in the series (first and last are kept)
+
+    Returns final_balance, total_contributions, total_interest,
+    effective_annual_rate and series {period, years, balance, contributed}.
+    """
+    growth_input = CompoundGrowthInput(
+        principal=principal, annual_rate=annual_rate, years=years, compounding=compounding,
+        contribution=contribution, when=when, downsample=downsample
+    )
+    return await growth_tool.compound_growth(growth_input)
+
+@mcp.tool()
+async def convert(value: Union[float, List[float]], from_unit: str, to_unit: str) -> Union[float, List[float]]:
+    """Convert a value (or a list of values) between units of the same dimension.
+
+    Units can be symbols or names, e.g. "km", "mile", "lb", "kg", "mph",
+    "km/h", "L", "gal", "cup", "celsius", "F", "K", or compound expressions
+    such as "kg*m/s^2", "kN", "g/cm^3". Inverse dimensions convert
+    reciprocally, e.g. "mi/gal" to "L/100km".
+    """
+    convert_input = ConvertInput(value=value, from_unit=from_unit, to_unit=to_unit)
+    return await convert_tool.convert(convert_input)
+
+@mcp.tool()
+async def add_many(a: Union[List[float], float], b: Union[List[float], float]) -> List[float]:
+    """Add element by element; a number (or one-element list) broadcasts against a list."""
+    elementwise_input = ElementwiseInput(a=a, b=b)
+    return await elementwise_tool.add_many(elementwise_input)
+
+@mcp.tool()
+async def subtract_many(a: Union[List[float], float], b: Union[List[float], float]) -> List[float]:
+    """Subtract b from a element by element, with broadcasting."""
+    elementwise_input = ElementwiseInput(a=a, b=b)
+    return await elementwise_tool.subtract_many(elementwise_input)
+
+@mcp.tool()
+async def multiply_many(a: Union[List[float], float], b: Union[List[float], float]) -> List[float]:
+    """Multiply element by element, with broadcasting."""
+    elementwise_input = ElementwiseInput(a=a, b=b)
+    return await elementwise_tool.multiply_many(elementwise_input)
+
+@mcp.tool()
+async def divide_many(a: Union[List[float], float], b: Union[List[float], float]) -> dict:
+    """Divide a by b element by element; zero divisors are reported in an error mask."""
+    elementwise_input = ElementwiseInput(a=a, b=b)
+    return await elementwise_tool.divide_many(elementwise_input)
+
+@mcp.tool()
+async def power_many(base: Union[List[float], float], exponent: Union[List[float], float]) -> List[float]:
+    """Raise each base to the matching exponent (乘方), with broadcasting."""
+    elementwise_input = ElementwiseInput(a=base, b=exponent)
+    return await elementwise_tool.power_many(elementwise_input)
+
+@mcp.tool()
+async def root_many(numbers: Union[List[float], float], n: Union[List[float], float] = 2) -> List[float]:
+    """Calculate the nth root of each number (开方), with broadcasting."""
+    elementwise_input = ElementwiseInput(a=numbers, b=n)
+    return await elementwise_tool.root_many(elementwise_input)
+
+@mcp.tool()
+async def batch(operations: List[BatchOperation], ctx: Context = None) -> dict:
+    """Run many calculator operations in one request.
+
+    Args:
+        operations: List of {"op": tool name, "args": {...}} using the same
+            argument names as the individual tools, e.g.
+            {"op": "power", "args": {"base": 2, "exponent": 10}} or
+            {"op": "mean", "args": {"dataset_id": "..."}}
+
+    Returns:
+        {"results": [...], "error_count": int, "status": "success" | "partial" | "failed"}
+        with one entry per operation in request order; a failed operation
+        carries "error" instead of "result" without affecting the others.
+    """
+    batch_input = BatchCalculationInput(operations=operations)
+    return await batch_tool.batch(
+        batch_input,
+        resolve_dataset=lambda dataset_id: _statistics_input(ctx, None, dataset_id)
+    )
+
+@mcp.tool()
+async def pipeline(steps: Dict[str, Union[List[Any], BatchOperation]], inputs: Optional[Dict[str, Union[float, List[float]]]] = None, ctx: Context = None) -> dict:
+    """Run a graph of dependent calculations in one call and return every intermediate.
+
+    Args:
+        steps: Named steps, each [op, arg, ...] (positional, in the tool's own
+            argument order) or {"op": ..., "args": {...}}. Arguments may
+            reference inputs or other steps as "$name", or a field of a dict
+            result as "$name.key".
+        inputs: Named values referenced as "$name"
+
+    Example:
+        steps={"cf": ["power", "$g", 360], "num": ["multiply", "$r", "$cf"],
+               "den": ["subtract", "$cf", 1], "pay": ["evaluate", "P * n / d",
+               {"P": 200000, "n": "$num", "d": "$den"}]},
+        inputs={"r": 0.005, "g": 1.005}
+
+    Returns:
+        {"results": {step: value}, "errors": {step: message}, "order": [...], "status": ...}
+    """
+    pipeline_input = PipelineInput(steps=steps, inputs=inputs or {})
+    return await pipeline_tool.pipeline(
+        pipeline_input,
+        resolve_dataset=lambda dataset_id: _statistics_input(ctx, None, dataset_id)
+    )
+
+@mcp.tool()
+async def evaluate(expression: str, variables: Optional[Dict[str, float]] = None) -> float:
+    """Evaluate a whole arithmetic formula in one call.
+
+    Supports + - * / % ** (or ^), parentheses, the constants pi and e, named
+    variables, and the functions add, subtract, multiply, divide, power, root,
+    sqrt, mod, factorial, abs, min and max.
+
+    Args:
+        expression: Formula to evaluate, e.g. "P * power(1 + r / 12, 12 * t)"
+        variables: Values for names used in the formula, e.g. {"P": 10000, "r": 0.05, "t": 3}
+    """
+    evaluate_input = EvaluateInput(expression=expression, variables=variables or {})
+    return await evaluate_tool.evaluate(evaluate_input)
+
+@mcp.tool()
+async def mean(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the arithmetic mean of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.mean(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.mean(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def median(numbers: List[float]) -> float:
+async def median(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the median of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.median(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.median(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def stddev(numbers: List[float]) -> float:
+async def stddev(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the standard deviation of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.stddev(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.stddev(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def min_value(numbers: List[float]) -> float:
+async def min_value(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Find the minimum value in a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.min_value(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.min_value(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def max_value(numbers: List[float]) -> float:
+async def max_value(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Find the maximum value in a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.max_value(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.max_value(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def sum(numbers: List[float]) -> float:
+async def sum(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the sum of all values in a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.sum_values(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.sum_values(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def count(numbers: List[float]) -> int:
+async def count(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, ctx: Context = None) -> int:
     """Count the number of values in a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.count_values(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.count_values(statistics_input, summary=summary)
 
 @mcp.tool()
-async def range_stat(numbers: List[float]) -> float:
+async def range_stat(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the range (max - min) of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.range_values(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.range_values(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def variance(numbers: List[float]) -> float:
+async def variance(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the variance of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.variance(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.variance(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def mode(numbers: List[float]) -> Union[float, List[float]]:
+async def mode(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> Union[float, List[float]]:
     """Find the mode(s) of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.mode(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.mode(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def percentile(numbers: List[float], p: float) -> float:
-    """Calculate the pth percentile of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.percentile(statistics_input, p)
+async def frequencies(
+    numbers: Optional[List[float]] = None,
+    dataset_id: Optional[str] = None,
+    packed: Optional[PackedNumbers] = None,
+    k: Optional[int] = 10,
+    backend: StatisticsBackend = None,
+    ctx: Context = None
+) -> dict:
+    """Count, number of distinct values and the k most common values with their counts (k=None for all)."""
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.frequencies(statistics_input, k, summary=summary, backend=backend)
 
 @mcp.tool()
-async def quartiles(numbers: List[float]) -> dict:
+async def percentile(
+    p: float,
+    numbers: Optional[List[float]] = None,
+    dataset_id: Optional[str] = None,
+    packed: Optional[PackedNumbers] = None,
+    approximate: bool = False,
+    backend: StatisticsBackend = None,
+    ctx: Context = None
+) -> float:
+    """Calculate the pth percentile of a dataset.
+
+    Set approximate to answer from a t-digest sketch instead of sorting
+    (typically within 0.1 percentile points of the exact rank).
+    """
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.percentile(statistics_input, p, summary=summary, approximate=approximate, backend=backend)
+
+@mcp.tool()
+async def quartiles(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> dict:
     """Calculate the quartiles (Q1, Q2, Q3) of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.quartiles(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.quartiles(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def iqr(numbers: List[float]) -> float:
+async def iqr(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the interquartile range (Q3 - Q1) of a dataset."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.iqr(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.iqr(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def geometric_mean(numbers: List[float]) -> float:
+async def geometric_mean(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the geometric mean of positive values."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.geometric_mean(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.geometric_mean(statistics_input, summary=summary, backend=backend)
 
 @mcp.tool()
-async def harmonic_mean(numbers: List[float]) -> float:
+async def harmonic_mean(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, backend: StatisticsBackend = None, ctx: Context = None) -> float:
     """Calculate the harmonic mean of positive values."""
-    statistics_input = StatisticsInput(numbers=numbers)
-    return await statistics_tool.harmonic_mean(statistics_input)
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.harmonic_mean(statistics_input, summary=summary, backend=backend)
+
+@mcp.tool()
+async def describe(numbers: Optional[List[float]] = None, dataset_id: Optional[str] = None, packed: Optional[PackedNumbers] = None, stats: Optional[List[str]] = None, backend: StatisticsBackend = None, ctx: Context = None) -> dict:
+    """Calculate several summary statistics of a dataset in one call.
+
+    Args:
+        numbers: Data points (or use dataset_id)
+        dataset_id: Handle of a dataset stored with upload_dataset
+        stats: Statistics to include (default: all) - options:
+            count, sum, mean, median, stddev, variance, min_value,
+            max_value, range_stat, quartiles, iqr
+    """
+    statistics_input, summary = _statistics_input(ctx, numbers, dataset_id, packed)
+    return await statistics_tool.describe(statistics_input, stats, summary=summary, backend=backend)
+
+@mcp.tool()
+async def upload_dataset(numbers: Optional[List[float]] = None, packed: Optional[PackedNumbers] = None, ctx: Context = None) -> dict:
+    """Store a dataset on the server so statistics tools can reference it by dataset_id.
+
+    Large datasets upload fastest packed: base64 of little-endian float64 values.
+    """
+    dataset_input = _packed_input(DatasetUploadInput, numbers, packed)
+    return await dataset_tool.upload_dataset(dataset_input, _state(ctx)["datasets"])
+
+@mcp.tool()
+async def append_dataset(
+    dataset_id: str,
+    numbers: Optional[List[float]] = None,
+    packed: Optional[PackedNumbers] = None,
+    ctx: Context = None
+) -> dict:
+    """Append data points to a stored dataset."""
+    dataset_input = _packed_input(DatasetAppendInput, numbers, packed, dataset_id=dataset_id)
+    state = _state(ctx)
+    return await dataset_tool.append_dataset(dataset_input, state["datasets"], state["summaries"])
+
+@mcp.tool()
+async def drop_dataset(dataset_id: str, ctx: Context) -> dict:
+    """Remove a stored dataset and free its memory."""
+    dataset_input = DatasetRefInput(dataset_id=dataset_id)
+    state = _state(ctx)
+    return await dataset_tool.drop_dataset(dataset_input, state["datasets"], state["summaries"])
+
+@mcp.tool()
+async def stats_stream_open(
+    higher_moments: bool = False,
+    quantiles: bool = False,
+    compression: float = 100,
+    top_k: Optional[int] = None,
+    distinct: bool = False,
+    precision: int = 12,
+    ctx: Context = None
+) -> dict:
+    """Start a streaming statistics accumulator; feed it with stats_stream_push.
+
+    Only running moments are kept, so memory is constant however much data
+    is pushed. Set higher_moments to also get skewness and kurtosis, and
+    quantiles to keep a t-digest (a few KB; compression 20-1000 trades size
+    for accuracy) for stats_stream_percentile. top_k tracks that many heavy
+    hitters and distinct estimates the number of distinct values
+    (HyperLogLog with 2^precision registers); read both with
+    stats_stream_frequencies.
+    """
+    stream_input = StreamOpenInput(
+        higher_moments=higher_moments, quantiles=quantiles, compression=compression,
+        top_k=top_k, distinct=distinct, precision=precision
+    )
+    return await stream_tool.stats_stream_open(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def stats_stream_push(
+    stream_id: str,
+    numbers: Optional[List[float]] = None,
+    packed: Optional[PackedNumbers] = None,
+    ctx: Context = None
+) -> dict:
+    """Add a chunk of data points to a stream."""
+    stream_input = _packed_input(StreamPushInput, numbers, packed, stream_id=stream_id)
+    return await stream_tool.stats_stream_push(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def stats_stream_result(stream_id: str, ctx: Context) -> dict:
+    """Count, sum, mean, variance, stddev, min and max (plus skewness and kurtosis if tracked) of a stream."""
+    stream_input = StreamRefInput(stream_id=stream_id)
+    return await stream_tool.stats_stream_result(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def stats_stream_percentile(stream_id: str, p: Union[float, List[float]], ctx: Context) -> Union[float, List[float]]:
+    """Approximate percentile(s) (0-100) of a stream opened with quantiles=True."""
+    stream_input = StreamPercentileInput(stream_id=stream_id, p=p)
+    return await stream_tool.stats_stream_percentile(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def stats_stream_frequencies(stream_id: str, k: Optional[int] = None, ctx: Context = None) -> dict:
+    """Heavy hitters (value, count, error) and distinct-value estimate of a stream."""
+    stream_input = StreamFrequenciesInput(stream_id=stream_id, k=k)
+    return await stream_tool.stats_stream_frequencies(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def stats_stream_export(stream_id: str, ctx: Context) -> dict:
+    """Serialize a stream's moments and quantile sketch so it can be stored and restored."""
+    stream_input = StreamRefInput(stream_id=stream_id)
+    return await stream_tool.stats_stream_export(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def stats_stream_import(state: Dict[str, Any], ctx: Context) -> dict:
+    """Restore a stream from the output of stats_stream_export."""
+    stream_input = StreamImportInput(state=state)
+    return await stream_tool.stats_stream_import(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def stats_stream_merge(stream_ids: List[str], ctx: Context) -> dict:
+    """Combine streams (e.g. one per shard) into a new stream without re-reading any data."""
+    stream_input = StreamMergeInput(stream_ids=stream_ids)
+    return await stream_tool.stats_stream_merge(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def stats_stream_close(stream_id: str, ctx: Context) -> dict:
+    """Remove a stream and free its state."""
+    stream_input = StreamRefInput(stream_id=stream_id)
+    return await stream_tool.stats_stream_close(stream_input, _state(ctx)["streams"])
+
+@mcp.tool()
+async def summary_cache_stats(ctx: Context) -> dict:
+    """Report hit/miss counters and memory use of the dataset summary cache."""
+    return _state(ctx)["summaries"].info()
+
+@mcp.tool()
+async def query_history(
+    operation: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 50,
+    ctx: Context = None
+) -> dict:
+    """Page through past calculations, newest first.
+
+    Args:
+        operation: Only include calls to this tool (optional)
+        since: ISO 8601 start time, inclusive (optional)
+        until: ISO 8601 end time, inclusive (optional)
+        offset: Number of matching records to skip (default: 0)
+        limit: Maximum number of records to return (default: 50, max: 500)
+    """
+    query_input = HistoryQueryInput(
+        operation=operation, since=since, until=until, offset=offset, limit=limit
+    )
+    return await history_tool.query_history(query_input, _state(ctx)["history"])
 
 # Register prompts with decorators
 @mcp.prompt()
@@ -0,0 +1,181 @@
+"""Server-side dataset registry.
+
+Datasets are stored once as compact ``array('d')`` buffers and referenced by
+handle, so large inputs are parsed and validated a single time instead of on
+every statistics call. Identical uploads are deduplicated by content hash:
+each upload gets its own handle, but the handles share one buffer, which is
+copied before an append so one client's changes never reach another's data.
+The registry evicts least recently used datasets once its byte budget is
+exceeded.
+"""
+import hashlib
+from array import array
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class Dataset:
+    """A registered dataset and the running hash of its contents."""
+
+    __slots__ = ("id", "values", "_hasher", "sharers")
+
+    def __init__(self, dataset_id: str, values: array, hasher, sharers=None):
+        self.id = dataset_id
+        self.values = values
+        self._hasher = hasher
+        # 共用同一缓冲区的数据集 ID (包括自身)，所有共用者持有同一个集合
+        self.sharers = {dataset_id} if sharers is None else sharers
+        self.sharers.add(dataset_id)
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the current values."""
+        return self._hasher.hexdigest()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.values) * self.values.itemsize
+
+    def extend(self, values: array):
+        if len(self.sharers) > 1:
+            # 写时复制：不改动其他数据集共用的缓冲区
+            self.sharers.discard(self.id)
+            self.sharers = {self.id}
+            self.values = array("d", self.values)
+        self.values.extend(values)
+        self._hasher.update(memoryview(values))
+
+    def info(self) -> dict:
+        return {
+            "dataset_id": self.id,
+            "count": len(self.values),
+            "bytes": self.nbytes,
+            "digest": self.digest,
+        }
+
+
+def to_array(values) -> array:
+    """Convert a sequence of numbers into a float64 buffer (no copy for arrays)."""
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+    return array("d", values)
+
+
+class DatasetRegistry:
+    """LRU registry of datasets with a total byte budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, on_forget=None):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # 数据集被删除或淘汰时以其内容哈希调用，用于丢弃对应的缓存摘要
+        self.on_forget = on_forget
+        self._datasets = OrderedDict()
+        self._by_digest = {}
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def __contains__(self, dataset_id: str) -> bool:
+        return dataset_id in self._datasets
+
+    def upload(self, values):
+        """Register values, returning ``(dataset, deduplicated)``.
+
+        Every upload gets its own dataset ID. When the content matches a
+        stored dataset the new handle shares that buffer (``deduplicated``)
+        and costs no memory until it is appended to. An ``array('d')`` (e.g.
+        a decoded packed payload) is stored and hashed as is, so the registry
+        takes ownership of it; other sequences are copied into a new buffer.
+        """
+        values = to_array(values)
+        hasher = hashlib.blake2b(memoryview(values), digest_size=16)
+        digest = hasher.hexdigest()
+        existing = self._by_digest.get(digest)
+        if existing is not None:
+            source = self._datasets[existing]
+            self._datasets.move_to_end(existing)
+            values, sharers = source.values, source.sharers
+        else:
+            self._reserve(len(values) * values.itemsize)
+            sharers = None
+
+        dataset_id = digest[:16]
+        while dataset_id in self._datasets:
+            # 相同内容的重复上传或追加后沿用原 ID 的数据集占用了该前缀
+            dataset_id = hashlib.blake2b(dataset_id.encode(), digest_size=8).hexdigest()
+        dataset = Dataset(dataset_id, values, hasher, sharers)
+        self._datasets[dataset_id] = dataset
+        if existing is not None:
+            return dataset, True
+        self._by_digest[digest] = dataset_id
+        self.total_bytes += dataset.nbytes
+        return dataset, False
+
+    def append(self, dataset_id: str, values):
+        """Append values to an existing dataset; its ID stays the same."""
+        dataset = self.get(dataset_id)
+        values = to_array(values)
+        added = len(values) * values.itemsize
+        if len(dataset.sharers) > 1:
+            # 共用的缓冲区会被复制
+            added += dataset.nbytes
+        self._reserve(added, keep=dataset_id)
+        self._unmap_digest(dataset)
+        dataset.extend(values)
+        self.total_bytes += added
+        # 内容与已有数据集相同时保留最早的映射
+        self._by_digest.setdefault(dataset.digest, dataset_id)
+        return dataset
+
+    def get(self, dataset_id: str) -> Dataset:
+        """Look up a dataset and mark it as recently used."""
+        dataset = self._datasets.get(dataset_id)
+        if dataset is None:
+            raise ValueError(f"Unknown dataset: {dataset_id}")
+        self._datasets.move_to_end(dataset_id)
+        return dataset
+
+    def drop(self, dataset_id: str) -> Dataset:
+        """Remove a dataset and release its memory."""
+        dataset = self._datasets.pop(dataset_id, None)
+        if dataset is None:
+            raise ValueError(f"Unknown dataset: {dataset_id}")
+        self._forget(dataset)
+        return dataset
+
+    def _unmap_digest(self, dataset: Dataset):
+        """Stop deduplicating against dataset; another sharer takes over."""
+        if self._by_digest.get(dataset.digest) != dataset.id:
+            return
+        others = dataset.sharers - {dataset.id}
+        if others:
+            self._by_digest[dataset.digest] = next(iter(others))
+        else:
+            del self._by_digest[dataset.digest]
+
+    def _forget(self, dataset: Dataset):
+        self._unmap_digest(dataset)
+        dataset.sharers.discard(dataset.id)
+        if not dataset.sharers:
+            # 最后一个共用者被移除时才释放内存
+            self.total_bytes -= dataset.nbytes
+        if self.on_forget is not None:
+            self.on_forget(dataset.digest)
+
+    def _reserve(self, nbytes: int, keep: str = None):
+        """Evict least recently used datasets until nbytes more will fit."""
+        if nbytes > self.max_bytes:
+            raise ValueError(
+                f"Dataset of {nbytes} bytes exceeds the registry limit of {self.max_bytes} bytes"
+            )
+        while self.total_bytes + nbytes > self.max_bytes:
+            victim_id = next(iter(self._datasets))
+            if victim_id == keep:
+                if len(self._datasets) == 1:
+                    raise ValueError(
+                        f"Dataset would exceed the registry limit of {self.max_bytes} bytes"
+                    )
+                self._datasets.move_to_end(victim_id)
+                continue
+            self._forget(self._datasets.pop(victim_id))
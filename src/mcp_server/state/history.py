@@ -0,0 +1,152 @@
+"""Bounded, indexed calculation history.
+
+Entries live in a fixed-capacity ring buffer, so recording is a couple of
+slot assignments and never reallocates. Lightweight ``__slots__`` entries are
+stored on the hot path and only converted to ``CalculationRecord`` models when
+queried. A per-operation index of sequence numbers and the time ordering of
+the ring let queries page and filter without scanning the whole history.
+Entries can optionally be mirrored to a durable log and replayed at startup.
+"""
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime, timezone
+from time import time as _now
+
+from ..models.schemas import CalculationRecord
+
+DEFAULT_MAX_SIZE = 1000
+
+
+class HistoryEntry:
+    """A single recorded tool call."""
+
+    __slots__ = ("seq", "operation", "inputs", "result", "timestamp", "error")
+
+    def __init__(self, seq, operation, inputs, result, timestamp, error):
+        self.seq = seq
+        self.operation = operation
+        self.inputs = inputs
+        self.result = result
+        self.timestamp = timestamp
+        self.error = error
+
+    def to_record(self) -> CalculationRecord:
+        return CalculationRecord(
+            id=str(self.seq),
+            operation=self.operation,
+            inputs=self.inputs,
+            result=self.result,
+            timestamp=datetime.fromtimestamp(self.timestamp, tz=timezone.utc),
+            error=self.error,
+        )
+
+
+class HistoryStore:
+    """Fixed-capacity ring buffer of history entries with secondary indexes."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError("History size must be at least 1")
+        self.max_size = max_size
+        self._ring = [None] * max_size
+        self._start_seq = 0
+        self._next_seq = 0
+        self._by_operation = {}
+        self._log = None
+
+    def __len__(self) -> int:
+        return self._next_seq - self._first_seq
+
+    @property
+    def _first_seq(self) -> int:
+        return max(self._start_seq, self._next_seq - self.max_size)
+
+    def record(self, operation: str, inputs: dict, result=None, error: str = None,
+               timestamp: float = None) -> int:
+        """Append an entry, overwriting the oldest once full. Returns its sequence number."""
+        seq = self._next_seq
+        self._next_seq = seq + 1
+        if timestamp is None:
+            timestamp = _now()
+        by_operation = self._by_operation
+        entry = self._ring[seq % self.max_size]
+        if entry is None:
+            self._ring[seq % self.max_size] = HistoryEntry(
+                seq, operation, inputs, result, timestamp, error
+            )
+        else:
+            # 复用被覆盖的条目对象；它一定是其操作索引中最旧的一条
+            index = by_operation[entry.operation]
+            index.popleft()
+            if not index:
+                del by_operation[entry.operation]
+            entry.seq = seq
+            entry.operation = operation
+            entry.inputs = inputs
+            entry.result = result
+            entry.timestamp = timestamp
+            entry.error = error
+        index = by_operation.get(operation)
+        if index is None:
+            by_operation[operation] = deque((seq,))
+        else:
+            index.append(seq)
+        if self._log is not None:
+            self._log.append(seq, timestamp, operation, inputs, result, error)
+        return seq
+
+    def replay(self, records):
+        """Load ``(seq, timestamp, operation, inputs, result, error)`` records from a log.
+
+        Sequence numbers continue from the replayed records.
+        """
+        if self._next_seq:
+            raise ValueError("History can only be replayed into an empty store")
+        if not records:
+            return
+        self._start_seq = self._next_seq = records[0][0]
+        record = self.record
+        for seq, timestamp, operation, inputs, result, error in records:
+            record(operation, inputs, result, error, timestamp)
+
+    def attach_log(self, log):
+        """Mirror every new entry to a durable log (see state.history_log)."""
+        self._log = log
+
+    def log_status(self):
+        """Health of the attached durable log, or None without one."""
+        return None if self._log is None else self._log.status()
+
+    def get(self, seq: int) -> HistoryEntry:
+        if not self._first_seq <= seq < self._next_seq:
+            raise KeyError(seq)
+        return self._ring[seq % self.max_size]
+
+    def operations(self) -> dict:
+        """Number of retained entries per operation."""
+        return {operation: len(index) for operation, index in self._by_operation.items()}
+
+    def query(self, operation: str = None, since: float = None, until: float = None,
+              offset: int = 0, limit: int = 50):
+        """Return ``(total, entries)`` matching the filters, newest first.
+
+        ``since`` and ``until`` are inclusive POSIX timestamps.
+        """
+        if operation is not None:
+            seqs = self._by_operation.get(operation, ())
+        else:
+            seqs = range(self._first_seq, self._next_seq)
+
+        # 序号按时间递增，按时间过滤可以二分查找
+        timestamp_of = self._timestamp_of
+        lo = 0 if since is None else bisect_left(seqs, since, key=timestamp_of)
+        hi = len(seqs) if until is None else bisect_right(seqs, until, key=timestamp_of)
+        total = max(0, hi - lo)
+
+        start = hi - offset
+        stop = max(lo, start - limit)
+        entries = [self.get(seqs[i]) for i in range(start - 1, stop - 1, -1)]
+        return total, entries
+
+    def _timestamp_of(self, seq: int) -> float:
+        return self._ring[seq % self.max_size].timestamp
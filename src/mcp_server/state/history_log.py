@@ -0,0 +1,233 @@
+"""Durable append-only log backing the calculation history.
+
+Each record is framed as ``<length><json payload><length>``. The leading
+length allows forward scans, the trailing one lets startup replay walk the
+memory-mapped file backwards and decode only the records the in-memory ring
+can hold, so replay time does not depend on how long the log has grown.
+
+Appends only enqueue the record. A writer thread drains the queue, writes
+everything pending in one batch and fsyncs once per batch (group commit), so
+tool calls never wait on the disk. When the log holds more than twice the
+retention limit, the writer compacts it down to the newest records. If a
+write or compaction fails the error is logged once and the log degrades:
+later records are kept in memory only and ``status()`` reports the error,
+but tool calls are never failed because of the log.
+"""
+import json
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+
+MAGIC = b"CALCHIST\x01\n"
+DEFAULT_RETAIN = 100_000
+
+_LENGTH = struct.Struct("<I")
+_FRAME = 2 * _LENGTH.size
+_STOP = object()
+
+logger = logging.getLogger("calculator_mcp")
+
+
+def _encode(record) -> bytes:
+    payload = json.dumps(record, separators=(",", ":"), default=str).encode()
+    length = _LENGTH.pack(len(payload))
+    return length + payload + length
+
+
+def _frame_ending_at(buffer, end: int):
+    """Return (start, payload) of the record ending at end, or None if torn."""
+    if end - len(MAGIC) < _FRAME:
+        return None
+    (length,) = _LENGTH.unpack_from(buffer, end - _LENGTH.size)
+    start = end - _FRAME - length
+    if start < len(MAGIC) or _LENGTH.unpack_from(buffer, start)[0] != length:
+        return None
+    return start, buffer[start + _LENGTH.size:end - _LENGTH.size]
+
+
+def _first_seq_at(buffer, start: int) -> int:
+    """Decode the sequence number of the record starting at start."""
+    (length,) = _LENGTH.unpack_from(buffer, start)
+    payload = buffer[start + _LENGTH.size:start + _LENGTH.size + length]
+    return json.loads(payload)[0]
+
+
+def _scan_valid_end(buffer) -> int:
+    """Walk forward over complete records and return where the last one ends."""
+    pos = len(MAGIC)
+    size = len(buffer)
+    while pos + _FRAME <= size:
+        (length,) = _LENGTH.unpack_from(buffer, pos)
+        end = pos + _FRAME + length
+        if end > size or _LENGTH.unpack_from(buffer, end - _LENGTH.size)[0] != length:
+            break
+        pos = end
+    return pos
+
+
+class HistoryLog:
+    """Append-only on-disk history with batched, off-loop writes."""
+
+    def __init__(self, path: str, retain: int = DEFAULT_RETAIN, fsync: bool = True):
+        self.path = path
+        self.retain = retain
+        self.fsync = fsync
+        self.first_seq = None
+        self.last_seq = None
+        self._queue = queue.SimpleQueue()
+        self._file = None
+        self._writer = None
+        self._error = None
+
+    # 启动回放
+    def open(self, limit: int):
+        """Open the log for appending and return its newest records, oldest first.
+
+        Each record is ``(seq, timestamp, operation, inputs, result, error)``.
+        A torn record left by a crash is truncated away.
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as f:
+                f.write(MAGIC)
+        records = self._read_tail(limit)
+        self._file = open(self.path, "ab")
+        self._writer = threading.Thread(target=self._run, name="history-log-writer", daemon=True)
+        self._writer.start()
+        return records
+
+    def _read_tail(self, limit: int):
+        with open(self.path, "r+b") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a calculation history log")
+            size = os.fstat(f.fileno()).st_size
+            if size == len(MAGIC):
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                end = size
+                last = _frame_ending_at(buffer, end)
+                if last is None or not self._decodes(last[1]):
+                    end = _scan_valid_end(buffer)
+                tail = []
+                pos = end
+                while len(tail) < limit:
+                    frame = _frame_ending_at(buffer, pos)
+                    if frame is None:
+                        break
+                    pos, payload = frame
+                    tail.append(json.loads(payload))
+                if tail:
+                    self.first_seq = _first_seq_at(buffer, len(MAGIC))
+                    self.last_seq = tail[0][0]
+            if end < size:
+                f.truncate(end)
+        tail.reverse()
+        return tail
+
+    @staticmethod
+    def _decodes(payload: bytes) -> bool:
+        try:
+            json.loads(payload)
+        except ValueError:
+            return False
+        return True
+
+    # 写入
+    def append(self, seq, timestamp, operation, inputs, result, error):
+        """Queue a record for the writer thread; returns immediately.
+
+        Records are dropped once the log has degraded.
+        """
+        if self._error is not None:
+            return
+        self._queue.put((seq, timestamp, operation, inputs, result, error))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every record queued so far is written; False if the log has degraded."""
+        done = threading.Event()
+        self._queue.put(done)
+        if not done.wait(timeout):
+            raise TimeoutError("History log flush timed out")
+        return self._error is None
+
+    @property
+    def degraded(self) -> bool:
+        return self._error is not None
+
+    def status(self) -> dict:
+        """Path and health of the log, reported by query_history."""
+        return {
+            "path": self.path,
+            "status": "degraded" if self._error is not None else "ok",
+            "error": None if self._error is None else f"{type(self._error).__name__}: {self._error}",
+        }
+
+    def close(self):
+        """Write pending records and stop the writer thread."""
+        if self._writer is None:
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._writer = None
+        self._file.close()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # 组提交：把已排队的记录合并为一次写入和一次 fsync
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            waiters = [item for item in batch if isinstance(item, threading.Event)]
+            records = [item for item in batch if isinstance(item, tuple)]
+            if records and self._error is None:
+                try:
+                    self._write(records)
+                except Exception as exc:
+                    # 日志只是附加的持久化：记录一次错误后降级，不影响工具调用
+                    logger.exception("History log %s failed", self.path)
+                    self._error = exc
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _write(self, records):
+        self._file.write(b"".join(map(_encode, records)))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        if self.first_seq is None:
+            self.first_seq = records[0][0]
+        self.last_seq = records[-1][0]
+        if self.last_seq - self.first_seq + 1 > 2 * self.retain:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the log keeping only the newest retain records."""
+        self._file.close()
+        try:
+            with open(self.path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                pos = len(buffer)
+                for _ in range(self.retain):
+                    frame = _frame_ending_at(buffer, pos)
+                    if frame is None:
+                        raise ValueError(f"{self.path} has a corrupt record before offset {pos}")
+                    pos = frame[0]
+                first_seq = _first_seq_at(buffer, pos)
+                tmp_path = self.path + ".compact"
+                with open(tmp_path, "wb") as out:
+                    out.write(MAGIC)
+                    out.write(buffer[pos:])
+                    out.flush()
+                    os.fsync(out.fileno())
+            os.replace(tmp_path, self.path)
+            self.first_seq = first_seq
+        finally:
+            self._file = open(self.path, "ab")
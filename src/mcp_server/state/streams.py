@@ -0,0 +1,212 @@
+"""Server-side streaming statistics accumulators.
+
+A stream keeps only its running moments — count, mean, the sum of squared
+deviations M2 (and optionally M3/M4), min and max — so data can be pushed
+in chunks of any size with constant memory and no re-scan. Each pushed
+chunk is summarized about its own mean and folded in with the pairwise
+update of Chan et al. (extended to M3/M4 by Pébay), which is Welford's
+update applied to a block of points at once and is just as stable. Two
+streams merge the same way in O(1). The registry evicts least recently
+used streams beyond a fixed count.
+
+A stream may also carry a quantile sketch (quantile_sketch.TDigest), a
+heavy-hitter summary and a distinct-value counter (frequency.SpaceSaving,
+frequency.HyperLogLog) that are fed and merged alongside the moments; a
+pushed chunk is counted once for both frequency sketches. Everything
+serializes to plain data so a stream can be exported and restored later.
+"""
+import math
+import uuid
+from collections import Counter, OrderedDict
+
+DEFAULT_MAX_STREAMS = 1024
+
+
+class RunningMoments:
+    """Count, mean, central moment sums and extremes of everything pushed so far."""
+
+    __slots__ = ("count", "mean", "m2", "m3", "m4", "min", "max", "higher")
+
+    def __init__(self, higher: bool = False):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.higher = higher
+
+    @classmethod
+    def of(cls, values, higher: bool = False) -> "RunningMoments":
+        """Moments of one chunk, taken about the chunk's own mean."""
+        chunk = cls(higher)
+        count = len(values)
+        if not count:
+            return chunk
+        mean = math.fsum(values) / count
+        deviations = [value - mean for value in values]
+        chunk.count = count
+        chunk.mean = mean
+        chunk.m2 = math.sumprod(deviations, deviations)
+        if higher:
+            squares = [d * d for d in deviations]
+            chunk.m3 = math.sumprod(squares, deviations)
+            chunk.m4 = math.sumprod(squares, squares)
+        chunk.min = min(values)
+        chunk.max = max(values)
+        return chunk
+
+    def push(self, values):
+        """Add a chunk of values."""
+        self.merge(RunningMoments.of(values, self.higher))
+
+    def merge(self, other: "RunningMoments"):
+        """Fold other into this accumulator (Chan et al. / Pébay pairwise update)."""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean = other.count, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            return
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        m2 = self.m2 + other.m2 + delta * delta_n * n_a * n_b
+        if self.higher:
+            term = delta * delta_n * n_a * n_b
+            m3 = (self.m3 + other.m3 + term * delta_n * (n_a - n_b)
+                  + 3 * delta_n * (n_a * other.m2 - n_b * self.m2))
+            self.m4 = (self.m4 + other.m4 + term * delta_n * delta_n * (n_a * n_a - n_a * n_b + n_b * n_b)
+                       + 6 * delta_n * delta_n * (n_a * n_a * other.m2 + n_b * n_b * self.m2)
+                       + 4 * delta_n * (n_a * other.m3 - n_b * self.m3))
+            self.m3 = m3
+        self.count = n
+        self.mean += delta_n * n_b
+        self.m2 = m2
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        """Plain-data form for persisting; restore with from_dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "m3": self.m3 if self.higher else None,
+            "m4": self.m4 if self.higher else None,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "RunningMoments":
+        try:
+            moments = cls(state.get("m3") is not None and state.get("m4") is not None)
+            moments.count = int(state["count"])
+            if moments.count:
+                moments.mean, moments.m2 = float(state["mean"]), float(state["m2"])
+                moments.min, moments.max = float(state["min"]), float(state["max"])
+                if moments.higher:
+                    moments.m3, moments.m4 = float(state["m3"]), float(state["m4"])
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Invalid moments state: {exc}") from None
+        if moments.count < 0 or moments.m2 < 0:
+            raise ValueError("Invalid moments state: negative count or M2")
+        return moments
+
+    def result(self) -> dict:
+        """count, mean, variance/stddev (sample), min, max; skewness/kurtosis when tracked."""
+        if not self.count:
+            raise ValueError("Stream is empty; push data first")
+        variance = self.m2 / (self.count - 1) if self.count > 1 else None
+        result = {
+            "count": self.count,
+            "sum": self.mean * self.count,
+            "mean": self.mean,
+            "variance": variance,
+            "stddev": None if variance is None else math.sqrt(variance),
+            "min_value": self.min,
+            "max_value": self.max,
+        }
+        if self.higher:
+            # 总体偏度 g1 与超额峰度 g2；方差为 0 时无定义
+            if self.m2 > 0:
+                result["skewness"] = math.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+                result["kurtosis"] = self.count * self.m4 / (self.m2 * self.m2) - 3
+            else:
+                result["skewness"] = result["kurtosis"] = None
+        return result
+
+
+class Stream:
+    """A registered accumulator, its optional sketches and its handle."""
+
+    __slots__ = ("id", "moments", "digest", "heavy_hitters", "distinct")
+
+    def __init__(self, stream_id: str, moments: RunningMoments, digest=None, heavy_hitters=None, distinct=None):
+        self.id = stream_id
+        self.moments = moments
+        self.digest = digest
+        self.heavy_hitters = heavy_hitters
+        self.distinct = distinct
+
+    def push(self, values):
+        self.moments.push(values)
+        if self.digest is not None:
+            self.digest.add(values)
+        if self.heavy_hitters is not None or self.distinct is not None:
+            counter = Counter(values)
+            if self.heavy_hitters is not None:
+                self.heavy_hitters.add_counts(counter)
+            if self.distinct is not None:
+                self.distinct.add(counter)
+
+    def info(self) -> dict:
+        return {
+            "stream_id": self.id,
+            "count": self.moments.count,
+            "higher_moments": self.moments.higher,
+            "quantiles": self.digest is not None,
+            "top_k": None if self.heavy_hitters is None else self.heavy_hitters.k,
+            "distinct": self.distinct is not None,
+        }
+
+
+class StreamRegistry:
+    """LRU registry of streaming accumulators, bounded by count."""
+
+    def __init__(self, max_streams: int = DEFAULT_MAX_STREAMS):
+        self.max_streams = max_streams
+        self._streams = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def __contains__(self, stream_id: str) -> bool:
+        return stream_id in self._streams
+
+    def open(self, moments: RunningMoments = None, digest=None, heavy_hitters=None, distinct=None) -> Stream:
+        """Register a new (or the given) accumulator under a fresh handle."""
+        while len(self._streams) >= self.max_streams:
+            self._streams.popitem(last=False)
+        stream = Stream(uuid.uuid4().hex[:16], moments or RunningMoments(), digest, heavy_hitters, distinct)
+        self._streams[stream.id] = stream
+        return stream
+
+    def get(self, stream_id: str) -> Stream:
+        """Look up a stream and mark it as recently used."""
+        stream = self._streams.get(stream_id)
+        if stream is None:
+            raise ValueError(f"Unknown stream: {stream_id}")
+        self._streams.move_to_end(stream_id)
+        return stream
+
+    def close(self, stream_id: str) -> Stream:
+        """Remove a stream."""
+        stream = self._streams.pop(stream_id, None)
+        if stream is None:
+            raise ValueError(f"Unknown stream: {stream_id}")
+        return stream
@@ -0,0 +1,155 @@
+"""Memoized per-dataset summaries keyed by content hash.
+
+A summary computes each quantity (sum, sum of squared deviations, extremes,
+sorted view, ...) the first time a statistics tool asks for it and reuses it
+afterwards, so ``mean`` followed by ``stddev`` on the same stored dataset scans
+it only for the part that is new. The sorted view is shared by every order
+statistic. A summary keeps its dataset's buffer alive, so the buffer counts
+towards the budget, and summaries are evicted least recently used once the
+budget is exceeded. The dataset registry discards the summary of a dataset
+it evicts.
+"""
+import math
+import sys
+from array import array
+from collections import Counter, OrderedDict
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+# 每个摘要除数据本身和排序视图外的估算开销
+_SUMMARY_OVERHEAD = 512
+# 计数表每个不同值的估算开销 (float 键 + int 计数)
+_COUNT_ENTRY_BYTES = 52
+
+
+class DatasetSummary:
+    """Lazily computed statistics of one dataset snapshot."""
+
+    __slots__ = ("digest", "values", "nbytes", "_fields", "_cache")
+
+    def __init__(self, digest: str, values, cache):
+        self.digest = digest
+        self.values = values
+        # 摘要引用数据缓冲区并使其保持存活，因此计入预算
+        self.nbytes = _SUMMARY_OVERHEAD + 8 * len(values)
+        self._fields = {}
+        self._cache = cache
+
+    def get(self, name: str, compute):
+        """Return a cached quantity, computing it with compute() on first use."""
+        try:
+            value = self._fields[name]
+        except KeyError:
+            self._cache.misses += 1
+            value = self._fields[name] = compute()
+            return value
+        self._cache.hits += 1
+        return value
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    @property
+    def total(self) -> float:
+        return self.get("sum", lambda: math.fsum(self.values))
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+    @property
+    def m2(self) -> float:
+        """Sum of squared deviations from the mean."""
+        def compute():
+            avg = self.mean
+            deviations = [x - avg for x in self.values]
+            return math.sumprod(deviations, deviations)
+        return self.get("m2", compute)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1)
+
+    @property
+    def min(self) -> float:
+        return self.get("min", lambda: min(self.values))
+
+    @property
+    def max(self) -> float:
+        return self.get("max", lambda: max(self.values))
+
+    @property
+    def sorted(self) -> array:
+        """Sorted copy of the values shared by all order statistics."""
+        def compute():
+            view = array("d", sorted(self.values))
+            self._cache._grow(self, len(view) * view.itemsize)
+            return view
+        return self.get("sorted", compute)
+
+    @property
+    def counts(self) -> Counter:
+        """Occurrences of each distinct value, shared by mode and frequencies."""
+        def compute():
+            counter = Counter(self.values)
+            self._cache._grow(self, sys.getsizeof(counter) + len(counter) * _COUNT_ENTRY_BYTES)
+            return counter
+        return self.get("counts", compute)
+
+
+class SummaryCache:
+    """LRU cache of dataset summaries with hit/miss counters."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._summaries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def get(self, digest: str, values) -> DatasetSummary:
+        """Return the summary for a dataset, creating an empty one if needed."""
+        summary = self._summaries.get(digest)
+        if summary is not None:
+            self._summaries.move_to_end(digest)
+            return summary
+        summary = DatasetSummary(digest, values, self)
+        self._summaries[digest] = summary
+        self.total_bytes += summary.nbytes
+        self._evict(keep=digest)
+        return summary
+
+    def discard(self, digest: str):
+        """Forget the summary of a dataset whose contents changed or were dropped."""
+        summary = self._summaries.pop(digest, None)
+        if summary is not None:
+            self.total_bytes -= summary.nbytes
+
+    def info(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._summaries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _grow(self, summary: DatasetSummary, nbytes: int):
+        summary.nbytes += nbytes
+        if summary.digest in self._summaries:
+            self.total_bytes += nbytes
+            self._evict(keep=summary.digest)
+
+    def _evict(self, keep: str):
+        while self.total_bytes > self.max_bytes and len(self._summaries) > 1:
+            victim = next(iter(self._summaries))
+            if victim == keep:
+                self._summaries.move_to_end(victim)
+                continue
+            self.discard(victim)
@@ -0,0 +1,417 @@
+"""Run many calculator operations in one request.
+
+Each operation names a tool and passes the same arguments that tool takes.
+Calls go straight to the ``tools/*`` functions: arguments are coerced with
+``float()``/``int()`` and the tool inputs are built with ``model_construct``,
+with the checks the input models would run done inline, so a batch of 200
+small calculations costs little more than the calculations themselves.
+"""
+import asyncio
+
+from . import add_tool, subtract_tool, multiply_tool, divide_tool
+from . import power_tool, root_tool, mod_tool, factorial_tool
+from . import statistics_tool, evaluate_tool, elementwise_tool, combinatorics_tool
+from . import distribution_tool, finance_tool, convert_tool
+from .packed import unpack
+from ..models.schemas import (
+    AddInput, SubtractInput, MultiplyInput, DivideInput, PowerInput, RootInput,
+    ModInput, FactorialInput, StatisticsInput, PackedNumbers, EvaluateInput, ElementwiseInput,
+    CombinatoricsInput, BinomialInput, PoissonInput, NormalInput, NormalPpfInput,
+    NpvInput, IrrInput, PmtInput, FvInput, PvInput, NperInput, ConvertInput
+)
+
+
+def _float(args, name, default=None):
+    value = args.get(name, default)
+    if value is None:
+        raise ValueError(f"Missing argument: {name}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Argument {name} must be a number")
+    return float(value)
+
+def _int(args, name):
+    value = args.get(name)
+    if value is None:
+        raise ValueError(f"Missing argument: {name}")
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"Argument {name} must be an integer")
+    return value
+
+def _numbers(args, name):
+    value = args.get(name)
+    if value is None:
+        raise ValueError(f"Missing argument: {name}")
+    if isinstance(value, list):
+        if not value:
+            raise ValueError(f"Argument {name} must not be empty")
+        try:
+            return [float(x) for x in value]
+        except (TypeError, ValueError):
+            raise ValueError(f"Argument {name} must contain only numbers") from None
+    return _float(args, name)
+
+
+# 基础与高级运算
+async def _add(args, resolve_dataset):
+    return await add_tool.add(AddInput.model_construct(a=_float(args, "a"), b=_float(args, "b")))
+
+async def _subtract(args, resolve_dataset):
+    return await subtract_tool.subtract(
+        SubtractInput.model_construct(a=_float(args, "a"), b=_float(args, "b"))
+    )
+
+async def _multiply(args, resolve_dataset):
+    return await multiply_tool.multiply(
+        MultiplyInput.model_construct(a=_float(args, "a"), b=_float(args, "b"))
+    )
+
+async def _divide(args, resolve_dataset):
+    result = await divide_tool.divide(
+        DivideInput.model_construct(a=_float(args, "a"), b=_float(args, "b"))
+    )
+    if result["status"] != "success":
+        raise ValueError(result["error"])
+    return result["result"]
+
+async def _power(args, resolve_dataset):
+    return await power_tool.power(
+        PowerInput.model_construct(base=_float(args, "base"), exponent=_float(args, "exponent"))
+    )
+
+async def _root(args, resolve_dataset):
+    return await root_tool.root(
+        RootInput.model_construct(number=_float(args, "number"), degree=_float(args, "n", 2))
+    )
+
+async def _mod(args, resolve_dataset):
+    b = _int(args, "b")
+    if b == 0:
+        raise ValueError("Divisor cannot be zero")
+    return await mod_tool.mod(ModInput.model_construct(a=_int(args, "a"), b=b))
+
+async def _factorial(args, resolve_dataset):
+    n = _int(args, "n")
+    if not 0 <= n <= factorial_tool.MAX_FACTORIAL_N:
+        raise ValueError(f"Factorial requires 0 <= n <= {factorial_tool.MAX_FACTORIAL_N}")
+    return await factorial_tool.factorial(
+        FactorialInput.model_construct(n=n, output=_output(args)), None
+    )
+
+def _output(args):
+    output = args.get("output", "auto")
+    if output not in ("auto", "exact", "summary"):
+        raise ValueError("Argument output must be 'auto', 'exact' or 'summary'")
+    return output
+
+def _combinatorics(func):
+    async def run(args, resolve_dataset):
+        n = _int(args, "n")
+        r = _int(args, "r")
+        if not 0 <= r <= n:
+            raise ValueError("Combinatorics requires 0 <= r <= n")
+        return await func(CombinatoricsInput.model_construct(n=n, r=r, output=_output(args)))
+    return run
+
+async def _evaluate(args, resolve_dataset):
+    expression = args.get("expression")
+    if not isinstance(expression, str) or not expression:
+        raise ValueError("Missing argument: expression")
+    variables = args.get("variables") or {}
+    if not isinstance(variables, dict):
+        raise ValueError("Argument variables must be an object")
+    variables = {str(name): _float(variables, name) for name in variables}
+    return await evaluate_tool.evaluate(
+        EvaluateInput.model_construct(expression=expression, variables=variables)
+    )
+
+
+# 统计工具: numbers、packed 或 dataset_id
+def _statistics_input(args, resolve_dataset):
+    given = [name for name in ("numbers", "packed", "dataset_id") if args.get(name) is not None]
+    if not given:
+        raise ValueError("Provide numbers, packed or dataset_id")
+    if len(given) > 1:
+        raise ValueError(f"Provide either {given[0]} or {given[1]}, not both")
+    if "packed" in given:
+        packed = PackedNumbers.model_validate(args["packed"])
+        return StatisticsInput.model_construct(data=unpack(packed.data, packed.encoding)), None
+    dataset_id = args.get("dataset_id")
+    if dataset_id is not None:
+        if resolve_dataset is None:
+            raise ValueError("Stored datasets are not available")
+        return resolve_dataset(dataset_id)
+    numbers = _numbers(args, "numbers")
+    if not isinstance(numbers, list):
+        raise ValueError("Argument numbers must be a list")
+    return StatisticsInput.model_construct(data=numbers), None
+
+def _statistic(func):
+    async def run(args, resolve_dataset):
+        statistics_input, summary = _statistics_input(args, resolve_dataset)
+        return await func(statistics_input, summary=summary, backend=args.get("backend"))
+    return run
+
+async def _percentile(args, resolve_dataset):
+    p = _float(args, "p")
+    approximate = args.get("approximate", False)
+    if not isinstance(approximate, bool):
+        raise ValueError("approximate must be true or false")
+    statistics_input, summary = _statistics_input(args, resolve_dataset)
+    return await statistics_tool.percentile(statistics_input, p, summary=summary, approximate=approximate, backend=args.get("backend"))
+
+async def _frequencies(args, resolve_dataset):
+    k = _int(args, "k") if args.get("k") is not None else args.get("k", 10)
+    statistics_input, summary = _statistics_input(args, resolve_dataset)
+    return await statistics_tool.frequencies(statistics_input, k, summary=summary, backend=args.get("backend"))
+
+async def _describe(args, resolve_dataset):
+    stats = args.get("stats")
+    if stats is not None and not (isinstance(stats, list) and all(isinstance(name, str) for name in stats)):
+        raise ValueError("Argument stats must be a list of statistic names")
+    statistics_input, summary = _statistics_input(args, resolve_dataset)
+    return await statistics_tool.describe(statistics_input, stats, summary=summary, backend=args.get("backend"))
+
+
+# 概率分布: 参数为单个点或点的列表
+def _points(args, name, convert):
+    value = args.get(name)
+    if value is None:
+        raise ValueError(f"Missing argument: {name}")
+    values = value if isinstance(value, list) else [value]
+    if not values:
+        raise ValueError(f"Argument {name} must not be empty")
+    converted = [convert({name: item}, name) for item in values]
+    return converted if isinstance(value, list) else converted[0]
+
+def _probability(args):
+    p = _float(args, "p")
+    if not 0 <= p <= 1:
+        raise ValueError("Probability p must be between 0 and 1")
+    return p
+
+async def _binomial_pmf(args, resolve_dataset):
+    n = _int(args, "n")
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return await distribution_tool.binomial_pmf(
+        BinomialInput.model_construct(n=n, p=_probability(args), k=_points(args, "k", _int))
+    )
+
+async def _binomial_cdf(args, resolve_dataset):
+    n = _int(args, "n")
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return await distribution_tool.binomial_cdf(
+        BinomialInput.model_construct(n=n, p=_probability(args), k=_points(args, "k", _int))
+    )
+
+async def _poisson_pmf(args, resolve_dataset):
+    lam = _float(args, "lam")
+    if lam <= 0:
+        raise ValueError("lam must be positive")
+    return await distribution_tool.poisson_pmf(
+        PoissonInput.model_construct(lam=lam, k=_points(args, "k", _int))
+    )
+
+def _normal_parameters(args):
+    std = _float(args, "std", 1.0)
+    if std <= 0:
+        raise ValueError("std must be positive")
+    return _float(args, "mean", 0.0), std
+
+async def _normal_cdf(args, resolve_dataset):
+    mean, std = _normal_parameters(args)
+    return await distribution_tool.normal_cdf(
+        NormalInput.model_construct(x=_points(args, "x", _float), mean=mean, std=std)
+    )
+
+async def _normal_ppf(args, resolve_dataset):
+    mean, std = _normal_parameters(args)
+    return await distribution_tool.normal_ppf(
+        NormalPpfInput.model_construct(q=_points(args, "q", _float), mean=mean, std=std)
+    )
+
+
+# 现金流与货币时间价值
+def _rate(args, name="rate", default=None):
+    rate = _float(args, name, default)
+    if rate <= -1:
+        raise ValueError(f"{name} must be greater than -1")
+    return rate
+
+def _cashflows(args):
+    cashflows = _numbers(args, "cashflows")
+    if not isinstance(cashflows, list):
+        raise ValueError("Argument cashflows must be a list")
+    return cashflows
+
+def _periods(args):
+    nper = _float(args, "nper")
+    if nper <= 0:
+        raise ValueError("nper must be positive")
+    return nper
+
+def _when(args):
+    when = args.get("when", "end")
+    if when not in ("end", "begin"):
+        raise ValueError("Argument when must be 'end' or 'begin'")
+    return when
+
+async def _npv(args, resolve_dataset):
+    return await finance_tool.npv(NpvInput.model_construct(rate=_rate(args), cashflows=_cashflows(args)))
+
+async def _irr(args, resolve_dataset):
+    return await finance_tool.irr(
+        IrrInput.model_construct(cashflows=_cashflows(args), guess=_rate(args, "guess", 0.1))
+    )
+
+async def _pmt(args, resolve_dataset):
+    return await finance_tool.pmt(PmtInput.model_construct(
+        rate=_rate(args), nper=_periods(args), pv=_float(args, "pv"),
+        fv=_float(args, "fv", 0.0), when=_when(args)
+    ))
+
+async def _fv(args, resolve_dataset):
+    return await finance_tool.fv(FvInput.model_construct(
+        rate=_rate(args), nper=_periods(args), pmt=_float(args, "pmt"),
+        pv=_float(args, "pv", 0.0), when=_when(args)
+    ))
+
+async def _pv(args, resolve_dataset):
+    return await finance_tool.pv(PvInput.model_construct(
+        rate=_rate(args), nper=_periods(args), pmt=_float(args, "pmt"),
+        fv=_float(args, "fv", 0.0), when=_when(args)
+    ))
+
+async def _nper(args, resolve_dataset):
+    return await finance_tool.nper(NperInput.model_construct(
+        rate=_rate(args), pmt=_float(args, "pmt"), pv=_float(args, "pv"),
+        fv=_float(args, "fv", 0.0), when=_when(args)
+    ))
+
+
+# 单位换算
+def _unit(args, name):
+    unit = args.get(name)
+    if not isinstance(unit, str) or not unit:
+        raise ValueError(f"Missing argument: {name}")
+    return unit
+
+async def _convert(args, resolve_dataset):
+    return await convert_tool.convert(ConvertInput.model_construct(
+        value=_numbers(args, "value"), from_unit=_unit(args, "from_unit"), to_unit=_unit(args, "to_unit")
+    ))
+
+
+# 逐元素运算: 参数名与对应工具一致
+def _elementwise(func, a_name="a", b_name="b", b_default=None):
+    async def run(args, resolve_dataset):
+        b = _numbers(args, b_name) if b_default is None or b_name in args else b_default
+        return await func(ElementwiseInput.model_construct(a=_numbers(args, a_name), b=b))
+    return run
+
+
+# 操作名 -> (处理函数, 位置参数顺序, 仅限关键字的参数)
+# 位置参数顺序与各工具的参数顺序一致，管道的列表形式步骤按此顺序填参
+_DATA_SOURCES = ("packed", "dataset_id", "backend")
+
+OPERATIONS = {
+    "add": (_add, ("a", "b"), ()),
+    "subtract": (_subtract, ("a", "b"), ()),
+    "multiply": (_multiply, ("a", "b"), ()),
+    "divide": (_divide, ("a", "b"), ()),
+    "power": (_power, ("base", "exponent"), ()),
+    "root": (_root, ("number", "n"), ()),
+    "mod": (_mod, ("a", "b"), ()),
+    "factorial": (_factorial, ("n", "output"), ()),
+    "evaluate": (_evaluate, ("expression", "variables"), ()),
+    "permutations": (_combinatorics(combinatorics_tool.permutations), ("n", "r", "output"), ()),
+    "combinations": (_combinatorics(combinatorics_tool.combinations), ("n", "r", "output"), ()),
+    "log_comb": (_combinatorics(combinatorics_tool.log_combinations), ("n", "r"), ()),
+    "binomial_pmf": (_binomial_pmf, ("n", "p", "k"), ()),
+    "binomial_cdf": (_binomial_cdf, ("n", "p", "k"), ()),
+    "poisson_pmf": (_poisson_pmf, ("lam", "k"), ()),
+    "normal_cdf": (_normal_cdf, ("x", "mean", "std"), ()),
+    "normal_ppf": (_normal_ppf, ("q", "mean", "std"), ()),
+    "npv": (_npv, ("rate", "cashflows"), ()),
+    "irr": (_irr, ("cashflows", "guess"), ()),
+    "pmt": (_pmt, ("rate", "nper", "pv", "fv", "when"), ()),
+    "fv": (_fv, ("rate", "nper", "pmt", "pv", "when"), ()),
+    "pv": (_pv, ("rate", "nper", "pmt", "fv", "when"), ()),
+    "nper": (_nper, ("rate", "pmt", "pv", "fv", "when"), ()),
+    "convert": (_convert, ("value", "from_unit", "to_unit"), ()),
+    "add_many": (_elementwise(elementwise_tool.add_many), ("a", "b"), ()),
+    "subtract_many": (_elementwise(elementwise_tool.subtract_many), ("a", "b"), ()),
+    "multiply_many": (_elementwise(elementwise_tool.multiply_many), ("a", "b"), ()),
+    "divide_many": (_elementwise(elementwise_tool.divide_many), ("a", "b"), ()),
+    "power_many": (_elementwise(elementwise_tool.power_many, "base", "exponent"), ("base", "exponent"), ()),
+    "root_many": (_elementwise(elementwise_tool.root_many, "numbers", "n", 2.0), ("numbers", "n"), ()),
+    "percentile": (_percentile, ("numbers", "p"), ("approximate",) + _DATA_SOURCES),
+    "describe": (_describe, ("numbers", "stats"), _DATA_SOURCES),
+    "frequencies": (_frequencies, ("numbers", "k"), _DATA_SOURCES),
+}
+for _name, _func in (
+    ("mean", statistics_tool.mean),
+    ("median", statistics_tool.median),
+    ("mode", statistics_tool.mode),
+    ("stddev", statistics_tool.stddev),
+    ("variance", statistics_tool.variance),
+    ("min_value", statistics_tool.min_value),
+    ("max_value", statistics_tool.max_value),
+    ("sum", statistics_tool.sum_values),
+    ("count", statistics_tool.count_values),
+    ("range_stat", statistics_tool.range_values),
+    ("quartiles", statistics_tool.quartiles),
+    ("iqr", statistics_tool.iqr),
+    ("geometric_mean", statistics_tool.geometric_mean),
+    ("harmonic_mean", statistics_tool.harmonic_mean),
+):
+    OPERATIONS[_name] = (_statistic(_func), ("numbers",), _DATA_SOURCES)
+
+
+async def run_operation(op: str, args: dict, resolve_dataset=None):
+    """Run a single operation by tool name; raises ValueError on bad input."""
+    try:
+        handler, positional, keyword_only = OPERATIONS[op]
+    except KeyError:
+        raise ValueError(f"Unknown operation: {op}") from None
+    unexpected = args.keys() - {*positional, *keyword_only}
+    if unexpected:
+        raise ValueError(f"Unexpected argument(s) for {op}: {', '.join(sorted(unexpected))}")
+    return await handler(args, resolve_dataset)
+
+
+async def _run_item(index, operation, resolve_dataset):
+    try:
+        result = await run_operation(operation.op, operation.args, resolve_dataset)
+    except Exception as exc:
+        # 任何单项失败都只记录在该项上，不中断整个批次
+        return {"index": index, "op": operation.op, "error": str(exc), "status": "failed"}
+    return {"index": index, "op": operation.op, "result": result, "status": "success"}
+
+
+async def batch(input_data, resolve_dataset=None):
+    """Run every operation in the batch concurrently; results keep the request order.
+
+    A failing operation is reported in its own slot and does not affect the
+    others. ``resolve_dataset(dataset_id)`` supplies ``(StatisticsInput,
+    summary)`` for statistics operations that reference a stored dataset.
+    """
+    results = await asyncio.gather(*(
+        _run_item(index, operation, resolve_dataset)
+        for index, operation in enumerate(input_data.operations)
+    ))
+    error_count = sum(1 for item in results if item["status"] == "failed")
+    if error_count == 0:
+        status = "success"
+    elif error_count == len(results):
+        status = "failed"
+    else:
+        status = "partial"
+    return {
+        "results": results,
+        "error_count": error_count,
+        "status": status
+    }
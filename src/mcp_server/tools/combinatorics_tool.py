@@ -0,0 +1,152 @@
+"""Permutations and combinations backed by factorial tables.
+
+Exact factorials live in a lazily grown table bounded by
+FACTORIAL_CACHE_BYTES, so repeated C(n, r) for moderate n is a few lookups and
+one division instead of three factorials. ln(k!) comes from a float table
+grown in chunks up to LOG_TABLE_SIZE (math.lgamma beyond it), so log-space
+results such as ln C(10**6, k) never build the large integers. Results too
+long to return exactly come back as a summary built from the logarithm.
+"""
+import math
+from array import array
+
+from .factorial_tool import EXACT_MAX_DIGITS
+
+FACTORIAL_CACHE_BYTES = 16 * 1024 * 1024
+LOG_TABLE_SIZE = 1_000_001
+# min(r, n - r) 不超过该值时逐项计算更快也更精确
+_SMALL_K = 64
+
+
+class FactorialTable:
+    """Exact factorials 0!, 1!, ... grown on demand up to a byte budget."""
+
+    def __init__(self, max_bytes: int = FACTORIAL_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._values = [1]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, n: int):
+        """Return n!, or None if storing it would exceed the budget."""
+        values = self._values
+        while len(values) <= n:
+            value = values[-1] * len(values)
+            size = (value.bit_length() + 7) // 8
+            if self.nbytes + size > self.max_bytes:
+                return None
+            values.append(value)
+            self.nbytes += size
+        return values[n]
+
+
+class LogFactorialTable:
+    """ln(k!) for k < size, grown in chunks; math.lgamma beyond the table."""
+
+    def __init__(self, size: int = LOG_TABLE_SIZE):
+        self.size = size
+        self._values = array("d", [0.0])
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, n: int) -> float:
+        values = self._values
+        if n < len(values):
+            return values[n]
+        if n >= self.size:
+            return math.lgamma(n + 1)
+        # 至少翻倍增长，摊销扩容开销
+        end = min(self.size, max(n + 1, 2 * len(values)))
+        values.extend(map(math.lgamma, range(len(values) + 1, end + 1)))
+        return values[n]
+
+
+factorials = FactorialTable()
+log_factorials = LogFactorialTable()
+
+
+def _validate(n: int, r: int):
+    if n < 0 or r < 0:
+        raise ValueError("n and r must be non-negative")
+    if r > n:
+        raise ValueError("r cannot be greater than n")
+
+
+def log_comb(n: int, r: int) -> float:
+    """Natural logarithm of C(n, r)."""
+    _validate(n, r)
+    k = min(r, n - r)
+    if k <= _SMALL_K:
+        return math.fsum(math.log((n - i) / (i + 1)) for i in range(k))
+    return log_factorials.get(n) - log_factorials.get(r) - log_factorials.get(n - r)
+
+
+def log_perm(n: int, r: int) -> float:
+    """Natural logarithm of P(n, r) = n!/(n-r)!."""
+    _validate(n, r)
+    if r <= _SMALL_K:
+        return math.fsum(math.log(n - i) for i in range(r))
+    return log_factorials.get(n) - log_factorials.get(n - r)
+
+
+def comb(n: int, r: int) -> int:
+    """Exact C(n, r), using cached factorials when they help."""
+    _validate(n, r)
+    if min(r, n - r) > _SMALL_K:
+        n_factorial = factorials.get(n)
+        if n_factorial is not None:
+            return n_factorial // (factorials.get(r) * factorials.get(n - r))
+    return math.comb(n, r)
+
+
+def perm(n: int, r: int) -> int:
+    """Exact P(n, r), using cached factorials when they help."""
+    _validate(n, r)
+    if r > _SMALL_K:
+        n_factorial = factorials.get(n)
+        if n_factorial is not None:
+            return n_factorial // factorials.get(n - r)
+    return math.perm(n, r)
+
+
+def _log_summary(ln_value: float) -> dict:
+    log10 = ln_value / math.log(10)
+    exponent = math.floor(log10)
+    mantissa = 10 ** (log10 - exponent)
+    return {
+        "ln": ln_value,
+        "log10": log10,
+        "digits": exponent + 1,
+        "scientific": f"{mantissa:.12f}e+{exponent}",
+    }
+
+
+def _result(exact, ln_value: float, output: str, label: str):
+    digits = math.floor(ln_value / math.log(10)) + 1
+    if output == "auto":
+        output = "exact" if digits <= EXACT_MAX_DIGITS else "summary"
+    if output == "summary":
+        return _log_summary(ln_value)
+    if digits > EXACT_MAX_DIGITS:
+        raise ValueError(
+            f"{label} has about {digits} digits, more than {EXACT_MAX_DIGITS}; use output='summary'"
+        )
+    return exact()
+
+
+async def permutations(input_data):
+    """Number of ordered arrangements of r items from n: P(n, r) = n!/(n-r)!."""
+    n, r = input_data.n, input_data.r
+    return _result(lambda: perm(n, r), log_perm(n, r), input_data.output, f"P({n}, {r})")
+
+async def combinations(input_data):
+    """Number of unordered selections of r items from n: C(n, r) = n!/[r!(n-r)!]."""
+    n, r = input_data.n, input_data.r
+    return _result(lambda: comb(n, r), log_comb(n, r), input_data.output, f"C({n}, {r})")
+
+async def log_combinations(input_data):
+    """Natural logarithm of C(n, r), for n far beyond exact arithmetic."""
+    return log_comb(input_data.n, input_data.r)
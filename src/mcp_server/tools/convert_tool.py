@@ -0,0 +1,519 @@
+"""Unit conversion from a registry built once at import.
+
+Units are defined by the relations people know (1 mi = 5280 ft, 1 ft =
+12 in, 1 in = 2.54 cm, ...). When the registry is built, those relations
+are followed with exact fractions to every unit of the same dimension, and
+the exact factor for every pair of units is stored, so a conversion is one
+lookup of the (from, to) pair. The factor stays a fraction num/den until
+the value is applied as ``fma(value, num, offset·den) / den``; for ratios of
+small integers (25.4 mm = 1 in, 0.3048 m = 1 ft) round numbers therefore
+convert to round numbers instead of picking up the error of a rounded
+scale. Temperature scales are stored the same way as affine (scale, offset)
+pairs.
+
+Compound expressions such as ``kg*m/s^2``, ``mi/gal`` or ``L/100km`` are
+parsed into an SI factor and a vector of base-dimension exponents (length,
+mass, time, temperature). Parsed units are interned by their text and each
+(from, to) pair is cached once resolved, so repeated conversions skip
+parsing entirely. Units whose dimensions are exact inverses (fuel economy
+in mi/gal and L/100km) convert reciprocally; any other mismatch is
+rejected. Inside compound expressions temperature units are intervals.
+"""
+import math
+import operator
+import re
+from collections import deque
+from fractions import Fraction
+from itertools import repeat
+
+# 基本量纲: 长度、质量、时间、温度
+BASE_DIMENSIONS = ("m", "kg", "s", "K")
+DIMENSION_VECTORS = {
+    "length": (1, 0, 0, 0),
+    "mass": (0, 1, 0, 0),
+    "time": (0, 0, 1, 0),
+    "temperature": (0, 0, 0, 1),
+    "area": (2, 0, 0, 0),
+    "volume": (3, 0, 0, 0),
+    "speed": (1, 0, -1, 0),
+    "force": (1, 1, -2, 0),
+    "energy": (2, 1, -2, 0),
+    "power": (2, 1, -3, 0),
+    "pressure": (-1, 1, -2, 0),
+}
+
+# (单位, 倍数, 参照单位): 1 单位 = 倍数 × 参照单位；每个量纲的第一个单位为 SI 基准
+LINEAR_UNITS = {
+    "length": [
+        ("m", 1, None),
+        ("km", 1000, "m"),
+        ("cm", Fraction(1, 100), "m"),
+        ("mm", Fraction(1, 10), "cm"),
+        ("um", Fraction(1, 1000), "mm"),
+        ("nm", Fraction(1, 1000), "um"),
+        ("in", Fraction("2.54"), "cm"),
+        ("ft", 12, "in"),
+        ("yd", 3, "ft"),
+        ("mi", 5280, "ft"),
+        ("nmi", 1852, "m"),
+    ],
+    "mass": [
+        ("kg", 1, None),
+        ("g", Fraction(1, 1000), "kg"),
+        ("mg", Fraction(1, 1000), "g"),
+        ("ug", Fraction(1, 1000), "mg"),
+        ("t", 1000, "kg"),
+        ("lb", Fraction("0.45359237"), "kg"),
+        ("oz", Fraction(1, 16), "lb"),
+        ("st", 14, "lb"),
+        ("short_ton", 2000, "lb"),
+        ("long_ton", 2240, "lb"),
+    ],
+    "time": [
+        ("s", 1, None),
+        ("min", 60, "s"),
+        ("h", 60, "min"),
+        ("day", 24, "h"),
+        ("week", 7, "day"),
+        ("yr", Fraction("365.25"), "day"),
+    ],
+    "area": [
+        ("m2", 1, None),
+        ("km2", 10 ** 6, "m2"),
+        ("ha", 10 ** 4, "m2"),
+        ("acre", Fraction("4046.8564224"), "m2"),
+        ("ft2", Fraction("0.09290304"), "m2"),
+    ],
+    "speed": [
+        ("m/s", 1, None),
+        ("km/h", Fraction(1000, 3600), "m/s"),
+        ("mph", Fraction("1609.344") / 3600, "m/s"),
+        ("kn", Fraction(1852, 3600), "m/s"),
+        ("ft/s", Fraction("0.3048"), "m/s"),
+    ],
+    "volume": [
+        ("m3", 1, None),
+        ("L", Fraction(1, 1000), "m3"),
+        ("mL", Fraction(1, 1000), "L"),
+        ("cm3", 1, "mL"),
+        ("in3", Fraction("16.387064"), "cm3"),
+        ("ft3", 1728, "in3"),
+        ("gal", 231, "in3"),
+        ("qt", Fraction(1, 4), "gal"),
+        ("pt", Fraction(1, 2), "qt"),
+        ("cup", Fraction(1, 2), "pt"),
+        ("fl_oz", Fraction(1, 8), "cup"),
+        ("tbsp", Fraction(1, 2), "fl_oz"),
+        ("tsp", Fraction(1, 3), "tbsp"),
+        ("bbl", 42, "gal"),
+        ("imp_gal", Fraction("4.54609"), "L"),
+    ],
+    "force": [
+        ("N", 1, None),
+        ("kgf", Fraction("9.80665"), "N"),
+        ("lbf", Fraction("4.4482216152605"), "N"),
+    ],
+    "energy": [
+        ("J", 1, None),
+        ("Wh", 3600, "J"),
+        ("kWh", 1000, "Wh"),
+        ("cal", Fraction("4.184"), "J"),
+        ("kcal", 1000, "cal"),
+        ("BTU", Fraction("1055.05585262"), "J"),
+    ],
+    "power": [
+        ("W", 1, None),
+        ("hp", Fraction("745.69987158227022"), "W"),
+    ],
+    "pressure": [
+        ("Pa", 1, None),
+        ("bar", 10 ** 5, "Pa"),
+        ("atm", 101325, "Pa"),
+        ("psi", Fraction("4.4482216152605") / Fraction("0.0254") ** 2, "Pa"),
+        ("mmHg", Fraction("133.322387415"), "Pa"),
+    ],
+}
+
+# 温标: kelvin = scale × value + offset
+TEMPERATURE_UNITS = {
+    "K": (Fraction(1), Fraction(0)),
+    "C": (Fraction(1), Fraction("273.15")),
+    "F": (Fraction(5, 9), Fraction("273.15") - Fraction(5, 9) * 32),
+    "R": (Fraction(5, 9), Fraction(0)),
+}
+
+# SI 词头，只用于下列单位符号 (如 kN、MJ、ms)
+PREFIXES = {
+    "da": 10, "G": 10 ** 9, "M": 10 ** 6, "k": 1000, "h": 100, "d": Fraction(1, 10),
+    "c": Fraction(1, 100), "m": Fraction(1, 1000), "u": Fraction(1, 10 ** 6),
+    "µ": Fraction(1, 10 ** 6), "n": Fraction(1, 10 ** 9),
+}
+PREFIXABLE = {"m", "g", "s", "L", "N", "J", "W", "Pa", "Wh"}
+
+# 解析结果和换算对缓存的条目上限
+MAX_CACHED = 4096
+# 分子和分母都不超过该值时按 value * num / den 精确地应用比例
+_EXACT_INT = 2 ** 53
+
+ALIASES = {
+    "m": ["meter", "meters", "metre", "metres"],
+    "km": ["kilometer", "kilometers", "kilometre", "kilometres"],
+    "cm": ["centimeter", "centimeters", "centimetre", "centimetres"],
+    "mm": ["millimeter", "millimeters", "millimetre", "millimetres"],
+    "um": ["µm", "micrometer", "micrometers", "micron", "microns"],
+    "nm": ["nanometer", "nanometers"],
+    "in": ["inch", "inches"],
+    "ft": ["foot", "feet"],
+    "yd": ["yard", "yards"],
+    "mi": ["mile", "miles"],
+    "nmi": ["nautical_mile", "nautical_miles"],
+    "kg": ["kilogram", "kilograms", "kilo", "kilos"],
+    "g": ["gram", "grams"],
+    "mg": ["milligram", "milligrams"],
+    "ug": ["µg", "microgram", "micrograms"],
+    "t": ["tonne", "tonnes", "metric_ton", "metric_tons"],
+    "lb": ["lbs", "pound", "pounds"],
+    "oz": ["ounce", "ounces"],
+    "st": ["stone", "stones"],
+    "short_ton": ["ton", "tons", "us_ton", "short_tons"],
+    "long_ton": ["uk_ton", "long_tons"],
+    "m/s": ["mps", "meters_per_second"],
+    "km/h": ["kph", "kmh", "kmph", "kilometers_per_hour"],
+    "mph": ["mi/h", "miles_per_hour"],
+    "kn": ["kt", "knot", "knots"],
+    "ft/s": ["fps", "feet_per_second"],
+    "m3": ["m^3", "cubic_meter", "cubic_meters"],
+    "L": ["l", "liter", "liters", "litre", "litres"],
+    "mL": ["ml", "milliliter", "milliliters", "millilitre", "millilitres"],
+    "cm3": ["cm^3", "cc", "cubic_centimeter", "cubic_centimeters"],
+    "in3": ["in^3", "cubic_inch", "cubic_inches"],
+    "ft3": ["ft^3", "cubic_foot", "cubic_feet"],
+    "gal": ["gallon", "gallons", "us_gal", "us_gallon", "us_gallons"],
+    "qt": ["quart", "quarts"],
+    "pt": ["pint", "pints"],
+    "cup": ["cups"],
+    "fl_oz": ["fluid_ounce", "fluid_ounces"],
+    "tbsp": ["tablespoon", "tablespoons"],
+    "tsp": ["teaspoon", "teaspoons"],
+    "bbl": ["barrel", "barrels"],
+    "imp_gal": ["imperial_gallon", "imperial_gallons", "uk_gallon", "uk_gallons"],
+    "s": ["sec", "second", "seconds"],
+    "min": ["minute", "minutes"],
+    "h": ["hr", "hour", "hours"],
+    "day": ["d", "days"],
+    "week": ["wk", "weeks"],
+    "yr": ["year", "years"],
+    "m2": ["m^2", "square_meter", "square_meters"],
+    "km2": ["km^2", "square_kilometer", "square_kilometers"],
+    "ha": ["hectare", "hectares"],
+    "acre": ["acres"],
+    "ft2": ["ft^2", "square_foot", "square_feet"],
+    "N": ["newton", "newtons"],
+    "lbf": ["pound_force"],
+    "kgf": ["kilogram_force"],
+    "J": ["joule", "joules"],
+    "kWh": ["kilowatt_hour", "kilowatt_hours"],
+    "cal": ["calorie", "calories"],
+    "kcal": ["kilocalorie", "kilocalories"],
+    "BTU": ["btus"],
+    "W": ["watt", "watts"],
+    "hp": ["horsepower"],
+    "Pa": ["pascal", "pascals"],
+    "bar": ["bars"],
+    "atm": ["atmosphere", "atmospheres"],
+    "K": ["kelvin"],
+    "C": ["°c", "celsius", "centigrade"],
+    "F": ["°f", "fahrenheit"],
+    "R": ["°r", "rankine"],
+}
+
+
+_TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)|([A-Za-z_µ°][A-Za-z_µ°]*\d*)|(\*\*|[-*/^()·]))")
+_IDENTIFIER = re.compile(r"[A-Za-z_µ°][A-Za-z_µ°]*\d*")
+
+
+class Unit:
+    """A unit as an SI factor and base-dimension exponents."""
+
+    __slots__ = ("expression", "factor", "dims")
+
+    def __init__(self, expression: str, factor: Fraction, dims: tuple):
+        self.expression = expression
+        self.factor = factor
+        self.dims = dims
+
+
+def _kernel(scale: Fraction, offset: Fraction, reciprocal: bool):
+    """Float (num, den, offset·den, reciprocal) applying an exact conversion."""
+    num, den = scale.numerator, scale.denominator
+    if abs(num) > _EXACT_INT or den > _EXACT_INT:
+        num, den = scale, 1
+    return float(num), float(den), float(offset * den), reciprocal
+
+
+def _remember(cache: dict, key, value):
+    if len(cache) >= MAX_CACHED:
+        # 满时丢弃最早插入的条目
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+class UnitRegistry:
+    """Named units, the precomputed (scale, offset) of every named pair, and a parser for the rest."""
+
+    def __init__(self, linear_units=LINEAR_UNITS, temperature_units=TEMPERATURE_UNITS, aliases=ALIASES):
+        self.dimensions = {}
+        self._units = {}
+        self._transforms = {}
+        for dimension, definitions in linear_units.items():
+            to_base = self._close(definitions)
+            self._add_dimension(dimension, {unit: (factor, Fraction(0)) for unit, factor in to_base.items()})
+        self._add_dimension("temperature", temperature_units)
+        self._names = {}
+        for unit in self.dimensions:
+            self._names[unit] = unit
+            self._names.setdefault(unit.lower(), unit)
+        for unit, names in aliases.items():
+            for name in names:
+                self._names[name.lower()] = unit
+        self._dimension_names = {dims: name for name, dims in DIMENSION_VECTORS.items()}
+        self._parsed = {}
+        self._conversions = {}
+        self._kernels = {}
+
+    @staticmethod
+    def _close(definitions):
+        """Factor from each unit to the first (base) unit, following the relations."""
+        base = definitions[0][0]
+        neighbours = {}
+        for unit, factor, reference in definitions:
+            if reference is not None:
+                factor = Fraction(factor)
+                neighbours.setdefault(unit, []).append((reference, factor))
+                neighbours.setdefault(reference, []).append((unit, 1 / factor))
+        # 从基准单位出发做广度优先遍历: to_base[u] = 1 u 折合多少基准单位
+        to_base = {base: Fraction(1)}
+        queue = deque([base])
+        while queue:
+            unit = queue.popleft()
+            for other, factor in neighbours.get(unit, ()):
+                if other not in to_base:
+                    to_base[other] = to_base[unit] / factor
+                    queue.append(other)
+        missing = {unit for unit, _, _ in definitions} - to_base.keys()
+        if missing:
+            raise ValueError(f"Units not connected to {base}: {', '.join(sorted(missing))}")
+        return to_base
+
+    def _add_dimension(self, dimension, to_base):
+        """to_base maps unit -> (scale, offset) with base = scale·value + offset."""
+        dims = DIMENSION_VECTORS[dimension]
+        for unit, (scale, _) in to_base.items():
+            self.dimensions[unit] = dimension
+            self._units[unit] = Unit(unit, scale, dims)
+        for source, (scale_in, offset_in) in to_base.items():
+            for target, (scale_out, offset_out) in to_base.items():
+                scale = scale_in / scale_out
+                offset = (offset_in - offset_out) / scale_out
+                self._transforms[source, target] = (scale, offset)
+
+    def _prefixed(self, name: str):
+        for prefix, factor in PREFIXES.items():
+            if name.startswith(prefix) and name[len(prefix):] in PREFIXABLE:
+                unit = self._units[name[len(prefix):]]
+                return Unit(name, factor * unit.factor, unit.dims)
+        return None
+
+    def _named(self, name: str):
+        """Canonical symbol if name is a single named unit or alias, else None."""
+        unit = self._names.get(name)
+        if unit is not None:
+            return unit
+        name = name.strip()
+        # kN 之类带词头的符号优先于忽略大小写的别名 (kn 为节)
+        if _IDENTIFIER.fullmatch(name) and self._prefixed(name) is None:
+            return self._names.get(name.lower())
+        return None
+
+    def resolve(self, name: str) -> str:
+        """Canonical symbol for a unit name or alias."""
+        unit = self._named(name)
+        if unit is None:
+            raise ValueError(f"Unknown unit: {name}")
+        return unit
+
+    def _atom(self, name: str) -> Unit:
+        unit = self._units.get(name) or self._prefixed(name)
+        if unit is not None:
+            return unit
+        canonical = self._names.get(name.lower())
+        if canonical is not None:
+            return self._units[canonical]
+        # m2、s2 之类: 末尾数字作为指数
+        stripped = name.rstrip("0123456789")
+        if stripped != name and stripped:
+            base = self._atom(stripped)
+            exponent = int(name[len(stripped):])
+            return Unit(name, base.factor ** exponent, tuple(d * exponent for d in base.dims))
+        raise ValueError(f"Unknown unit: {name}")
+
+    def parse(self, expression: str) -> Unit:
+        """Parse a unit expression such as 'kg*m/s^2' or 'L/100km' (interned)."""
+        unit = self._parsed.get(expression)
+        if unit is None:
+            tokens = self._tokenize(expression)
+            factor, dims, position = self._product(tokens, 0, expression)
+            if position != len(tokens):
+                raise ValueError(f"Invalid unit expression: {expression}")
+            unit = Unit(expression, factor, tuple(dims))
+            _remember(self._parsed, expression, unit)
+        return unit
+
+    @staticmethod
+    def _tokenize(expression: str):
+        tokens = []
+        position = 0
+        text = expression.rstrip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None:
+                raise ValueError(f"Invalid unit expression: {expression}")
+            number, name, operator = match.groups()
+            if number is not None:
+                tokens.append(("number", Fraction(number)))
+            elif name is not None:
+                tokens.append(("name", name))
+            else:
+                tokens.append(("op", "^" if operator == "**" else "*" if operator == "·" else operator))
+            position = match.end()
+        return tokens
+
+    def _product(self, tokens, position, expression):
+        """product := power (('*' | '/' | juxtaposition) power)*"""
+        factor, dims, position = self._power(tokens, position, expression)
+        while position < len(tokens):
+            kind, value = tokens[position]
+            if kind == "op" and value in "*/":
+                sign = 1 if value == "*" else -1
+                position += 1
+            elif kind == "name" or (kind == "op" and value == "("):
+                sign = 1
+            else:
+                break
+            other, other_dims, position = self._power(tokens, position, expression)
+            factor *= other ** sign
+            dims = [a + sign * b for a, b in zip(dims, other_dims)]
+        return factor, dims, position
+
+    def _power(self, tokens, position, expression):
+        """power := primary ('^' '-'? number)?"""
+        factor, dims, position = self._primary(tokens, position, expression)
+        if position < len(tokens) and tokens[position] == ("op", "^"):
+            position += 1
+            sign = 1
+            if position < len(tokens) and tokens[position] == ("op", "-"):
+                sign, position = -1, position + 1
+            if position >= len(tokens) or tokens[position][0] != "number" or tokens[position][1].denominator != 1:
+                raise ValueError(f"Exponent must be an integer in unit expression: {expression}")
+            exponent = sign * int(tokens[position][1])
+            factor = factor ** exponent
+            dims = [d * exponent for d in dims]
+            position += 1
+        return factor, dims, position
+
+    def _primary(self, tokens, position, expression):
+        """primary := number [name | '(' product ')'] | name | '(' product ')'"""
+        if position >= len(tokens):
+            raise ValueError(f"Invalid unit expression: {expression}")
+        kind, value = tokens[position]
+        if kind == "number":
+            position += 1
+            # 100km 这样紧跟单位的数字与单位结合为一个因子
+            if position < len(tokens) and (tokens[position][0] == "name" or tokens[position] == ("op", "(")):
+                factor, dims, position = self._power(tokens, position, expression)
+                return value * factor, dims, position
+            return value, [0] * len(BASE_DIMENSIONS), position
+        if kind == "name":
+            unit = self._atom(value)
+            return Fraction(unit.factor), list(unit.dims), position + 1
+        if value == "(":
+            factor, dims, position = self._product(tokens, position + 1, expression)
+            if position >= len(tokens) or tokens[position] != ("op", ")"):
+                raise ValueError(f"Unbalanced parentheses in unit expression: {expression}")
+            return factor, dims, position + 1
+        raise ValueError(f"Invalid unit expression: {expression}")
+
+    def describe(self, unit: Unit) -> str:
+        """Dimension name, or the base-unit form such as 'm^2·kg·s^-2'."""
+        name = self._dimension_names.get(unit.dims)
+        if name is not None:
+            return name
+        parts = [
+            base if power == 1 else f"{base}^{power}"
+            for base, power in zip(BASE_DIMENSIONS, unit.dims) if power
+        ]
+        return "·".join(parts) or "dimensionless"
+
+    def conversion(self, from_unit: str, to_unit: str):
+        """Exact (scale, offset, reciprocal): to = from·scale + offset, or scale/from if reciprocal."""
+        key = (from_unit, to_unit)
+        cached = self._conversions.get(key)
+        if cached is None:
+            cached = self._conversion(from_unit, to_unit)
+            _remember(self._conversions, key, cached)
+        return cached
+
+    def _conversion(self, from_unit: str, to_unit: str):
+        source, target = self._named(from_unit), self._named(to_unit)
+        if source is not None and target is not None and (source, target) in self._transforms:
+            return self._transforms[source, target] + (False,)
+        source = self._units[source] if source is not None else self.parse(from_unit)
+        target = self._units[target] if target is not None else self.parse(to_unit)
+        if source.dims == target.dims:
+            return Fraction(source.factor) / Fraction(target.factor), Fraction(0), False
+        if any(source.dims) and source.dims == tuple(-d for d in target.dims):
+            return 1 / (Fraction(source.factor) * Fraction(target.factor)), Fraction(0), True
+        raise ValueError(
+            f"Cannot convert {self.describe(source)} ({from_unit}) to {self.describe(target)} ({to_unit})"
+        )
+
+    def dimension(self, name: str) -> str:
+        """Dimension of a unit name or expression."""
+        named = self._named(name)
+        return self.dimensions[named] if named is not None else self.describe(self.parse(name))
+
+    def convert(self, values, from_unit: str, to_unit: str):
+        key = (from_unit, to_unit)
+        kernel = self._kernels.get(key)
+        if kernel is None:
+            kernel = _kernel(*self.conversion(from_unit, to_unit))
+            _remember(self._kernels, key, kernel)
+        num, den, shifted, reciprocal = kernel
+        if reciprocal:
+            items = values if isinstance(values, list) else [values]
+            if 0 in items:
+                raise ValueError(f"Cannot convert 0 {from_unit} to {to_unit}")
+            results = [num / (den * value) for value in items]
+            return results if isinstance(values, list) else results[0]
+        if isinstance(values, list):
+            results = map(math.fma, values, repeat(num), repeat(shifted))
+            # 分母为 1 时省去除法
+            return list(results if den == 1 else map(operator.truediv, results, repeat(den)))
+        return math.fma(values, num, shifted) / den
+
+
+units = UnitRegistry()
+
+
+async def convert(input_data):
+    """Convert a value or a list of values between units of the same dimension.
+
+    Units may be compound expressions such as 'km/h', 'kg*m/s^2' or
+    'L/100km'; inverse dimensions (mi/gal to L/100km) convert reciprocally.
+    """
+    if units.dimension(input_data.from_unit) == "temperature":
+        kelvin = units.convert(input_data.value, input_data.from_unit, "K")
+        lowest = min(kelvin) if isinstance(kelvin, list) else kelvin
+        if lowest < -1e-9:
+            raise ValueError("Temperature is below absolute zero")
+    return units.convert(input_data.value, input_data.from_unit, input_data.to_unit)
@@ -0,0 +1,19 @@
+async def upload_dataset(input_data, registry):
+    """Store a dataset on the server and return its handle."""
+    dataset, deduplicated = registry.upload(input_data.numbers)
+    return {**dataset.info(), "deduplicated": deduplicated}
+
+async def append_dataset(input_data, registry, summaries=None):
+    """Append data points to a stored dataset."""
+    old_digest = registry.get(input_data.dataset_id).digest
+    dataset = registry.append(input_data.dataset_id, input_data.numbers)
+    if summaries is not None:
+        summaries.discard(old_digest)
+    return dataset.info()
+
+async def drop_dataset(input_data, registry, summaries=None):
+    """Remove a stored dataset and free its memory."""
+    dataset = registry.drop(input_data.dataset_id)
+    if summaries is not None:
+        summaries.discard(dataset.digest)
+    return {**dataset.info(), "status": "dropped"}
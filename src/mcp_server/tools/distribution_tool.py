@@ -0,0 +1,156 @@
+"""Probability distribution functions over scalars or whole arrays of points.
+
+Binomial and Poisson probabilities are computed in log space, using the
+log-factorial table from combinatorics_tool, so they stay finite far beyond
+where n! overflows. For many points the binomial pmf is built with the ratio
+recurrence ln P(k+1) = ln P(k) + ln((n-k)/(k+1)) + ln(p/q) over the
+requested range, and the CDF with a running sum over the window where the
+pmf is representable; outside it the CDF is exactly 0.0 or 1.0 in floating
+point. Normal functions use statistics.NormalDist.
+"""
+import math
+from itertools import accumulate
+from statistics import NormalDist
+
+from .combinatorics_tool import log_comb, log_factorials
+
+
+def _as_list(values):
+    """Return (list, was_scalar)."""
+    if isinstance(values, list):
+        return values, False
+    return [values], True
+
+
+def _unwrap(results, scalar):
+    return results[0] if scalar else results
+
+
+def binomial_log_pmf(n: int, p: float, k: int) -> float:
+    """ln P(X = k) for X ~ Binomial(n, p); -inf outside the support."""
+    if k < 0 or k > n:
+        return -math.inf
+    if p == 0.0:
+        return 0.0 if k == 0 else -math.inf
+    if p == 1.0:
+        return 0.0 if k == n else -math.inf
+    return log_comb(n, k) + k * math.log(p) + (n - k) * math.log1p(-p)
+
+
+def _binomial_pmf_range(n: int, p: float, lo: int, hi: int):
+    """P(X = k) for k = lo..hi by the log-space ratio recurrence."""
+    if p in (0.0, 1.0) or lo == hi:
+        return [math.exp(binomial_log_pmf(n, p, k)) for k in range(lo, hi + 1)]
+    log_odds = math.log(p) - math.log1p(-p)
+    # 从众数出发向两侧递推，舍入误差在概率最大处最小
+    mode = min(max(math.floor((n + 1) * p), lo), hi)
+    anchor = binomial_log_pmf(n, p, mode)
+    up = accumulate(
+        (math.log((n - k) / (k + 1)) + log_odds for k in range(mode, hi)), initial=anchor
+    )
+    down = list(accumulate(
+        (math.log((k + 1) / (n - k)) - log_odds for k in range(mode - 1, lo - 1, -1)), initial=anchor
+    ))
+    down.reverse()
+    return list(map(math.exp, down[:-1])) + list(map(math.exp, up))
+
+
+def _binomial_window(n: int, p: float):
+    """Range of k outside which every pmf term underflows to 0.0.
+
+    The pmf rises up to the mode and falls after it, so each end is found by
+    binary search on exp(ln P(k)) > 0; skewed distributions (p near 0 or 1)
+    get their whole long tail.
+    """
+    mode = min(math.floor((n + 1) * p), n)
+
+    def representable(k):
+        return math.exp(binomial_log_pmf(n, p, k)) > 0.0
+
+    lo, hi = 0, mode
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if representable(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    window_lo = lo
+    lo, hi = mode, n
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if representable(mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return window_lo, lo
+
+
+def binomial_pmf_values(n: int, p: float, ks):
+    """P(X = k) for each k in ks."""
+    inside = [k for k in ks if 0 <= k <= n]
+    if not inside:
+        return [0.0] * len(ks)
+    lo, hi = min(inside), max(inside)
+    # 请求的点较密集时用递推一次算出整个区间，否则逐点计算
+    if hi - lo < 4 * len(ks):
+        table = _binomial_pmf_range(n, p, lo, hi)
+        return [table[k - lo] if lo <= k <= hi else 0.0 for k in ks]
+    return [math.exp(binomial_log_pmf(n, p, k)) for k in ks]
+
+
+def binomial_cdf_values(n: int, p: float, ks):
+    """P(X <= k) for each k in ks."""
+    window_lo, window_hi = _binomial_window(n, p)
+    top = min(max(ks), window_hi)
+    cumulative = []
+    if top >= window_lo:
+        cumulative = list(accumulate(_binomial_pmf_range(n, p, window_lo, top)))
+    results = []
+    for k in ks:
+        if k < window_lo:
+            results.append(0.0)
+        elif k >= window_hi:
+            results.append(1.0)
+        else:
+            results.append(min(1.0, cumulative[k - window_lo]))
+    return results
+
+
+def poisson_pmf_values(lam: float, ks):
+    """P(X = k) for X ~ Poisson(lam) at each k in ks."""
+    log_lam = math.log(lam)
+    lookup = log_factorials.get
+    return [
+        math.exp(k * log_lam - lam - lookup(k)) if k >= 0 else 0.0
+        for k in ks
+    ]
+
+
+async def binomial_pmf(input_data):
+    """Probability of exactly k successes in n trials: C(n,k) p^k (1-p)^(n-k)."""
+    ks, scalar = _as_list(input_data.k)
+    return _unwrap(binomial_pmf_values(input_data.n, input_data.p, ks), scalar)
+
+async def binomial_cdf(input_data):
+    """Probability of at most k successes in n trials."""
+    ks, scalar = _as_list(input_data.k)
+    return _unwrap(binomial_cdf_values(input_data.n, input_data.p, ks), scalar)
+
+async def poisson_pmf(input_data):
+    """Probability of exactly k events when lam are expected: lam^k e^-lam / k!."""
+    ks, scalar = _as_list(input_data.k)
+    return _unwrap(poisson_pmf_values(input_data.lam, ks), scalar)
+
+async def normal_cdf(input_data):
+    """P(X <= x) for X ~ Normal(mean, std)."""
+    xs, scalar = _as_list(input_data.x)
+    cdf = NormalDist(input_data.mean, input_data.std).cdf
+    return _unwrap(list(map(cdf, xs)), scalar)
+
+async def normal_ppf(input_data):
+    """Inverse of normal_cdf: the x with P(X <= x) = q."""
+    qs, scalar = _as_list(input_data.q)
+    if any(not 0 < q < 1 for q in qs):
+        raise ValueError("Probabilities must be strictly between 0 and 1")
+    inv_cdf = NormalDist(input_data.mean, input_data.std).inv_cdf
+    return _unwrap(list(map(inv_cdf, qs)), scalar)
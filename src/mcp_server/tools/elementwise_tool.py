@@ -0,0 +1,128 @@
+"""Element-wise (vectorized) variants of the arithmetic tools.
+
+Each operand may be a list or a scalar; scalars and single-element lists
+broadcast against the other operand. Plain Python uses tight ``map`` loops;
+when NumPy is installed, large inputs are computed with NumPy instead.
+"""
+import operator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+from .power_tool import power_value
+from .root_tool import root_value, validate_root
+
+# 小于该长度时转换为 NumPy 数组的开销大于收益
+NUMPY_MIN_SIZE = 512
+
+
+def _broadcast(a, b):
+    """Return (a_list_or_scalar, b_list_or_scalar, length)."""
+    a_is_list = isinstance(a, list)
+    b_is_list = isinstance(b, list)
+    if a_is_list and len(a) == 1 and b_is_list and len(b) != 1:
+        a, a_is_list = a[0], False
+    if b_is_list and len(b) == 1 and a_is_list and len(a) != 1:
+        b, b_is_list = b[0], False
+    if a_is_list and b_is_list and len(a) != len(b):
+        raise ValueError(f"Operands have different lengths: {len(a)} and {len(b)}")
+    length = len(a) if a_is_list else len(b) if b_is_list else 1
+    return a, b, length
+
+
+def _apply(op, a, b):
+    """Apply a binary operator element-wise with broadcasting."""
+    a, b, _ = _broadcast(a, b)
+    if isinstance(a, list) and isinstance(b, list):
+        return list(map(op, a, b))
+    if isinstance(a, list):
+        return [op(x, b) for x in a]
+    if isinstance(b, list):
+        return [op(a, y) for y in b]
+    return [op(a, b)]
+
+
+def _use_numpy(length: int) -> bool:
+    return np is not None and length >= NUMPY_MIN_SIZE
+
+
+def _numpy_apply(ufunc, a, b):
+    return ufunc(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
+
+async def add_many(input_data):
+    """Add two lists (or a list and a number) element by element."""
+    a, b, length = _broadcast(input_data.a, input_data.b)
+    if _use_numpy(length):
+        return _numpy_apply(np.add, a, b).tolist()
+    return _apply(operator.add, a, b)
+
+async def subtract_many(input_data):
+    """Subtract b from a element by element."""
+    a, b, length = _broadcast(input_data.a, input_data.b)
+    if _use_numpy(length):
+        return _numpy_apply(np.subtract, a, b).tolist()
+    return _apply(operator.sub, a, b)
+
+async def multiply_many(input_data):
+    """Multiply two lists (or a list and a number) element by element."""
+    a, b, length = _broadcast(input_data.a, input_data.b)
+    if _use_numpy(length):
+        return _numpy_apply(np.multiply, a, b).tolist()
+    return _apply(operator.mul, a, b)
+
+def _safe_divide(x, y):
+    return x / y if y else None
+
+async def divide_many(input_data):
+    """Divide a by b element by element.
+
+    Elements with a zero divisor are None in ``result`` and flagged in the
+    ``errors`` mask instead of failing the whole call.
+    """
+    a, b, length = _broadcast(input_data.a, input_data.b)
+    if _use_numpy(length):
+        numerator = np.broadcast_to(np.asarray(a, dtype=float), (length,))
+        denominator = np.broadcast_to(np.asarray(b, dtype=float), (length,))
+        mask = denominator == 0
+        quotient = np.divide(numerator, denominator, where=~mask, out=np.zeros(length))
+        result = [None if failed else value for value, failed in zip(quotient.tolist(), mask.tolist())]
+        errors = mask.tolist()
+    else:
+        result = _apply(_safe_divide, a, b)
+        errors = [value is None for value in result]
+    error_count = errors.count(True)
+    return {
+        "result": result,
+        "errors": errors,
+        "error_count": error_count,
+        "error": "Division by zero" if error_count else None,
+        "status": "success" if not error_count else "partial"
+    }
+
+async def power_many(input_data):
+    """Raise each base to the matching exponent (乘方)."""
+    a, b, length = _broadcast(input_data.a, input_data.b)
+    if _use_numpy(length):
+        base = np.asarray(a, dtype=float)
+        exponent = np.asarray(b, dtype=float)
+        with np.errstate(all="raise"):
+            try:
+                return np.power(base, exponent).tolist()
+            except FloatingPointError:
+                pass  # 交给纯 Python 路径给出与 power 一致的错误
+    return _apply(power_value, a, b)
+
+async def root_many(input_data):
+    """Calculate the nth root of each number (开方)."""
+    numbers, degrees, length = _broadcast(input_data.a, input_data.b)
+    if _use_numpy(length) and not isinstance(degrees, list):
+        values = np.asarray(numbers, dtype=float)
+        # 用最小值校验整个数组: 有负数时它就是负数
+        validate_root(float(values.min()), degrees)
+        if degrees % 2 == 1:
+            return (np.sign(values) * np.abs(values) ** (1 / degrees)).tolist()
+        return (values ** (1 / degrees)).tolist()
+    return _apply(root_value, numbers, degrees)
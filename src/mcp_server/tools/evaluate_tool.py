@@ -0,0 +1,153 @@
+import ast
+import math
+import operator
+from functools import lru_cache
+
+from .power_tool import power_value
+from .root_tool import root_value
+
+# 表达式中可直接使用的常量（同名变量优先）
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+
+def _divide(a, b):
+    if b == 0:
+        raise ValueError("Division by zero")
+    return a / b
+
+def _mod(a, b):
+    if b == 0:
+        raise ValueError("Divisor cannot be zero")
+    return a % b
+
+def _factorial(n):
+    if n < 0 or not float(n).is_integer():
+        raise ValueError("Factorial requires a non-negative integer")
+    if n > 170:
+        raise ValueError("Factorial too large for a floating point result (n <= 170)")
+    return float(math.factorial(int(n)))
+
+# 与现有工具同名的函数
+FUNCTIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": _divide,
+    "power": power_value,
+    "root": root_value,
+    "sqrt": root_value,
+    "mod": _mod,
+    "factorial": _factorial,
+    "abs": abs,
+    "min": min,
+    "max": max,
+}
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: _divide,
+    ast.Pow: power_value,
+    ast.BitXor: power_value,  # 计算器习惯: 2^3 表示乘方
+    ast.Mod: _mod,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _compile_node(node, names):
+    """Turn an AST node into a closure evaluated against a variables dict."""
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        value = float(node.value)
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        names.add(name)
+        return lambda env: env[name]
+
+    if isinstance(node, ast.BinOp):
+        op = _BINARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        left = _compile_node(node.left, names)
+        right = _compile_node(node.right, names)
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.UnaryOp):
+        op = _UNARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = _compile_node(node.operand, names)
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ValueError(f"Unsupported function: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported")
+        func = FUNCTIONS[node.func.id]
+        args = tuple(_compile_node(arg, names) for arg in node.args)
+        if len(args) == 1:
+            (only,) = args
+            return lambda env: func(only(env))
+        if len(args) == 2:
+            first, second = args
+            return lambda env: func(first(env), second(env))
+        return lambda env: func(*(arg(env) for arg in args))
+
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+
+# 与 EvaluateInput 的 max_length 一致；批量与流水线调用不经过模型校验
+MAX_EXPRESSION_LENGTH = 2000
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression: str):
+    """Parse and compile an expression once; returns (function, variable names).
+
+    Compiled forms are cached by expression text, so re-evaluating a formula
+    with new variables skips parsing entirely.
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression is too long (at most {MAX_EXPRESSION_LENGTH} characters)")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"Invalid expression: {exc.msg}") from None
+    except (RecursionError, MemoryError):
+        raise ValueError("Expression is too deeply nested") from None
+    names = set()
+    try:
+        func = _compile_node(tree.body, names)
+    except RecursionError:
+        raise ValueError("Expression is too deeply nested") from None
+    return func, frozenset(names)
+
+
+def evaluate_expression(expression: str, variables=None) -> float:
+    """Evaluate an arithmetic expression with optional named variables."""
+    func, names = compile_expression(expression)
+    env = CONSTANTS if not variables else {**CONSTANTS, **variables}
+    missing = names.difference(env)
+    if missing:
+        raise ValueError(f"Unknown variable(s): {', '.join(sorted(missing))}")
+    try:
+        return func(env)
+    except TypeError as exc:
+        raise ValueError(f"Invalid function arguments: {exc}") from None
+    except OverflowError:
+        raise ValueError("Result too large") from None
+    except RecursionError:
+        raise ValueError("Expression is too deeply nested") from None
+
+async def evaluate(input_data):
+    """Evaluate a whole formula (e.g. "P * power(1 + r / 12, 12 * t)") in one call."""
+    return evaluate_expression(input_data.expression, input_data.variables)
@@ -0,0 +1,260 @@
+"""Cash-flow and time-value-of-money functions.
+
+Conventions follow the spreadsheet functions of the same names: rates are
+per period as decimals (0.05 = 5%), money paid out is negative and money
+received is positive, and ``when`` is "end" or "begin" of each period.
+Cash flows are indexed from period 0, so npv() does not discount the first
+one (unlike the spreadsheet NPV, which starts at period 1).
+
+irr and xirr find a root of the NPV with Newton's method from ``guess``;
+when Newton fails to converge or leaves the domain (rate <= -1), a sign
+change is searched for on a fixed grid of rates and the root is polished
+with Brent's method. npv, irr and xirr accept a list of series and return
+one result per series, so thousands of portfolios take one call.
+"""
+import math
+
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 100
+# 牛顿法失败时在这些利率之间寻找变号区间
+_BRACKET_RATES = (
+    -0.999, -0.99, -0.9, -0.75, -0.5, -0.25, -0.1, 0.0, 0.05, 0.1, 0.2, 0.35,
+    0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 100.0, 1000.0,
+)
+
+
+def _is_batch(values) -> bool:
+    return bool(values) and isinstance(values[0], list)
+
+
+def npv_value(rate: float, cashflows) -> float:
+    """Sum of cashflows[t] / (1 + rate)**t."""
+    discount = 1.0 / (1.0 + rate)
+    total = 0.0
+    # Horner: c0 + v(c1 + v(c2 + ...))
+    for cashflow in reversed(cashflows):
+        total = total * discount + cashflow
+    return total
+
+
+def _npv_and_derivative(rate: float, cashflows):
+    """NPV and d(NPV)/d(rate) in one Horner pass."""
+    discount = 1.0 / (1.0 + rate)
+    total = 0.0
+    slope = 0.0
+    for cashflow in reversed(cashflows):
+        slope = slope * discount + total
+        total = total * discount + cashflow
+    # 对折现因子 v 求导后乘 dv/dr = -v²
+    return total, -slope * discount * discount
+
+
+def _xnpv_and_derivative(rate: float, cashflows, years):
+    log_growth = math.log1p(rate)
+    total = 0.0
+    slope = 0.0
+    for cashflow, t in zip(cashflows, years):
+        term = cashflow * math.exp(-t * log_growth)
+        total += term
+        slope -= t * term
+    return total, slope / (1.0 + rate)
+
+
+def _newton(func, guess: float):
+    """Root of func (returning value and derivative) or None if Newton fails."""
+    rate = guess
+    for _ in range(MAX_ITERATIONS):
+        try:
+            value, slope = func(rate)
+        except (OverflowError, ZeroDivisionError):
+            return None
+        if not (math.isfinite(value) and math.isfinite(slope)) or slope == 0:
+            return None
+        step = value / slope
+        rate -= step
+        if rate <= -1:
+            return None
+        if abs(step) <= TOLERANCE * max(1.0, abs(rate)):
+            return rate
+    return None
+
+
+def _brent(func, a: float, b: float, fa: float, fb: float) -> float:
+    """Brent's method on a bracket [a, b] with func(a), func(b) of opposite sign."""
+    previous, f_previous = a, fa
+    current, f_current = b, fb
+    block, f_block = previous, f_previous
+    step = last_step = current - previous
+    for _ in range(MAX_ITERATIONS):
+        if f_previous * f_current < 0:
+            block, f_block = previous, f_previous
+            step = last_step = current - previous
+        if abs(f_block) < abs(f_current):
+            previous, current, block = current, block, current
+            f_previous, f_current, f_block = f_current, f_block, f_current
+        tol = TOLERANCE * max(1.0, abs(current))
+        bisect = (block - current) / 2
+        if f_current == 0 or abs(bisect) < tol:
+            return current
+        if abs(last_step) > tol and abs(f_current) < abs(f_previous):
+            if previous == block:
+                # 割线
+                trial = -f_current * (current - previous) / (f_current - f_previous)
+            else:
+                # 反二次插值
+                d_previous = (f_previous - f_current) / (previous - current)
+                d_block = (f_block - f_current) / (block - current)
+                trial = -f_current * (f_block * d_block - f_previous * d_previous) / (
+                    d_block * d_previous * (f_block - f_previous)
+                )
+            if 2 * abs(trial) < min(abs(last_step), 3 * abs(bisect) - tol):
+                last_step, step = step, trial
+            else:
+                last_step = step = bisect
+        else:
+            last_step = step = bisect
+        previous, f_previous = current, f_current
+        current += step if abs(step) > tol else math.copysign(tol, bisect)
+        f_current = func(current)[0]
+    return current
+
+
+def _find_rate(func, guess: float):
+    """Root of an NPV-like function of the rate, or None if there is none."""
+    rate = _newton(func, guess)
+    if rate is not None:
+        return rate
+    points = []
+    for candidate in _BRACKET_RATES:
+        try:
+            value = func(candidate)[0]
+        except (OverflowError, ZeroDivisionError):
+            continue
+        if math.isfinite(value):
+            points.append((candidate, value))
+    brackets = [
+        (left, right) for left, right in zip(points, points[1:])
+        if left[1] == 0 or (left[1] < 0) != (right[1] < 0)
+    ]
+    if not brackets:
+        return None
+    # 有多个根时取离 guess 最近的区间
+    (a, fa), (b, fb) = min(brackets, key=lambda pair: abs((pair[0][0] + pair[1][0]) / 2 - guess))
+    if fa == 0:
+        return a
+    return _brent(func, a, b, fa, fb)
+
+
+def _check_signs(cashflows):
+    if not (any(c > 0 for c in cashflows) and any(c < 0 for c in cashflows)):
+        raise ValueError("Cash flows need at least one positive and one negative value")
+
+
+def irr_value(cashflows, guess: float = 0.1):
+    """Internal rate of return per period, or None if no rate zeroes the NPV."""
+    _check_signs(cashflows)
+    return _find_rate(lambda rate: _npv_and_derivative(rate, cashflows), guess)
+
+
+def xirr_value(cashflows, dates, guess: float = 0.1):
+    """Annual rate zeroing the NPV of cash flows on the given dates (365-day years)."""
+    if len(cashflows) != len(dates):
+        raise ValueError("cashflows and dates must have the same length")
+    _check_signs(cashflows)
+    start = min(dates)
+    years = [(day - start).days / 365.0 for day in dates]
+    return _find_rate(lambda rate: _xnpv_and_derivative(rate, cashflows, years), guess)
+
+
+def _per_series(func, series, *args):
+    """func over one series (raising if no result) or a list of them (None where none)."""
+    if not _is_batch(series):
+        result = func(series, *args)
+        if result is None:
+            raise ValueError("Rate did not converge; try a different guess")
+        return result
+    results = []
+    for item in series:
+        try:
+            results.append(func(item, *args))
+        except ValueError:
+            results.append(None)
+    return results
+
+
+async def npv(input_data):
+    """Net present value of cash flows at periods 0, 1, 2, ..."""
+    if _is_batch(input_data.cashflows):
+        return [npv_value(input_data.rate, series) for series in input_data.cashflows]
+    return npv_value(input_data.rate, input_data.cashflows)
+
+async def irr(input_data):
+    """Rate per period at which the NPV of the cash flows is zero."""
+    return _per_series(irr_value, input_data.cashflows, input_data.guess)
+
+async def xirr(input_data):
+    """Annual IRR of cash flows on arbitrary dates."""
+    if not _is_batch(input_data.cashflows):
+        return _per_series(xirr_value, input_data.cashflows, input_data.dates, input_data.guess)
+    if len(input_data.dates) != len(input_data.cashflows) or not _is_batch(input_data.dates):
+        raise ValueError("Provide one list of dates per cash-flow series")
+    results = []
+    for cashflows, dates in zip(input_data.cashflows, input_data.dates):
+        try:
+            results.append(xirr_value(cashflows, dates, input_data.guess))
+        except ValueError:
+            results.append(None)
+    return results
+
+
+def _growth_and_annuity(rate: float, nper: float, when: str):
+    """(1+r)^n and the value at period n of one unit paid every period."""
+    try:
+        growth_minus_one = math.expm1(nper * math.log1p(rate))
+    except OverflowError:
+        raise ValueError(f"(1 + rate)^nper overflows for rate={rate}, nper={nper}") from None
+    begin = 1 if when == "begin" else 0
+    return growth_minus_one + 1, (1 + rate * begin) * growth_minus_one / rate
+
+
+async def pmt(input_data):
+    """Level payment per period for a loan or savings plan."""
+    rate, nper, pv, fv = input_data.rate, input_data.nper, input_data.pv, input_data.fv
+    if rate == 0:
+        return -(fv + pv) / nper
+    growth, annuity = _growth_and_annuity(rate, nper, input_data.when)
+    return -(fv + pv * growth) / annuity
+
+async def fv(input_data):
+    """Future value after nper periods of payments and growth."""
+    rate, nper, payment, pv = input_data.rate, input_data.nper, input_data.pmt, input_data.pv
+    if rate == 0:
+        return -(pv + payment * nper)
+    growth, annuity = _growth_and_annuity(rate, nper, input_data.when)
+    return -(pv * growth + payment * annuity)
+
+async def pv(input_data):
+    """Present value of nper payments and a final amount."""
+    rate, nper, payment, fv = input_data.rate, input_data.nper, input_data.pmt, input_data.fv
+    if rate == 0:
+        return -(fv + payment * nper)
+    growth, annuity = _growth_and_annuity(rate, nper, input_data.when)
+    return -(fv + payment * annuity) / growth
+
+async def nper(input_data):
+    """Number of periods for payments to take pv to fv."""
+    rate, payment, pv, fv = input_data.rate, input_data.pmt, input_data.pv, input_data.fv
+    if rate == 0:
+        if payment == 0:
+            raise ValueError("pmt cannot be zero when rate is zero")
+        return -(fv + pv) / payment
+    begin = 1 if input_data.when == "begin" else 0
+    scaled = payment * (1 + rate * begin) / rate
+    if scaled + pv == 0:
+        # 每期还款恰好只够付利息
+        raise ValueError("The payment never amortizes the principal")
+    ratio = (scaled - fv) / (scaled + pv)
+    if ratio <= 0:
+        raise ValueError("These payments never reach the target value")
+    return math.log(ratio) / math.log1p(rate)
+
@@ -0,0 +1,182 @@
+"""Value frequencies: exact counts, heavy hitters and distinct counts.
+
+The exact path hashes every value once into a Counter, which gives the
+mode(s), the top-k values and the number of distinct values together.
+
+For streams too large to count exactly, SpaceSaving keeps at most k
+counters: a value not yet tracked replaces the smallest counter and
+inherits its count as an error bound, so every value occurring more than
+n/k times is guaranteed to be kept and each reported count overestimates
+the true one by at most its ``error``. HyperLogLog estimates the number of
+distinct values in 2^precision bytes with a relative standard error of
+1.04/sqrt(2^precision) (1.6% at the default precision of 12). Both accept
+pre-counted chunks, so a pushed chunk is hashed once into a Counter and
+both sketches are fed from it, and both merge across shards.
+"""
+import base64
+import heapq
+import math
+from collections import Counter
+
+DEFAULT_PRECISION = 12
+_MASK64 = (1 << 64) - 1
+
+
+def top_counts(counter: Counter, k: int = None):
+    """[{"value", "count"}] for the k most common values (all if k is None)."""
+    return [{"value": value, "count": count} for value, count in counter.most_common(k)]
+
+
+class SpaceSaving:
+    """Top-k heavy hitters with at most k counters (Metwally et al.)."""
+
+    __slots__ = ("k", "counts", "errors", "_heap")
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.counts = {}
+        self.errors = {}
+        # (count, value) 的最小堆，计数变化后旧条目惰性失效
+        self._heap = []
+
+    def add(self, values):
+        self.add_counts(Counter(values))
+
+    def add_counts(self, counter):
+        """Add pre-counted values ({value: occurrences})."""
+        counts, errors, heap = self.counts, self.errors, self._heap
+        for value, count in counter.items():
+            if value in counts:
+                counts[value] += count
+            elif len(counts) < self.k:
+                counts[value] = count
+                errors[value] = 0
+            else:
+                smallest, victim = self._pop_smallest()
+                del counts[victim], errors[victim]
+                counts[value] = smallest + count
+                errors[value] = smallest
+            heapq.heappush(heap, (counts[value], value))
+        if len(heap) > 4 * self.k:
+            self._heap = [(count, value) for value, count in counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_smallest(self):
+        heap, counts = self._heap, self.counts
+        while True:
+            count, value = heapq.heappop(heap)
+            if counts.get(value) == count:
+                return count, value
+
+    def merge(self, other: "SpaceSaving"):
+        """Fold another summary in; values missing from a full summary take its smallest count."""
+        floor_self = min(self.counts.values()) if len(self.counts) >= self.k else 0
+        floor_other = min(other.counts.values()) if len(other.counts) >= other.k else 0
+        combined = {}
+        for value in self.counts.keys() | other.counts.keys():
+            count = self.counts.get(value, floor_self) + other.counts.get(value, floor_other)
+            error = (self.errors.get(value, floor_self) + other.errors.get(value, floor_other))
+            combined[value] = (count, error)
+        kept = heapq.nlargest(self.k, combined.items(), key=lambda item: item[1][0])
+        self.counts = {value: count for value, (count, _) in kept}
+        self.errors = {value: error for value, (_, error) in kept}
+        self._heap = [(count, value) for value, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, k: int = None):
+        """[{"value", "count", "error"}] by descending count; count - error is a lower bound."""
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [{"value": value, "count": count, "error": self.errors[value]} for value, count in ranked]
+
+    def to_dict(self) -> dict:
+        ranked = self.top()
+        return {
+            "k": self.k,
+            "values": [item["value"] for item in ranked],
+            "counts": [item["count"] for item in ranked],
+            "errors": [item["error"] for item in ranked],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "SpaceSaving":
+        try:
+            summary = cls(int(state["k"]))
+            items = list(zip(state["values"], state["counts"], state["errors"], strict=True))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid heavy-hitter state: {exc}") from None
+        if len(items) > summary.k:
+            raise ValueError("Invalid heavy-hitter state: more values than k")
+        for value, count, error in items:
+            summary.counts[value] = count
+            summary.errors[value] = error
+        summary._heap = [(count, value) for value, count in summary.counts.items()]
+        heapq.heapify(summary._heap)
+        return summary
+
+
+def _hash64(value) -> int:
+    """64-bit hash of a number (splitmix64 finalizer over Python's deterministic numeric hash)."""
+    x = (hash(value) + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class HyperLogLog:
+    """Distinct-count estimate in 2^precision one-byte registers."""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, values):
+        """Add values; duplicates within the call are hashed once."""
+        registers = self.registers
+        shift = 64 - self.precision
+        rest_mask = (1 << shift) - 1
+        for value in set(values):
+            x = _hash64(value)
+            index = x >> shift
+            # 剩余位的前导零个数 + 1
+            rank = shift - (x & rest_mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        raw = alpha * m * m / math.fsum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # 小基数时改用线性计数
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def to_dict(self) -> dict:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(self.registers).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HyperLogLog":
+        try:
+            sketch = cls(int(state["precision"]))
+            registers = bytearray(base64.b64decode(state["registers"], validate=True))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid distinct-count state: {exc}") from None
+        if len(registers) != len(sketch.registers):
+            raise ValueError("Invalid distinct-count state: wrong number of registers")
+        sketch.registers = registers
+        return sketch
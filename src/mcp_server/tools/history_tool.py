@@ -0,0 +1,29 @@
+from datetime import timezone
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+async def query_history(input_data, store):
+    """Page through recorded calculations, newest first, filtered by operation and time."""
+    total, entries = store.query(
+        operation=input_data.operation,
+        since=_timestamp(input_data.since),
+        until=_timestamp(input_data.until),
+        offset=input_data.offset,
+        limit=input_data.limit,
+    )
+    result = {
+        "total": total,
+        "offset": input_data.offset,
+        "records": [entry.to_record().model_dump(mode="json") for entry in entries],
+    }
+    log = store.log_status()
+    if log is not None:
+        # 持久化日志降级时在此暴露，而不是让工具调用失败
+        result["log"] = log
+    return result
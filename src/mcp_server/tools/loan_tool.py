@@ -0,0 +1,160 @@
+"""Loan amortization computed on the server.
+
+The schedule is built in one pass over the periods into parallel columns
+(payment, interest, principal, balance) of whole cents. A page of it can be
+returned as rows or, more compactly, as columns; summary mode returns only
+the totals.
+Pages are cut from a freshly built schedule, which is cheap enough (a
+40-year weekly loan is 2080 periods) that no state is kept between calls.
+
+Scenario grids are compared in closed form instead: the payment factor and
+growth rate are computed once per (rate, term) pair, and each scenario's
+payoff period and total interest follow from the balance formula
+B_k = P·g^k - D·(g^k - 1)/r, without walking the periods. Amounts there are
+not rounded period by period, so totals can differ from the schedule's by a
+few cents.
+"""
+import math
+from itertools import product
+
+COLUMNS = ("payment", "interest", "principal", "balance")
+COMPARISON_COLUMNS = (
+    "principal", "annual_rate", "term_years", "extra_payment",
+    "payment", "total_interest", "payoff_period", "periods_saved", "interest_saved"
+)
+
+
+def periodic_payment(principal: float, rate: float, periods: int) -> float:
+    """Level payment that repays principal over periods at the periodic rate."""
+    if rate == 0:
+        return principal / periods
+    # P·r / (1 - (1+r)^-n)，用 expm1/log1p 避免小利率时的抵消误差
+    return principal * rate / -math.expm1(-periods * math.log1p(rate))
+
+
+def build_schedule(principal: float, rate: float, periods: int, extra: float = 0.0):
+    """Return (payment, columns) where columns maps each of COLUMNS to a list.
+
+    Amounts are whole cents, as a lender books them: the level payment is
+    rounded to the cent, each period's interest is rounded to the cent, and
+    the final payment clears whatever balance is left. extra is paid on top
+    of the level payment every period, so the loan may be repaid early.
+    """
+    payment = round(periodic_payment(principal, rate, periods) * 100)
+    payments, interests, principals, balances = [], [], [], []
+    due = payment + round(extra * 100)
+    balance = round(principal * 100)
+    last = periods - 1
+    for period in range(periods):
+        interest = int(balance * rate + 0.5)
+        if period == last or due >= balance + interest:
+            payments.append(balance + interest)
+            interests.append(interest)
+            principals.append(balance)
+            balances.append(0)
+            break
+        balance -= due - interest
+        payments.append(due)
+        interests.append(interest)
+        principals.append(due - interest)
+        balances.append(balance)
+    return payment, {
+        "payment": payments, "interest": interests, "principal": principals, "balance": balances
+    }
+
+
+def _dollars(cents):
+    return [value / 100 for value in cents]
+
+
+def _round_cents(amounts):
+    return [round(amount, 2) for amount in amounts]
+
+
+async def amortization_schedule(input_data):
+    """Per-period payment, interest, principal and remaining balance of a loan."""
+    per_year = input_data.payments_per_year
+    rate = input_data.annual_rate / 100 / per_year
+    periods = input_data.term_years * per_year
+    payment, columns = build_schedule(input_data.principal, rate, periods, input_data.extra_payment)
+    total = len(columns["payment"])
+    result = {
+        "payment": payment / 100,
+        "periods": periods,
+        "payoff_period": total,
+        "total_paid": sum(columns["payment"]) / 100,
+        "total_interest": sum(columns["interest"]) / 100,
+    }
+    if input_data.output == "summary":
+        return result
+
+    offset = input_data.offset
+    if offset and offset >= total:
+        raise ValueError(f"offset {offset} is past the end of the schedule ({total} periods)")
+    end = total if input_data.limit is None else min(total, offset + input_data.limit)
+    page = {name: _dollars(columns[name][offset:end]) for name in COLUMNS}
+    periods_column = list(range(offset + 1, end + 1))
+    if input_data.output == "columns":
+        schedule = {"period": periods_column, **page}
+    else:
+        schedule = [
+            dict(zip(("period",) + COLUMNS, row))
+            for row in zip(periods_column, *(page[name] for name in COLUMNS))
+        ]
+    result.update(total=total, offset=offset, schedule=schedule)
+    return result
+
+
+def _payoff(principal: float, rate: float, periods: int, due: float):
+    """(payoff period, total interest) when due is paid every period."""
+    if rate == 0:
+        return min(periods, math.ceil(principal / due - 1e-9)), 0.0
+    log_growth = math.log1p(rate)
+    # 余额降为 0 所需期数: n = -ln(1 - rP/D) / ln(1+r)
+    exact = -math.log1p(-rate * principal / due) / log_growth
+    payoff = min(periods, max(1, math.ceil(exact - 1e-9)))
+    compounded = math.expm1((payoff - 1) * log_growth)
+    balance = principal * (compounded + 1) - due * compounded / rate
+    total_paid = due * (payoff - 1) + balance * (1 + rate)
+    return payoff, total_paid - principal
+
+
+async def compare_loans(input_data):
+    """Payment, total interest and payoff period for every combination of loan terms."""
+    per_year = input_data.payments_per_year
+    # 每个 (利率, 期限) 组合的还款系数只算一次
+    factors = {}
+    for annual_rate, term_years in product(input_data.annual_rates, input_data.term_years):
+        rate = annual_rate / 100 / per_year
+        periods = term_years * per_year
+        factors[annual_rate, term_years] = (rate, periods, periodic_payment(1.0, rate, periods))
+
+    grid = list(product(
+        input_data.principals, input_data.annual_rates, input_data.term_years, input_data.extra_payments
+    ))
+    payments, interests, payoffs, saved_periods, saved_interest = [], [], [], [], []
+    for principal, annual_rate, term_years, extra in grid:
+        rate, periods, factor = factors[annual_rate, term_years]
+        payment = principal * factor
+        base_interest = payment * periods - principal
+        if extra:
+            payoff, interest = _payoff(principal, rate, periods, payment + extra)
+        else:
+            payoff, interest = periods, base_interest
+        payments.append(payment)
+        interests.append(interest)
+        payoffs.append(payoff)
+        saved_periods.append(periods - payoff)
+        saved_interest.append(base_interest - interest)
+
+    principals, annual_rates, term_years, extras = map(list, zip(*grid))
+    columns = dict(zip(COMPARISON_COLUMNS, (
+        principals, annual_rates, term_years, extras, _round_cents(payments),
+        _round_cents(interests), payoffs, saved_periods, _round_cents(saved_interest)
+    )))
+    count = len(columns["payment"])
+    if input_data.output == "columns":
+        scenarios = columns
+    else:
+        scenarios = [dict(zip(COMPARISON_COLUMNS, row)) for row in zip(*columns.values())]
+    return {"count": count, "scenarios": scenarios}
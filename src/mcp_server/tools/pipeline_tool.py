@@ -0,0 +1,167 @@
+"""Dependency-graph calculation pipelines.
+
+A pipeline is a set of named steps. Each step is either
+``[op, arg1, arg2, ...]`` with positional arguments in the order the tool
+takes them, or ``{"op": ..., "args": {...}}``. Any argument (including list
+elements) may be a reference: ``"$name"`` to a pipeline input or an earlier
+step, or ``"$name.key"`` to one field of a step that returns a dict (e.g.
+``"$q.Q1"`` after ``quartiles``).
+
+Steps are ordered topologically and each runs as soon as the steps it
+references are done, so independent branches run concurrently. Steps that
+compute the same operation on the same (resolved) inputs are evaluated once.
+"""
+import asyncio
+from graphlib import CycleError, TopologicalSorter
+
+from .batch_tool import OPERATIONS, run_operation
+
+
+def _step_args(name, spec):
+    """Normalize a step into (op, args dict)."""
+    op = spec[0] if isinstance(spec, list) else spec.op
+    if op not in OPERATIONS:
+        raise ValueError(f"Step {name}: unknown operation: {op}")
+    if isinstance(spec, list):
+        positional = spec[1:]
+        # 参数顺序取自 batch_tool 的操作表
+        params = OPERATIONS[op][1]
+        if not params:
+            raise ValueError(f"Step {name}: {op} takes no positional arguments; use the object form")
+        if len(positional) > len(params):
+            raise ValueError(
+                f"Step {name}: {op} takes at most {len(params)} argument(s) ({', '.join(params)})"
+            )
+        return op, dict(zip(params, positional))
+    return op, spec.args
+
+
+def _parse_reference(value):
+    """Return (name, key) for "$name" / "$name.key" strings, else None."""
+    if isinstance(value, str) and value.startswith("$") and len(value) > 1:
+        name, _, key = value[1:].partition(".")
+        return name, key or None
+    return None
+
+
+def _references(value, found):
+    reference = _parse_reference(value)
+    if reference is not None:
+        found.add(reference[0])
+    elif isinstance(value, list):
+        for item in value:
+            _references(item, found)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _references(item, found)
+    return found
+
+
+def _substitute(value, lookup):
+    reference = _parse_reference(value)
+    if reference is not None:
+        return lookup(*reference)
+    if isinstance(value, list):
+        return [_substitute(item, lookup) for item in value]
+    if isinstance(value, dict):
+        return {key: _substitute(item, lookup) for key, item in value.items()}
+    return value
+
+
+def _freeze(value):
+    """Hashable form of resolved arguments, used as the memoization key."""
+    if isinstance(value, list):
+        return ("list", tuple(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    return value
+
+
+def plan(steps, inputs=None):
+    """Validate a pipeline and return (order, normalized steps, dependencies).
+
+    Raises ValueError for unknown operations, unknown references and cycles.
+    """
+    inputs = inputs or {}
+    clashes = sorted(set(steps) & set(inputs))
+    if clashes:
+        raise ValueError(f"Names used for both inputs and steps: {', '.join(clashes)}")
+    normalized = {}
+    dependencies = {}
+    for name, spec in steps.items():
+        op, args = _step_args(name, spec)
+        refs = _references(args, set())
+        unknown = sorted(refs - steps.keys() - inputs.keys())
+        if unknown:
+            raise ValueError(f"Step {name}: unknown reference(s): {', '.join('$' + r for r in unknown)}")
+        normalized[name] = (op, args)
+        dependencies[name] = refs & steps.keys()
+    try:
+        order = list(TopologicalSorter(dependencies).static_order())
+    except CycleError as exc:
+        raise ValueError(f"Pipeline has a cycle: {' -> '.join(exc.args[1])}") from None
+    return order, normalized, dependencies
+
+
+async def pipeline(input_data, resolve_dataset=None):
+    """Run a pipeline and return every intermediate result.
+
+    Returns ``{"results": {step: value}, "errors": {step: message},
+    "order": [...], "status": ...}``. A failed step fails the steps that
+    depend on it; independent steps still complete.
+    """
+    inputs = input_data.inputs
+    order, steps, dependencies = plan(input_data.steps, inputs)
+
+    results = {}
+    errors = {}
+    tasks = {}
+    memo = {}
+
+    def lookup(name, key):
+        value = inputs[name] if name in inputs else results[name]
+        if key is None:
+            return value
+        if not isinstance(value, dict) or key not in value:
+            raise ValueError(f"${name} has no field {key!r}")
+        return value[key]
+
+    async def evaluate(op, args):
+        return await run_operation(op, args, resolve_dataset)
+
+    async def run_step(name):
+        for dependency in dependencies[name]:
+            await tasks[dependency]
+        failed = sorted(d for d in dependencies[name] if d in errors)
+        if failed:
+            errors[name] = f"Depends on failed step(s): {', '.join(failed)}"
+            return
+        op, args = steps[name]
+        try:
+            resolved = _substitute(args, lookup)
+            key = (op, _freeze(resolved))
+            # 相同操作与相同输入只计算一次
+            shared = memo.get(key)
+            if shared is None:
+                shared = memo[key] = asyncio.ensure_future(evaluate(op, resolved))
+            results[name] = await shared
+        except Exception as exc:
+            # 失败只标记该步骤 (及依赖它的步骤)，不中断其他步骤
+            errors[name] = str(exc)
+
+    for name in order:
+        tasks[name] = asyncio.ensure_future(run_step(name))
+    await asyncio.gather(*tasks.values())
+
+    if not errors:
+        status = "success"
+    elif len(errors) == len(order):
+        status = "failed"
+    else:
+        status = "partial"
+    return {
+        "results": {name: results[name] for name in order if name in results},
+        "errors": errors,
+        "order": order,
+        "status": status
+    }
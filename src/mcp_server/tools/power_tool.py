@@ -1,5 +1,12 @@
 from math import pow
 
+def power_value(base: float, exponent: float) -> float:
+    """base ** exponent; shared by the scalar, element-wise, batch and evaluate paths."""
+    try:
+        return pow(base, exponent)
+    except OverflowError:
+        raise ValueError("Result too large") from None
+
 async def power(input_data):
     """Calculate base raised to the power of exponent (乘方)."""
-    return pow(input_data.base, input_data.exponent)
\ No newline at end of file
+    return power_value(input_data.base, input_data.exponent)
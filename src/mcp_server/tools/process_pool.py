@@ -0,0 +1,61 @@
+"""Shared worker processes for CPU-heavy tools.
+
+Long computations run here instead of on the event loop, so other tool calls
+stay responsive. The pool is created on first use and shut down with the
+server.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+PROGRESS_INTERVAL = 0.25
+
+_executor = None
+
+
+class Progress:
+    """Report progress through ctx at most once per PROGRESS_INTERVAL.
+
+    The final step is always reported.
+    """
+
+    def __init__(self, ctx, total: int):
+        self.ctx = ctx
+        self.total = total
+        self.done = 0
+        self._last = time.monotonic()
+
+    async def advance(self):
+        self.done += 1
+        now = time.monotonic()
+        if self.ctx is not None and (self.done == self.total or now - self._last >= PROGRESS_INTERVAL):
+            self._last = now
+            await self.ctx.report_progress(self.done, self.total)
+
+
+def max_workers() -> int:
+    """Number of worker processes (MAX_WORKER_PROCESSES, default: CPU count up to 4)."""
+    configured = os.environ.get("MAX_WORKER_PROCESSES")
+    if configured:
+        return max(1, int(configured))
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: 服务器进程中有线程 (历史日志写入等)，fork 不安全
+        _executor = ProcessPoolExecutor(
+            max_workers=max_workers(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def shutdown():
+    """Stop the worker processes, if any were started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,170 @@
+"""Mergeable t-digest for approximate percentiles in bounded memory.
+
+A digest summarizes the data as a sorted list of centroids (mean, weight).
+Centroids near the median may absorb many points while those in the tails
+stay small, following the scale function k(q) = δ/(2π)·asin(2q - 1): each
+centroid spans at most one unit of k. There are at most about δ/2
+centroids (δ is the compression), so a digest with δ = 100 takes about a
+KB however many points it has seen, and percentiles are typically within
+0.1 percentile points of the exact rank; doubling δ roughly halves that.
+
+Points are buffered and folded in by one sorted merge pass when the buffer
+fills. Digests of different shards merge the same way, and a digest
+serializes to plain lists so it can be stored and restored. With every
+centroid a single point (small inputs) percentile() reproduces the exact
+linear-interpolation percentile of order_statistics.
+"""
+import heapq
+import math
+from bisect import bisect_left
+from itertools import repeat
+
+DEFAULT_COMPRESSION = 100
+# 缓冲区大小为压缩参数的倍数
+_BUFFER_FACTOR = 10
+
+
+class TDigest:
+    """Centroids (means, weights) plus a buffer of points not merged yet."""
+
+    __slots__ = ("compression", "means", "weights", "count", "min", "max", "_buffer")
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        if compression < 20:
+            raise ValueError("compression must be at least 20")
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = []
+
+    @classmethod
+    def of(cls, values, compression: float = DEFAULT_COMPRESSION) -> "TDigest":
+        """Digest of a whole dataset in one sort and one pass."""
+        digest = cls(compression)
+        digest.add(values)
+        digest.compress()
+        return digest
+
+    def add(self, values):
+        """Add data points."""
+        if not len(values):
+            return
+        self._buffer.extend(values)
+        self.count += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        if len(self._buffer) >= _BUFFER_FACTOR * self.compression:
+            self.compress()
+
+    def merge(self, other: "TDigest"):
+        """Fold another digest into this one."""
+        if not other.count:
+            return
+        other.compress()
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._merge(zip(other.means, other.weights))
+
+    def compress(self):
+        """Merge buffered points into the centroids."""
+        if self._buffer:
+            self._merge()
+
+    def _q_limit(self, q: float) -> float:
+        """Largest quantile a centroid starting at q may reach (one unit of k)."""
+        scale = self.compression / (2 * math.pi)
+        k = scale * math.asin(min(2 * q - 1, 1.0)) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k / scale) + 1) / 2
+
+    def _merge(self, extra=()):
+        self._buffer.sort()
+        items = heapq.merge(
+            zip(self.means, self.weights), zip(self._buffer, repeat(1)), sorted(extra)
+        )
+        self._buffer = []
+        total = self.count
+        means, weights = [], []
+        mean, weight = next(items)
+        before = 0
+        limit = total * self._q_limit(0.0)
+        for value, value_weight in items:
+            if before + weight + value_weight <= limit:
+                weight += value_weight
+                mean += (value - mean) * value_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                limit = total * self._q_limit(before / total)
+                mean, weight = value, value_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def percentiles(self, ps):
+        """Approximate percentiles (0-100) by interpolating between centroid centers."""
+        if not self.count:
+            raise ValueError("Digest is empty; add data first")
+        self.compress()
+        # 质心中心的累计位置；端点为 min 和 max
+        centers = [0.5]
+        values = [self.min]
+        cumulative = 0
+        for mean, weight in zip(self.means, self.weights):
+            centers.append(cumulative + weight / 2)
+            values.append(mean)
+            cumulative += weight
+        centers.append(cumulative - 0.5)
+        values.append(self.max)
+        results = []
+        for p in ps:
+            if not 0 <= p <= 100:
+                raise ValueError("Percentile must be between 0 and 100")
+            # 与精确分位数相同的位置: rank = p/100·(n-1)，换算到质心中心坐标
+            index = p / 100 * (self.count - 1) + 0.5
+            right = min(max(bisect_left(centers, index), 1), len(centers) - 1)
+            x0, x1 = centers[right - 1], centers[right]
+            y0, y1 = values[right - 1], values[right]
+            if x1 <= x0:
+                results.append(y1)
+            else:
+                results.append(min(max(y0 + (y1 - y0) * (index - x0) / (x1 - x0), self.min), self.max))
+        return results
+
+    def percentile(self, p: float) -> float:
+        return self.percentiles((p,))[0]
+
+    def to_dict(self) -> dict:
+        """Plain-data form for persisting; restore with from_dict."""
+        self.compress()
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "means": list(self.means),
+            "weights": list(self.weights),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "TDigest":
+        try:
+            digest = cls(state["compression"])
+            means, weights = list(state["means"]), list(state["weights"])
+            count = state["count"]
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid digest state: {exc}") from None
+        if len(means) != len(weights) or sum(weights) != count or any(w <= 0 for w in weights):
+            raise ValueError("Invalid digest state: weights do not match count")
+        if means != sorted(means):
+            raise ValueError("Invalid digest state: means must be sorted")
+        digest.means, digest.weights, digest.count = means, weights, count
+        if count:
+            digest.min, digest.max = state["min"], state["max"]
+        return digest
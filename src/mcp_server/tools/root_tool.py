@@ -1,12 +1,22 @@
 from math import pow
 
-async def root(input_data):
-    """Calculate the nth root of a number (开方)."""
-    if input_data.number < 0 and input_data.degree % 2 == 0:
+def validate_root(number: float, degree: float):
+    """Raise ValueError when the degree-th root of number is not a real number."""
+    if degree <= 0:
+        raise ValueError("Root degree must be positive")
+    if number < 0 and degree % 2 == 0:
         raise ValueError("Cannot calculate even root of negative number")
-    
+    if number < 0 and degree % 1:
+        raise ValueError("Cannot calculate non-integer root of negative number")
+
+def root_value(number: float, degree: float = 2.0) -> float:
+    """The degree-th root of number; shared by the scalar, element-wise, batch and evaluate paths."""
+    validate_root(number, degree)
     # Handle negative numbers with odd roots
-    if input_data.number < 0 and input_data.degree % 2 == 1:
-        return -pow(-input_data.number, 1 / input_data.degree)
-    
-    return pow(input_data.number, 1 / input_data.degree)
\ No newline at end of file
+    if number < 0 and degree % 2 == 1:
+        return -pow(-number, 1 / degree)
+    return pow(number, 1 / degree)
+
+async def root(input_data):
+    """Calculate the nth root of a number (开方)."""
+    return root_value(input_data.number, input_data.degree)
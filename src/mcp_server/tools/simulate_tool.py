@@ -0,0 +1,174 @@
+"""Monte Carlo simulation of simple probability experiments.
+
+Trials are split into fixed-size shards. Each shard draws from its own
+``random.Random`` stream, seeded from (seed, shard index), and returns partial
+counts and moments; the shards are merged in order with Chan's parallel
+formula. Results therefore depend only on the seed and the number of trials,
+not on how many worker processes ran them. Runs that draw many samples
+(trials times dice or draws per trial) execute in the shared process pool
+with rate-limited progress reports.
+"""
+import asyncio
+import hashlib
+import math
+import operator
+import random
+from collections import Counter
+from itertools import accumulate
+
+from . import process_pool
+
+SHARD_TRIALS = 250_000
+# 样本总数 (试验次数 × 每次试验的骰子数或抽取数) 少于该值时直接在当前进程中运行
+PROCESS_THRESHOLD = 200_000
+# 不同结果值超过该数量时只返回矩，不返回分布
+MAX_DISTINCT = 1000
+# 每次最多生成的样本数，限制 draws 较大时单个分片的内存
+BLOCK_DRAWS = 1_000_000
+
+
+def shard_seed(seed: int, shard: int) -> int:
+    """Independent, reproducible seed for one shard's RNG stream."""
+    digest = hashlib.blake2b(f"{seed}:{shard}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _outcomes(spec: dict, trials: int, rng: random.Random) -> list:
+    """Draw one outcome per trial for the experiment described by spec."""
+    experiment = spec["experiment"]
+    if experiment == "dice":
+        faces = range(1, spec["sides"] + 1)
+        outcomes = rng.choices(faces, k=trials)
+        for _ in range(spec["dice"] - 1):
+            outcomes = list(map(operator.add, outcomes, rng.choices(faces, k=trials)))
+        return outcomes
+    if experiment == "binomial":
+        n, p = spec["n"], spec["p"]
+        binomialvariate = rng.binomialvariate
+        return [binomialvariate(n, p) for _ in range(trials)]
+    draws = spec["draws"]
+    if experiment == "draw" and not spec["replace"]:
+        population = spec["values"]
+        sample = rng.sample
+        return [math.fsum(sample(population, draws)) for _ in range(trials)]
+    values, cum_weights = spec["values"], spec.get("cum_weights")
+    if draws == 1:
+        return rng.choices(values, cum_weights=cum_weights, k=trials)
+    # 放回抽样与加权离散分布: 按块生成样本 (每块至多 BLOCK_DRAWS 个)，再按每次试验 draws 个求和；
+    # choices 每个样本消耗一个随机数，分块不改变结果
+    block = max(1, BLOCK_DRAWS // draws)
+    outcomes = []
+    for start in range(0, trials, block):
+        samples = rng.choices(values, cum_weights=cum_weights, k=min(block, trials - start) * draws)
+        outcomes.extend(map(math.fsum, zip(*[iter(samples)] * draws)))
+    return outcomes
+
+
+def run_shard(spec: dict, trials: int, seed: int):
+    """Run one shard; returns (count, mean, m2, min, max, counts or None)."""
+    outcomes = _outcomes(spec, trials, random.Random(seed))
+    counts = Counter(outcomes)
+    if len(counts) <= MAX_DISTINCT:
+        mean = math.fsum(value * count for value, count in counts.items()) / trials
+        m2 = math.fsum((value - mean) ** 2 * count for value, count in counts.items())
+        return trials, mean, m2, min(counts), max(counts), dict(counts)
+    mean = math.fsum(outcomes) / trials
+    deviations = [value - mean for value in outcomes]
+    return trials, mean, math.sumprod(deviations, deviations), min(outcomes), max(outcomes), None
+
+
+def merge_shards(shards):
+    """Combine shard results in order (Chan et al. parallel variance)."""
+    count, mean, m2 = 0, 0.0, 0.0
+    low, high = math.inf, -math.inf
+    counts = Counter()
+    for shard_count, shard_mean, shard_m2, shard_min, shard_max, shard_counts in shards:
+        total = count + shard_count
+        delta = shard_mean - mean
+        mean += delta * shard_count / total
+        m2 += shard_m2 + delta * delta * count * shard_count / total
+        count = total
+        low, high = min(low, shard_min), max(high, shard_max)
+        if counts is not None and shard_counts is not None:
+            counts.update(shard_counts)
+            if len(counts) > MAX_DISTINCT:
+                counts = None
+        else:
+            counts = None
+    return count, mean, m2, low, high, counts
+
+
+def samples_per_trial(spec: dict) -> int:
+    """Random draws one trial of the experiment costs."""
+    if spec["experiment"] == "dice":
+        return spec["dice"]
+    if spec["experiment"] == "binomial":
+        return 1
+    return spec["draws"]
+
+
+def _spec(input_data) -> dict:
+    spec = {"experiment": input_data.experiment}
+    if input_data.experiment == "dice":
+        spec.update(dice=input_data.dice, sides=input_data.sides)
+    elif input_data.experiment == "binomial":
+        spec.update(n=input_data.n, p=input_data.p)
+    else:
+        spec.update(values=list(input_data.values), draws=input_data.draws, replace=input_data.replace)
+        if input_data.experiment == "discrete":
+            spec["cum_weights"] = list(accumulate(input_data.weights))
+    return spec
+
+
+async def simulate(input_data, ctx=None):
+    """Run a sampling experiment and summarize the outcome of each trial.
+
+    Outcomes: dice -> sum of the dice; binomial -> number of successes;
+    draw / discrete -> sum of the drawn values.
+    """
+    seed = input_data.seed
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 63)
+    spec = _spec(input_data)
+    trials = input_data.trials
+    sizes = [SHARD_TRIALS] * (trials // SHARD_TRIALS)
+    if trials % SHARD_TRIALS:
+        sizes.append(trials % SHARD_TRIALS)
+
+    progress = process_pool.Progress(ctx, len(sizes))
+    if trials * samples_per_trial(spec) < PROCESS_THRESHOLD:
+        shards = []
+        for index, size in enumerate(sizes):
+            shards.append(run_shard(spec, size, shard_seed(seed, index)))
+            await progress.advance()
+    else:
+        loop = asyncio.get_running_loop()
+        executor = process_pool.get_executor()
+
+        async def run(index, size):
+            result = await loop.run_in_executor(executor, run_shard, spec, size, shard_seed(seed, index))
+            await progress.advance()
+            return result
+
+        shards = await asyncio.gather(*(run(i, size) for i, size in enumerate(sizes)))
+
+    count, mean, m2, low, high, counts = merge_shards(shards)
+    variance = m2 / (count - 1) if count > 1 else 0.0
+    distribution = None
+    if counts is not None:
+        distribution = [
+            {"value": value, "count": counts[value], "probability": counts[value] / count}
+            for value in sorted(counts)
+        ]
+    return {
+        "experiment": input_data.experiment,
+        "trials": count,
+        "seed": seed,
+        "mean": mean,
+        "variance": variance,
+        "stddev": math.sqrt(variance),
+        "standard_error": math.sqrt(variance / count),
+        "min": low,
+        "max": high,
+        "distribution": distribution,
+    }
@@ -0,0 +1,116 @@
+"""NumPy implementations of the statistics tools and backend selection.
+
+Each statistics tool computes on inline data either with the standard
+library (the "python" backend) or, when NumPy is installed, with the
+vectorized functions below (the "numpy" backend). "auto" uses NumPy for
+inputs of at least NUMPY_MIN_SIZE points and Python otherwise. The default
+comes from the STATISTICS_BACKEND environment variable (read by the server
+at startup) and any call may override it.
+
+Results agree with the Python backend within a relative tolerance of 1e-9:
+min, max, medians, percentiles, modes and frequencies are identical, while
+sums and everything derived from them (mean, variance, geometric and
+harmonic means) use NumPy's pairwise summation instead of exact or
+left-to-right summation, so they can differ in the last few bits.
+Statistics on stored datasets come from the cached summary either way.
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+BACKENDS = ("auto", "python", "numpy")
+# 小于该长度时转换为 NumPy 数组的开销大于收益
+NUMPY_MIN_SIZE = 512
+# 两个后端结果之间允许的相对误差
+TOLERANCE = 1e-9
+
+_default = "auto"
+
+
+def _check(name: str) -> str:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown statistics backend: {name}; use one of {', '.join(BACKENDS)}")
+    if name == "numpy" and np is None:
+        raise ValueError("The numpy statistics backend needs NumPy installed")
+    return name
+
+
+def configure(name: str):
+    """Set the backend used when a call does not choose one."""
+    global _default
+    _default = _check(name)
+
+
+def default_backend() -> str:
+    return _default
+
+
+def use_numpy(backend, size: int) -> bool:
+    """Whether a computation on size points should use NumPy."""
+    name = _check(backend) if backend is not None else _default
+    if name == "auto":
+        return np is not None and size >= NUMPY_MIN_SIZE
+    return name == "numpy"
+
+
+def as_array(values):
+    """float64 ndarray of the values (no copy for array('d') buffers)."""
+    if isinstance(values, array) and values.typecode == "d":
+        return np.frombuffer(values, dtype=float)
+    return np.asarray(values, dtype=float)
+
+
+def total(values) -> float:
+    return float(np.sum(as_array(values)))
+
+
+def mean(values) -> float:
+    return float(np.mean(as_array(values)))
+
+
+def variance(values) -> float:
+    return float(np.var(as_array(values), ddof=1))
+
+
+def stddev(values) -> float:
+    return float(np.std(as_array(values), ddof=1))
+
+
+def minimum(values) -> float:
+    return float(np.min(as_array(values)))
+
+
+def maximum(values) -> float:
+    return float(np.max(as_array(values)))
+
+
+def percentiles(values, ps):
+    """Linear interpolation between closest ranks, like order_statistics.percentiles."""
+    return [float(value) for value in np.percentile(as_array(values), ps)]
+
+
+def median(values) -> float:
+    return float(np.median(as_array(values)))
+
+
+def geometric_mean(values) -> float:
+    return float(np.exp(np.mean(np.log(as_array(values)))))
+
+
+def harmonic_mean(values) -> float:
+    data = as_array(values)
+    return float(len(data) / np.sum(1.0 / data))
+
+
+def counts(values):
+    """(distinct values, counts) ordered by descending count, ties by first occurrence.
+
+    This is the order of Counter.most_common, so modes and top-k values match
+    the Python backend exactly.
+    """
+    unique, first, occurrences = np.unique(as_array(values), return_index=True, return_counts=True)
+    order = np.lexsort((first, -occurrences))
+    return unique[order].tolist(), occurrences[order].tolist()
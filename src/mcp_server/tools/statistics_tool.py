@@ -1,116 +1,279 @@
+import math
 import statistics
 from typing import List, Optional, Union
 from collections import Counter
 
+from . import order_statistics
+from . import statistics_backend as numpy_backend
+from .frequency import top_counts
+from .quantile_sketch import TDigest
+
+# describe() 支持的统计量，名称与 server 中的工具名一致
+DESCRIBE_STATS = (
+    "count", "sum", "mean", "median", "stddev", "variance",
+    "min_value", "max_value", "range_stat", "quartiles", "iqr",
+)
+_ORDER_STATS = {"median", "quartiles", "iqr"}
+
 # 基础描述性统计
-async def mean(input_data):
+# 所有函数都接受可选的 summary (state.summary_cache.DatasetSummary)，
+# 对已存储的数据集复用缓存的中间结果，而不是重新扫描数据；
+# backend ("auto"/"python"/"numpy"，None 为服务器默认) 决定内联数据的计算方式
+def _numpy(input_data, backend) -> bool:
+    return numpy_backend.use_numpy(backend, len(input_data.data))
+
+async def mean(input_data, summary=None, backend=None):
     """Calculate the arithmetic mean of a dataset."""
+    if summary is not None:
+        return summary.mean
+    if _numpy(input_data, backend):
+        return numpy_backend.mean(input_data.data)
     return statistics.mean(input_data.data)
 
-async def median(input_data):
+async def median(input_data, summary=None, backend=None):
     """Calculate the median of a dataset."""
-    return statistics.median(input_data.data)
+    if summary is not None:
+        return order_statistics.median_sorted(summary.sorted)
+    if _numpy(input_data, backend):
+        return numpy_backend.median(input_data.data)
+    return order_statistics.median(input_data.data)
 
-async def stddev(input_data):
+async def stddev(input_data, summary=None, backend=None):
     """Calculate the standard deviation of a dataset."""
     if len(input_data.data) < 2:
         raise ValueError("Standard deviation requires at least 2 data points")
+    if summary is not None:
+        return math.sqrt(summary.variance)
+    if _numpy(input_data, backend):
+        return numpy_backend.stddev(input_data.data)
     return statistics.stdev(input_data.data)
 
-async def min_value(input_data):
+async def min_value(input_data, summary=None, backend=None):
     """Find the minimum value in a dataset."""
+    if summary is not None:
+        return summary.min
+    if _numpy(input_data, backend):
+        return numpy_backend.minimum(input_data.data)
     return min(input_data.data)
 
-async def max_value(input_data):
+async def max_value(input_data, summary=None, backend=None):
     """Find the maximum value in a dataset."""
+    if summary is not None:
+        return summary.max
+    if _numpy(input_data, backend):
+        return numpy_backend.maximum(input_data.data)
     return max(input_data.data)
 
-async def sum_values(input_data):
+async def sum_values(input_data, summary=None, backend=None):
     """Calculate the sum of all values in a dataset."""
+    if summary is not None:
+        return summary.total
+    if _numpy(input_data, backend):
+        return numpy_backend.total(input_data.data)
     return sum(input_data.data)
 
-async def count_values(input_data):
+async def count_values(input_data, summary=None, backend=None):
     """Count the number of values in a dataset."""
     return len(input_data.data)
 
-async def range_values(input_data):
+async def range_values(input_data, summary=None, backend=None):
     """Calculate the range (max - min) of a dataset."""
+    if summary is not None:
+        return summary.max - summary.min
+    if _numpy(input_data, backend):
+        return numpy_backend.maximum(input_data.data) - numpy_backend.minimum(input_data.data)
     return max(input_data.data) - min(input_data.data)
 
-async def variance(input_data):
+async def variance(input_data, summary=None, backend=None):
     """Calculate the variance of a dataset."""
     if len(input_data.data) < 2:
         raise ValueError("Variance requires at least 2 data points")
+    if summary is not None:
+        return summary.variance
+    if _numpy(input_data, backend):
+        return numpy_backend.variance(input_data.data)
     return statistics.variance(input_data.data)
 
-async def mode(input_data):
+def _counts(input_data, summary):
+    # 每个值只哈希一次；已存储的数据集复用摘要中的计数表
+    if summary is not None:
+        return summary.counts
+    return Counter(input_data.data)
+
+async def mode(input_data, summary=None, backend=None):
     """Find the mode(s) of a dataset. Returns a list for multiple modes."""
-    try:
-        # Try to get single mode
-        return statistics.mode(input_data.data)
-    except statistics.StatisticsError:
-        # Multiple modes exist, calculate them manually
-        counter = Counter(input_data.data)
+    if summary is None and _numpy(input_data, backend):
+        values, counts = numpy_backend.counts(input_data.data)
+        modes = values[:counts.count(counts[0])]
+    else:
+        counter = _counts(input_data, summary)
         max_count = max(counter.values())
+        # 按首次出现的顺序返回
         modes = [value for value, count in counter.items() if count == max_count]
-        return modes if len(modes) > 1 else modes[0]
+    return modes if len(modes) > 1 else modes[0]
+
+async def frequencies(input_data, k: Optional[int] = 10, summary=None, backend=None):
+    """Count, number of distinct values and the k most common values with their counts."""
+    if k is not None and k < 1:
+        raise ValueError("k must be at least 1")
+    if summary is None and _numpy(input_data, backend):
+        values, counts = numpy_backend.counts(input_data.data)
+        top = [{"value": value, "count": count} for value, count in zip(values[:k], counts[:k])]
+        distinct = len(values)
+    else:
+        counter = _counts(input_data, summary)
+        top = top_counts(counter, k)
+        distinct = len(counter)
+    return {"count": len(input_data.data), "distinct": distinct, "top": top}
 
 # 分位数相关统计
-async def percentile(input_data, p: float):
-    """Calculate the pth percentile of a dataset."""
+async def percentile(input_data, p: float, summary=None, approximate: bool = False, backend=None):
+    """Calculate the pth percentile of a dataset.
+
+    With approximate=True the answer comes from a t-digest of the data
+    (cached with a stored dataset's summary) instead of the exact order
+    statistic; see quantile_sketch for the error bound.
+    """
     if not 0 <= p <= 100:
         raise ValueError("Percentile must be between 0 and 100")
+    if approximate:
+        if summary is not None:
+            return summary.get("tdigest", lambda: TDigest.of(summary.values)).percentile(p)
+        return TDigest.of(input_data.data).percentile(p)
+    if summary is not None:
+        return order_statistics.interpolate_sorted(summary.sorted, p)
+    if _numpy(input_data, backend):
+        return numpy_backend.percentiles(input_data.data, (p,))[0]
     if p == 0:
         return min(input_data.data)
     elif p == 100:
         return max(input_data.data)
-    else:
-        sorted_data = sorted(input_data.data)
-        n = len(sorted_data)
-        k = (n - 1) * p / 100
-        f = int(k)
-        c = k - f
-        if f + 1 < n:
-            return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
-        else:
-            return sorted_data[f]
-
-async def quartiles(input_data):
+    return order_statistics.percentiles(input_data.data, (p,))[0]
+
+def _quartiles(data, summary, backend=None):
+    if summary is not None:
+        sorted_data = summary.sorted
+        return tuple(order_statistics.interpolate_sorted(sorted_data, p) for p in (25, 50, 75))
+    if numpy_backend.use_numpy(backend, len(data)):
+        return tuple(numpy_backend.percentiles(data, (25, 50, 75)))
+    return order_statistics.percentiles(data, (25, 50, 75))
+
+async def quartiles(input_data, summary=None, backend=None):
     """Calculate the quartiles (Q1, Q2, Q3) of a dataset."""
-    sorted_data = sorted(input_data.data)
-    n = len(sorted_data)
-    
-    # Q1 (25th percentile)
-    q1_idx = (n - 1) * 0.25
-    q1 = sorted_data[int(q1_idx)] + (q1_idx % 1) * (sorted_data[min(int(q1_idx) + 1, n - 1)] - sorted_data[int(q1_idx)])
-    
-    # Q2 (median, 50th percentile)
-    q2 = statistics.median(sorted_data)
-    
-    # Q3 (75th percentile)
-    q3_idx = (n - 1) * 0.75
-    q3 = sorted_data[int(q3_idx)] + (q3_idx % 1) * (sorted_data[min(int(q3_idx) + 1, n - 1)] - sorted_data[int(q3_idx)])
-    
+    q1, q2, q3 = _quartiles(input_data.data, summary, backend)
     return {
         "Q1": q1,
         "Q2": q2,
         "Q3": q3
     }
 
-async def iqr(input_data):
+async def iqr(input_data, summary=None, backend=None):
     """Calculate the interquartile range (Q3 - Q1) of a dataset."""
-    q_data = await quartiles(input_data)
-    return q_data["Q3"] - q_data["Q1"]
+    if summary is not None:
+        sorted_data = summary.sorted
+        q1 = order_statistics.interpolate_sorted(sorted_data, 25)
+        q3 = order_statistics.interpolate_sorted(sorted_data, 75)
+        return q3 - q1
+    if _numpy(input_data, backend):
+        q1, q3 = numpy_backend.percentiles(input_data.data, (25, 75))
+    else:
+        q1, q3 = order_statistics.percentiles(input_data.data, (25, 75))
+    return q3 - q1
 
 # 特殊平均值
-async def geometric_mean(input_data):
+async def geometric_mean(input_data, summary=None, backend=None):
     """Calculate the geometric mean of a dataset."""
+    if summary is not None:
+        if summary.min <= 0:
+            raise ValueError("Geometric mean requires all positive values")
+        return summary.get("geometric_mean", lambda: statistics.geometric_mean(input_data.data))
+    if _numpy(input_data, backend):
+        if numpy_backend.minimum(input_data.data) <= 0:
+            raise ValueError("Geometric mean requires all positive values")
+        return numpy_backend.geometric_mean(input_data.data)
     if any(x <= 0 for x in input_data.data):
         raise ValueError("Geometric mean requires all positive values")
     return statistics.geometric_mean(input_data.data)
 
-async def harmonic_mean(input_data):
+async def harmonic_mean(input_data, summary=None, backend=None):
     """Calculate the harmonic mean of a dataset."""
+    if summary is not None:
+        if summary.min <= 0:
+            raise ValueError("Harmonic mean requires all positive values")
+        return summary.get("harmonic_mean", lambda: statistics.harmonic_mean(input_data.data))
+    if _numpy(input_data, backend):
+        if numpy_backend.minimum(input_data.data) <= 0:
+            raise ValueError("Harmonic mean requires all positive values")
+        return numpy_backend.harmonic_mean(input_data.data)
     if any(x <= 0 for x in input_data.data):
         raise ValueError("Harmonic mean requires all positive values")
-    return statistics.harmonic_mean(input_data.data)
\ No newline at end of file
+    return statistics.harmonic_mean(input_data.data)
+
+# 综合描述统计
+async def describe(input_data, stats: Optional[List[str]] = None, summary=None, backend=None):
+    """Calculate several summary statistics of a dataset at once.
+
+    Moments and extremes are gathered in a single scan and every order
+    statistic comes from one multi-rank selection, so asking for everything
+    costs about as much as the most expensive individual tool. Variance and
+    stddev are None for single-point datasets instead of raising.
+    """
+    requested = list(DESCRIBE_STATS) if not stats else stats
+    unknown = [name for name in requested if name not in DESCRIBE_STATS]
+    if unknown:
+        raise ValueError(f"Unknown statistic(s): {', '.join(unknown)}")
+
+    data = input_data.data
+    n = len(data)
+    wants_variance = n >= 2 and ("variance" in requested or "stddev" in requested)
+    var = None
+    if summary is not None:
+        total, lo, hi = summary.total, summary.min, summary.max
+        avg = total / n
+        if wants_variance:
+            var = summary.variance
+    elif _numpy(input_data, backend):
+        total = numpy_backend.total(data)
+        avg = total / n
+        lo = numpy_backend.minimum(data)
+        hi = numpy_backend.maximum(data)
+        if wants_variance:
+            var = numpy_backend.variance(data)
+    else:
+        total = math.fsum(data)
+        avg = total / n
+        lo = min(data)
+        hi = max(data)
+        if wants_variance:
+            deviations = [x - avg for x in data]
+            var = math.sumprod(deviations, deviations) / (n - 1)
+
+    q1 = q2 = q3 = None
+    if _ORDER_STATS.intersection(requested):
+        q1, q2, q3 = _quartiles(data, summary, backend)
+
+    result = {}
+    for name in requested:
+        if name == "count":
+            result[name] = n
+        elif name == "sum":
+            result[name] = total
+        elif name == "mean":
+            result[name] = avg
+        elif name == "median":
+            result[name] = q2
+        elif name == "stddev":
+            result[name] = None if var is None else math.sqrt(var)
+        elif name == "variance":
+            result[name] = var
+        elif name == "min_value":
+            result[name] = lo
+        elif name == "max_value":
+            result[name] = hi
+        elif name == "range_stat":
+            result[name] = hi - lo
+        elif name == "quartiles":
+            result[name] = {"Q1": q1, "Q2": q2, "Q3": q3}
+        elif name == "iqr":
+            result[name] = q3 - q1
+    return result
@@ -0,0 +1,92 @@
+from ..state.streams import RunningMoments
+from .frequency import HyperLogLog, SpaceSaving
+from .quantile_sketch import TDigest
+
+# 可选草图: Stream 属性名 (也是导出的键) 与对应的类
+_SKETCHES = (("digest", TDigest), ("heavy_hitters", SpaceSaving), ("distinct", HyperLogLog))
+
+
+async def stats_stream_open(input_data, registry):
+    """Start a streaming statistics accumulator and return its handle."""
+    digest = TDigest(input_data.compression) if input_data.quantiles else None
+    heavy_hitters = SpaceSaving(input_data.top_k) if input_data.top_k else None
+    distinct = HyperLogLog(input_data.precision) if input_data.distinct else None
+    stream = registry.open(RunningMoments(input_data.higher_moments), digest, heavy_hitters, distinct)
+    return stream.info()
+
+async def stats_stream_push(input_data, registry):
+    """Add a chunk of data points to a stream."""
+    stream = registry.get(input_data.stream_id)
+    stream.push(input_data.numbers)
+    return stream.info()
+
+async def stats_stream_result(input_data, registry):
+    """Statistics of everything pushed to a stream so far."""
+    stream = registry.get(input_data.stream_id)
+    return {"stream_id": stream.id, **stream.moments.result()}
+
+async def stats_stream_percentile(input_data, registry):
+    """Approximate percentile(s) of a stream opened with quantiles=True."""
+    stream = registry.get(input_data.stream_id)
+    if stream.digest is None:
+        raise ValueError("Stream does not track quantiles; open it with quantiles=True")
+    if isinstance(input_data.p, list):
+        return stream.digest.percentiles(input_data.p)
+    return stream.digest.percentile(input_data.p)
+
+async def stats_stream_frequencies(input_data, registry):
+    """Heavy hitters and/or distinct-value estimate of a stream."""
+    stream = registry.get(input_data.stream_id)
+    if stream.heavy_hitters is None and stream.distinct is None:
+        raise ValueError("Stream does not track frequencies; open it with top_k or distinct=True")
+    result = {"stream_id": stream.id, "count": stream.moments.count}
+    if stream.heavy_hitters is not None:
+        result["top"] = stream.heavy_hitters.top(input_data.k)
+    if stream.distinct is not None:
+        result["distinct"] = stream.distinct.estimate()
+    return result
+
+async def stats_stream_merge(input_data, registry):
+    """Combine streams into a new one; the sources are left unchanged."""
+    streams = [registry.get(stream_id) for stream_id in input_data.stream_ids]
+    # 只有所有来源都跟踪三、四阶矩时合并结果才有偏度和峰度，各草图同理
+    merged = RunningMoments(all(stream.moments.higher for stream in streams))
+    sketches = {}
+    if all(stream.digest is not None for stream in streams):
+        sketches["digest"] = TDigest(max(stream.digest.compression for stream in streams))
+    if all(stream.heavy_hitters is not None for stream in streams):
+        sketches["heavy_hitters"] = SpaceSaving(max(stream.heavy_hitters.k for stream in streams))
+    if all(stream.distinct is not None for stream in streams):
+        sketches["distinct"] = HyperLogLog(streams[0].distinct.precision)
+    for stream in streams:
+        merged.merge(stream.moments)
+        for name, sketch in sketches.items():
+            sketch.merge(getattr(stream, name))
+    return registry.open(merged, **sketches).info()
+
+async def stats_stream_export(input_data, registry):
+    """Serialized state of a stream, to persist and restore with stats_stream_import."""
+    stream = registry.get(input_data.stream_id)
+    state = {"moments": stream.moments.to_dict()}
+    for name, _ in _SKETCHES:
+        sketch = getattr(stream, name)
+        state[name] = None if sketch is None else sketch.to_dict()
+    return state
+
+async def stats_stream_import(input_data, registry):
+    """Restore an exported stream under a new handle."""
+    moments = RunningMoments.from_dict(input_data.state["moments"])
+    sketches = {}
+    for name, sketch_class in _SKETCHES:
+        state = input_data.state.get(name)
+        if state is not None:
+            sketches[name] = sketch_class.from_dict(state)
+    digest = sketches.get("digest")
+    if digest is not None and digest.count != moments.count:
+        raise ValueError("Invalid stream state: digest and moments counts differ")
+    return registry.open(moments, **sketches).info()
+
+async def stats_stream_close(input_data, registry):
+    """Remove a stream and free its state."""
+    stream = registry.close(input_data.stream_id)
+    return {**stream.info(), "status": "closed"}
@@ -0,0 +1,88 @@
+import pytest
+from array import array
+from src.mcp_server.state.datasets import DatasetRegistry
+
+def test_upload_stores_float64_buffer():
+    registry = DatasetRegistry()
+    dataset, deduplicated = registry.upload([1, 2, 3])
+    assert not deduplicated
+    assert isinstance(dataset.values, array)
+    assert dataset.values.typecode == "d"
+    assert dataset.nbytes == 24
+    assert registry.total_bytes == 24
+
+def test_upload_keeps_float64_array_without_copy():
+    registry = DatasetRegistry()
+    values = array("d", [1, 2, 3])
+    dataset, _ = registry.upload(values)
+    assert dataset.values is values
+    # 与列表上传的内容哈希一致
+    same, deduplicated = registry.upload([1, 2, 3])
+    assert deduplicated and same.values is values
+    other, _ = registry.upload(array("f", [1, 2]))
+    assert other.values.typecode == "d"
+
+def test_upload_deduplicates_identical_content():
+    registry = DatasetRegistry()
+    first, _ = registry.upload([1.5, 2.5])
+    second, deduplicated = registry.upload([1.5, 2.5])
+    assert deduplicated
+    # 每次上传有自己的 ID，但共用同一缓冲区
+    assert second.id != first.id
+    assert second.values is first.values
+    assert len(registry) == 2
+    assert registry.total_bytes == 16
+    registry.drop(first.id)
+    assert registry.total_bytes == 16
+    registry.drop(second.id)
+    assert registry.total_bytes == 0
+
+def test_append_does_not_change_other_uploaders_data():
+    registry = DatasetRegistry()
+    mine, _ = registry.upload([1, 2])
+    theirs, _ = registry.upload([1, 2])
+    digest = theirs.digest
+    registry.append(mine.id, [3])
+    assert list(registry.get(mine.id).values) == [1, 2, 3]
+    assert list(registry.get(theirs.id).values) == [1, 2]
+    assert theirs.digest == digest
+    assert registry.total_bytes == 16 + 24
+    # 剩下的共用者继续参与去重
+    again, deduplicated = registry.upload([1, 2])
+    assert deduplicated and again.values is theirs.values
+
+def test_append_keeps_id_and_updates_digest():
+    registry = DatasetRegistry()
+    dataset, _ = registry.upload([1, 2])
+    old_digest = dataset.digest
+    registry.append(dataset.id, [3, 4])
+    assert list(registry.get(dataset.id).values) == [1, 2, 3, 4]
+    assert dataset.digest != old_digest
+    # Incremental hash matches hashing the full contents at once
+    same, deduplicated = registry.upload([1, 2, 3, 4])
+    assert deduplicated and same.values is dataset.values
+
+def test_drop_releases_bytes():
+    registry = DatasetRegistry()
+    dataset, _ = registry.upload([1, 2, 3])
+    registry.drop(dataset.id)
+    assert registry.total_bytes == 0
+    assert dataset.id not in registry
+    with pytest.raises(ValueError, match="Unknown dataset"):
+        registry.get(dataset.id)
+
+def test_lru_eviction_by_bytes():
+    registry = DatasetRegistry(max_bytes=48)
+    a, _ = registry.upload([1, 2])
+    b, _ = registry.upload([3, 4])
+    registry.get(a.id)  # a is now most recently used
+    c, _ = registry.upload([5, 6, 7])
+    assert a.id in registry
+    assert b.id not in registry
+    assert c.id in registry
+    assert registry.total_bytes == 40
+
+def test_dataset_larger_than_budget_rejected():
+    registry = DatasetRegistry(max_bytes=16)
+    with pytest.raises(ValueError, match="exceeds the registry limit"):
+        registry.upload([1, 2, 3])
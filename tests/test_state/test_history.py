@@ -0,0 +1,64 @@
+import pytest
+from src.mcp_server.state.history import HistoryStore
+
+def test_record_and_query_newest_first():
+    store = HistoryStore(max_size=10)
+    store.record("add", {"a": 1, "b": 2}, 3)
+    store.record("multiply", {"a": 2, "b": 3}, 6)
+    total, entries = store.query()
+    assert total == 2
+    assert [entry.operation for entry in entries] == ["multiply", "add"]
+    assert entries[1].result == 3
+
+def test_ring_buffer_overwrites_oldest():
+    store = HistoryStore(max_size=3)
+    for i in range(5):
+        store.record("add", {"i": i}, i)
+    assert len(store) == 3
+    total, entries = store.query()
+    assert total == 3
+    assert [entry.result for entry in entries] == [4, 3, 2]
+    with pytest.raises(KeyError):
+        store.get(1)
+
+def test_operation_index_tracks_eviction():
+    store = HistoryStore(max_size=4)
+    store.record("add", {}, 1)
+    store.record("mean", {}, 2)
+    store.record("add", {}, 3)
+    store.record("mean", {}, 4)
+    store.record("mean", {}, 5)
+    assert store.operations() == {"add": 1, "mean": 3}
+    total, entries = store.query(operation="add")
+    assert total == 1
+    assert entries[0].result == 3
+    assert store.query(operation="divide") == (0, [])
+
+def test_query_by_time_range():
+    store = HistoryStore()
+    for i in range(10):
+        store.record("add" if i % 2 else "subtract", {}, i, timestamp=100.0 + i)
+    total, entries = store.query(since=103, until=106)
+    assert total == 4
+    assert [entry.result for entry in entries] == [6, 5, 4, 3]
+    total, entries = store.query(operation="add", since=103, until=106)
+    assert [entry.result for entry in entries] == [5, 3]
+
+def test_query_paging():
+    store = HistoryStore()
+    for i in range(7):
+        store.record("add", {}, i)
+    total, page = store.query(offset=2, limit=3)
+    assert total == 7
+    assert [entry.result for entry in page] == [4, 3, 2]
+    total, page = store.query(offset=6, limit=3)
+    assert [entry.result for entry in page] == [0]
+    assert store.query(offset=10)[1] == []
+
+def test_errors_are_recorded():
+    store = HistoryStore()
+    store.record("mod", {"a": 1, "b": 0}, error="Divisor cannot be zero")
+    record = store.get(0).to_record()
+    assert record.error == "Divisor cannot be zero"
+    assert record.result is None
+    assert record.id == "0"
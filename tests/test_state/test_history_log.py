@@ -0,0 +1,138 @@
+import os
+import pytest
+from src.mcp_server.state.history import HistoryStore
+from src.mcp_server.state import history_log
+from src.mcp_server.state.history_log import HistoryLog, MAGIC
+
+def _open_store(path, size=10, retain=1000):
+    log = HistoryLog(str(path), retain=retain, fsync=False)
+    store = HistoryStore(max_size=size)
+    store.replay(log.open(limit=size))
+    store.attach_log(log)
+    return store, log
+
+def test_history_survives_restart(tmp_path):
+    path = tmp_path / "history.log"
+    store, log = _open_store(path)
+    store.record("add", {"a": 1, "b": 2}, 3.0)
+    store.record("mod", {"a": 1, "b": 0}, error="Divisor cannot be zero")
+    log.close()
+
+    store, log = _open_store(path)
+    total, entries = store.query()
+    assert total == 2
+    assert entries[0].operation == "mod"
+    assert entries[0].error == "Divisor cannot be zero"
+    assert entries[1].inputs == {"a": 1, "b": 2}
+    # Sequence numbers continue after replay
+    assert store.record("add", {}, 0) == 2
+    log.close()
+
+def test_replay_loads_only_newest_records(tmp_path):
+    path = tmp_path / "history.log"
+    store, log = _open_store(path, size=100)
+    for i in range(50):
+        store.record("add", {"i": i}, i)
+    log.close()
+
+    store, log = _open_store(path, size=5)
+    total, entries = store.query()
+    assert total == 5
+    assert [entry.result for entry in entries] == [49, 48, 47, 46, 45]
+    assert (log.first_seq, log.last_seq) == (0, 49)
+    log.close()
+
+def test_torn_tail_is_truncated(tmp_path):
+    path = tmp_path / "history.log"
+    store, log = _open_store(path)
+    store.record("add", {}, 1)
+    log.close()
+    size = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b"\x20\x00\x00\x00[3,1.0,\"add")
+
+    store, log = _open_store(path)
+    assert len(store) == 1
+    assert os.path.getsize(path) == size
+    log.close()
+
+def test_compaction_keeps_newest_records(tmp_path):
+    path = tmp_path / "history.log"
+    store, log = _open_store(path, size=10, retain=5)
+    for i in range(11):
+        store.record("add", {}, i)
+        log.flush()
+    assert log.last_seq - log.first_seq + 1 <= 10
+    log.close()
+
+    store, log = _open_store(path, size=10, retain=5)
+    total, entries = store.query()
+    assert entries[0].result == 10
+    assert total == log.last_seq - log.first_seq + 1
+    log.close()
+
+def test_writer_failure_degrades_log(tmp_path, monkeypatch, caplog):
+    store, log = _open_store(tmp_path / "history.log")
+    monkeypatch.setattr(history_log, "_encode", lambda record: 1 / 0)
+    store.record("add", {}, 1)
+    assert log.flush(timeout=5) is False
+    # 降级后只丢失持久化，记录仍进入内存历史，错误只记录一次
+    store.record("add", {}, 2)
+    assert log.flush(timeout=5) is False
+    assert store.query()[0] == 2
+    assert store.log_status()["status"] == "degraded"
+    assert "ZeroDivisionError" in store.log_status()["error"]
+    assert sum("failed" in r.getMessage() for r in caplog.records) == 1
+    log.close()
+
+def test_compaction_stops_at_corrupt_record(tmp_path, monkeypatch):
+    path = tmp_path / "history.log"
+    store, log = _open_store(path, size=10, retain=5)
+    monkeypatch.setattr(history_log, "_frame_ending_at", lambda buffer, end: None)
+    for i in range(11):
+        store.record("add", {}, i)
+    assert log.flush(timeout=5) is False
+    assert "corrupt record" in log.status()["error"]
+    log.close()
+    monkeypatch.undo()
+    # 压缩失败不改动原文件
+    store, log = _open_store(path, size=20, retain=5)
+    assert store.query()[0] == 11
+    log.close()
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "history.log"
+    path.write_bytes(b"not a log")
+    with pytest.raises(ValueError, match="not a calculation history log"):
+        HistoryLog(str(path)).open(limit=10)
+
+def test_replay_requires_empty_store():
+    store = HistoryStore()
+    store.record("add", {}, 1)
+    with pytest.raises(ValueError):
+        store.replay([(0, 1.0, "add", {}, 1, None)])
+
+def test_new_log_starts_with_magic(tmp_path):
+    path = tmp_path / "history.log"
+    log = HistoryLog(str(path))
+    assert log.open(limit=10) == []
+    log.close()
+    assert path.read_bytes() == MAGIC
+
+@pytest.mark.asyncio
+async def test_middleware_keeps_returning_results_after_log_failure(tmp_path, monkeypatch):
+    from fastmcp import Client
+    monkeypatch.syspath_prepend("src")
+    from mcp_server import server
+    from mcp_server.state import history_log as server_history_log
+    monkeypatch.setenv("HISTORY_LOG_PATH", str(tmp_path / "history.log"))
+    async with Client(server.mcp) as client:
+        monkeypatch.setattr(server_history_log, "_encode", lambda record: 1 / 0)
+        assert (await client.call_tool("add", {"a": 1, "b": 2})).data == 3
+        assert (await client.call_tool("add", {"a": 1, "b": 3})).data == 4
+        # 工具自身的错误不会被日志错误替换
+        with pytest.raises(Exception, match="even root of negative number"):
+            await client.call_tool("root", {"number": -4})
+        history = (await client.call_tool("query_history", {})).data
+    assert history["total"] == 3
+    assert history["log"]["status"] == "degraded"
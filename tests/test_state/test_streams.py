@@ -0,0 +1,69 @@
+import math
+import random
+import statistics
+import pytest
+from src.mcp_server.state.streams import RunningMoments, StreamRegistry
+
+def _skewness(values):
+    mean = statistics.fmean(values)
+    m2 = sum((x - mean) ** 2 for x in values)
+    m3 = sum((x - mean) ** 3 for x in values)
+    return math.sqrt(len(values)) * m3 / m2 ** 1.5
+
+def _kurtosis(values):
+    mean = statistics.fmean(values)
+    m2 = sum((x - mean) ** 2 for x in values)
+    m4 = sum((x - mean) ** 4 for x in values)
+    return len(values) * m4 / (m2 * m2) - 3
+
+def test_chunked_pushes_match_whole_data():
+    rng = random.Random(3)
+    values = [rng.gauss(10, 3) ** 2 for _ in range(5000)]
+    moments = RunningMoments(higher=True)
+    for start in range(0, len(values), 777):
+        moments.push(values[start:start + 777])
+    result = moments.result()
+    assert result["count"] == 5000
+    assert result["mean"] == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert result["variance"] == pytest.approx(statistics.variance(values), rel=1e-10)
+    assert result["min_value"] == min(values) and result["max_value"] == max(values)
+    assert result["skewness"] == pytest.approx(_skewness(values), rel=1e-9)
+    assert result["kurtosis"] == pytest.approx(_kurtosis(values), rel=1e-9)
+
+def test_single_point_pushes_are_stable_with_large_offset():
+    moments = RunningMoments()
+    for value in (1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16):
+        moments.push([value])
+    assert moments.result()["variance"] == pytest.approx(30.0)
+
+def test_merge_is_order_independent():
+    left, right = RunningMoments(True), RunningMoments(True)
+    left.push([1, 2, 3, 4])
+    right.push([10, 20])
+    merged = RunningMoments(True)
+    merged.merge(left)
+    merged.merge(right)
+    expected = RunningMoments.of([1, 2, 3, 4, 10, 20], True).result()
+    for key, value in merged.result().items():
+        assert value == pytest.approx(expected[key])
+
+def test_result_edge_cases():
+    with pytest.raises(ValueError, match="empty"):
+        RunningMoments().result()
+    moments = RunningMoments(higher=True)
+    moments.push([5.0])
+    result = moments.result()
+    assert result["variance"] is None and result["stddev"] is None
+    assert result["skewness"] is None
+
+def test_registry_evicts_least_recently_used():
+    registry = StreamRegistry(max_streams=2)
+    first = registry.open()
+    second = registry.open()
+    registry.get(first.id)
+    third = registry.open()
+    assert first.id in registry and third.id in registry
+    assert second.id not in registry
+    registry.close(first.id)
+    with pytest.raises(ValueError, match="Unknown stream"):
+        registry.get(first.id)
@@ -0,0 +1,64 @@
+import pytest
+from array import array
+from src.mcp_server.state.summary_cache import SummaryCache
+
+def test_summary_computes_lazily_and_counts_hits():
+    cache = SummaryCache()
+    summary = cache.get("abc", array("d", [1, 2, 3, 4]))
+    assert cache.info()["misses"] == 0
+    assert summary.total == 10
+    assert cache.misses == 1
+    assert summary.total == 10
+    assert cache.hits == 1
+
+def test_summary_moments_and_extremes():
+    cache = SummaryCache()
+    summary = cache.get("abc", array("d", [2, 4, 4, 4, 5, 5, 7, 9]))
+    assert summary.count == 8
+    assert summary.mean == 5
+    assert summary.m2 == 32
+    assert summary.variance == pytest.approx(32 / 7)
+    assert summary.min == 2
+    assert summary.max == 9
+    assert list(summary.sorted) == [2, 4, 4, 4, 5, 5, 7, 9]
+
+def test_same_digest_returns_same_summary():
+    cache = SummaryCache()
+    first = cache.get("abc", array("d", [1, 2]))
+    assert cache.get("abc", array("d", [1, 2])) is first
+    assert len(cache) == 1
+
+def test_sorted_view_counts_towards_budget_and_evicts_lru():
+    cache = SummaryCache(max_bytes=2000)
+    old = cache.get("old", array("d", range(100)))
+    old.sorted
+    new = cache.get("new", array("d", range(150)))
+    new.sorted
+    assert len(cache) == 1
+    assert cache.get("new", new.values) is new
+    assert cache.total_bytes == new.nbytes
+
+def test_discard():
+    cache = SummaryCache()
+    cache.get("abc", array("d", [1]))
+    cache.discard("abc")
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+def test_summary_budget_counts_referenced_values():
+    cache = SummaryCache()
+    summary = cache.get("abc", array("d", range(1000)))
+    assert summary.nbytes >= 8000
+    assert cache.total_bytes == summary.nbytes
+
+def test_registry_eviction_discards_summary():
+    from src.mcp_server.state.datasets import DatasetRegistry
+    cache = SummaryCache()
+    registry = DatasetRegistry(max_bytes=1600, on_forget=cache.discard)
+    first, _ = registry.upload(range(100))
+    cache.get(first.digest, first.values).sorted
+    registry.upload(range(100, 200))
+    registry.upload(range(200, 300))
+    assert first.id not in registry
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
@@ -0,0 +1,120 @@
+import pytest
+from src.mcp_server.tools.batch_tool import batch, run_operation
+from src.mcp_server.tools.statistics_tool import DESCRIBE_STATS
+from src.mcp_server.models.schemas import BatchCalculationInput, StatisticsInput
+
+def _batch(*operations):
+    return BatchCalculationInput(operations=[{"op": op, "args": args} for op, args in operations])
+
+@pytest.mark.asyncio
+async def test_batch_mixed_operations_in_order():
+    result = await batch(_batch(
+        ("add", {"a": 1, "b": 2}),
+        ("power", {"base": 2, "exponent": 10}),
+        ("root", {"number": 27, "n": 3}),
+        ("mod", {"a": 17, "b": 5}),
+        ("factorial", {"n": 5}),
+        ("mean", {"numbers": [1, 2, 3, 4]}),
+        ("percentile", {"numbers": [1, 2, 3, 4, 5], "p": 50}),
+        ("evaluate", {"expression": "x * 2", "variables": {"x": 21}}),
+        ("add_many", {"a": [1, 2], "b": 1}),
+    ))
+    assert result["status"] == "success"
+    assert result["error_count"] == 0
+    assert [item["index"] for item in result["results"]] == list(range(9))
+    assert [item["result"] for item in result["results"]] == [
+        3, 1024, pytest.approx(3), 2, 120, 2.5, 3, 42, [2, 3]
+    ]
+
+@pytest.mark.asyncio
+async def test_batch_errors_are_reported_per_item():
+    result = await batch(_batch(
+        ("divide", {"a": 1, "b": 0}),
+        ("divide", {"a": 1, "b": 4}),
+        ("mod", {"a": 1, "b": 0}),
+        ("unknown", {}),
+        ("add", {"a": 1}),
+        ("add", {"a": 1, "b": 2, "c": 3}),
+        ("stddev", {"numbers": [1]}),
+    ))
+    assert result["status"] == "partial"
+    assert result["error_count"] == 6
+    items = result["results"]
+    assert items[0]["error"] == "Division by zero"
+    assert items[1]["result"] == 0.25
+    assert items[2]["error"] == "Divisor cannot be zero"
+    assert items[3]["error"] == "Unknown operation: unknown"
+    assert items[4]["error"] == "Missing argument: b"
+    assert "Unexpected argument" in items[5]["error"]
+    assert "at least 2" in items[6]["error"]
+
+@pytest.mark.asyncio
+async def test_batch_all_failed():
+    result = await batch(_batch(("factorial", {"n": -1})))
+    assert result["status"] == "failed"
+
+@pytest.mark.asyncio
+async def test_batch_rejects_non_numeric_arguments():
+    with pytest.raises(ValueError, match="must be a number"):
+        await run_operation("add", {"a": "1", "b": 2})
+    with pytest.raises(ValueError, match="only numbers"):
+        await run_operation("mean", {"numbers": [1, "x"]})
+    with pytest.raises(ValueError, match="must not be empty"):
+        await run_operation("mean", {"numbers": []})
+
+@pytest.mark.asyncio
+async def test_batch_root_uses_degree_argument():
+    assert await run_operation("root", {"number": 16}) == 4
+    assert await run_operation("root", {"number": 8, "n": 3}) == pytest.approx(2)
+    with pytest.raises(ValueError, match="even root"):
+        await run_operation("root", {"number": -4})
+
+@pytest.mark.asyncio
+async def test_batch_describe_and_stored_datasets():
+    def resolve(dataset_id):
+        assert dataset_id == "abc"
+        return StatisticsInput.model_construct(data=[1.0, 2.0, 3.0]), None
+
+    result = await run_operation("describe", {"numbers": [1, 2, 3]})
+    assert set(result) == set(DESCRIBE_STATS)
+    assert await run_operation("median", {"dataset_id": "abc"}, resolve) == 2
+    with pytest.raises(ValueError, match="not available"):
+        await run_operation("median", {"dataset_id": "abc"})
+    with pytest.raises(ValueError, match="not both"):
+        await run_operation("median", {"dataset_id": "abc", "numbers": [1]}, resolve)
+
+@pytest.mark.asyncio
+async def test_batch_finance_operations():
+    assert await run_operation("pmt", {"rate": 0.075 / 12, "nper": 180, "pv": 200000}) == pytest.approx(-1854.02472)
+    assert await run_operation("npv", {"rate": 0, "cashflows": [-100, 60, 60]}) == 20
+    assert await run_operation("irr", {"cashflows": [-100, 110]}) == pytest.approx(0.1)
+    with pytest.raises(ValueError, match="when"):
+        await run_operation("fv", {"rate": 0.01, "nper": 12, "pmt": -100, "when": "middle"})
+    with pytest.raises(ValueError, match="greater than -1"):
+        await run_operation("npv", {"rate": -1, "cashflows": [1]})
+
+@pytest.mark.asyncio
+async def test_batch_convert():
+    assert await run_operation("convert", {"value": 1, "from_unit": "mi", "to_unit": "km"}) == pytest.approx(1.609344)
+    assert await run_operation("convert", {"value": [0, 100], "from_unit": "C", "to_unit": "F"}) == pytest.approx([32, 212])
+    with pytest.raises(ValueError, match="Missing argument: to_unit"):
+        await run_operation("convert", {"value": 1, "from_unit": "mi"})
+
+def test_batch_requires_operations():
+    with pytest.raises(ValueError):
+        BatchCalculationInput(operations=[])
+
+@pytest.mark.asyncio
+async def test_batch_malformed_items_fail_alone():
+    result = await batch(_batch(
+        ("describe", {"numbers": [1, 2, 3], "stats": 5}),
+        ("evaluate", {"expression": "+".join(["1"] * 50000)}),
+        ("evaluate", {"expression": "(" * 5000 + "1" + ")" * 5000}),
+        ("add", {"a": 1, "b": 2}),
+    ))
+    assert result["status"] == "partial"
+    errors = [item.get("error") for item in result["results"]]
+    assert "list of statistic names" in errors[0]
+    assert "too long" in errors[1]
+    assert "too long" in errors[2]
+    assert result["results"][3]["result"] == 3
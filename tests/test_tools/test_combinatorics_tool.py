@@ -0,0 +1,72 @@
+import math
+import pytest
+from src.mcp_server.tools import combinatorics_tool
+from src.mcp_server.tools.combinatorics_tool import (
+    permutations, combinations, log_combinations, log_comb, log_perm, comb, perm,
+    FactorialTable, LogFactorialTable
+)
+from src.mcp_server.models.schemas import CombinatoricsInput
+
+@pytest.mark.asyncio
+async def test_permutations_and_combinations():
+    assert await permutations(CombinatoricsInput(n=10, r=3)) == 720
+    assert await combinations(CombinatoricsInput(n=12, r=5)) == 792
+    assert await combinations(CombinatoricsInput(n=5, r=0)) == 1
+    assert await combinations(CombinatoricsInput(n=5, r=5)) == 1
+
+@pytest.mark.parametrize("n,r", [(200, 100), (1000, 500), (3000, 1400), (100, 70), (50, 3)])
+def test_exact_matches_math(n, r):
+    assert comb(n, r) == math.comb(n, r)
+    assert perm(n, r) == math.perm(n, r)
+
+@pytest.mark.parametrize("n,r", [(10, 3), (1000, 500), (5000, 12), (100000, 40000)])
+def test_log_values_match_exact(n, r):
+    assert log_comb(n, r) == pytest.approx(math.log(math.comb(n, r)), rel=1e-12)
+    assert log_perm(n, r) == pytest.approx(math.log(math.perm(n, r)), rel=1e-12)
+
+@pytest.mark.asyncio
+async def test_log_comb_for_huge_n():
+    result = await log_combinations(CombinatoricsInput(n=10**6, r=500000))
+    # Stirling 近似: ln C(2m, m) ≈ 2m ln 2 - ln(pi m)/2
+    assert result == pytest.approx(10**6 * math.log(2) - 0.5 * math.log(math.pi * 500000), rel=1e-10)
+    assert await log_combinations(CombinatoricsInput(n=10**9, r=3)) == pytest.approx(
+        math.log(10**9 * (10**9 - 1) * (10**9 - 2) / 6), rel=1e-12
+    )
+
+@pytest.mark.asyncio
+async def test_large_results_switch_to_summary():
+    result = await combinations(CombinatoricsInput(n=10**6, r=500000))
+    assert result["digits"] == 301027
+    assert result["scientific"].startswith("7.8")
+    with pytest.raises(ValueError, match="use output='summary'"):
+        await combinations(CombinatoricsInput(n=10**6, r=500000, output="exact"))
+    summary = await permutations(CombinatoricsInput(n=10, r=3, output="summary"))
+    assert summary["digits"] == 3
+    assert summary["log10"] == pytest.approx(math.log10(720))
+
+def test_factorial_table_respects_budget():
+    table = FactorialTable(max_bytes=1000)
+    assert table.get(10) == math.factorial(10)
+    assert table.get(10000) is None
+    assert table.nbytes <= 1000
+    # 超出预算时回退到 math.comb
+    assert len(table) < 10000
+
+def test_log_factorial_table_grows_lazily():
+    table = LogFactorialTable(size=1000)
+    assert len(table) == 1
+    assert table.get(10) == pytest.approx(math.log(math.factorial(10)))
+    assert 11 <= len(table) <= 1000
+    assert table.get(5000) == pytest.approx(math.lgamma(5001))
+    assert len(table) <= 1000
+
+def test_comb_falls_back_when_cache_is_full(monkeypatch):
+    monkeypatch.setattr(combinatorics_tool, "factorials", FactorialTable(max_bytes=0))
+    assert comb(500, 250) == math.comb(500, 250)
+    assert perm(500, 250) == math.perm(500, 250)
+
+def test_r_greater_than_n_rejected():
+    with pytest.raises(ValueError):
+        CombinatoricsInput(n=3, r=4)
+    with pytest.raises(ValueError):
+        log_comb(3, 4)
@@ -0,0 +1,113 @@
+import pytest
+from src.mcp_server.tools.convert_tool import convert, units, UnitRegistry
+from src.mcp_server.models.schemas import ConvertInput
+
+@pytest.mark.parametrize("value,from_unit,to_unit,expected", [
+    (1, "mi", "km", 1.609344),
+    (1, "km", "mi", 0.621371192),
+    (12, "in", "ft", 1),
+    (1, "yd", "cm", 91.44),
+    (1, "kg", "lb", 2.20462262),
+    (1, "lb", "oz", 16),
+    (60, "mph", "km/h", 96.56064),
+    (10, "m/s", "km/h", 36),
+    (1, "knot", "m/s", 0.514444444),
+    (1, "gallon", "liters", 3.785411784),
+    (1, "cup", "tbsp", 16),
+    (1, "ft3", "in3", 1728),
+])
+@pytest.mark.asyncio
+async def test_convert_linear_units(value, from_unit, to_unit, expected):
+    result = await convert(ConvertInput(value=value, from_unit=from_unit, to_unit=to_unit))
+    assert result == pytest.approx(expected)
+
+@pytest.mark.asyncio
+async def test_convert_temperature():
+    assert await convert(ConvertInput(value=100, from_unit="celsius", to_unit="fahrenheit")) == pytest.approx(212)
+    assert await convert(ConvertInput(value=98.6, from_unit="F", to_unit="C")) == pytest.approx(37)
+    assert await convert(ConvertInput(value=0, from_unit="K", to_unit="F")) == pytest.approx(-459.67)
+    assert await convert(ConvertInput(value=[0, 100], from_unit="C", to_unit="K")) == pytest.approx([273.15, 373.15])
+    with pytest.raises(ValueError, match="absolute zero"):
+        await convert(ConvertInput(value=-300, from_unit="C", to_unit="F"))
+
+@pytest.mark.asyncio
+async def test_convert_list_and_round_trip():
+    values = [0.5, 1.0, 42.0]
+    inches = await convert(ConvertInput(value=values, from_unit="m", to_unit="in"))
+    back = await convert(ConvertInput(value=inches, from_unit="in", to_unit="m"))
+    assert back == pytest.approx(values)
+
+@pytest.mark.asyncio
+async def test_convert_errors():
+    with pytest.raises(ValueError, match="Unknown unit: parsec"):
+        await convert(ConvertInput(value=1, from_unit="parsec", to_unit="m"))
+    with pytest.raises(ValueError, match="Cannot convert length"):
+        await convert(ConvertInput(value=1, from_unit="km", to_unit="kg"))
+    with pytest.raises(ValueError):
+        ConvertInput(value=[], from_unit="m", to_unit="km")
+
+def test_registry_precomputes_every_pair():
+    assert units.conversion("mi", "in") == (63360.0, 0.0, False)
+    scale, offset, _ = units.conversion("F", "C")
+    assert scale == pytest.approx(5 / 9) and offset == pytest.approx(-160 / 9)
+    assert units.resolve("Kilometres") == "km"
+
+@pytest.mark.parametrize("value,from_unit,to_unit,expected", [
+    (25.4, "mm", "in", 1.0),
+    (254, "mm", "in", 10.0),
+    (1, "ft", "m", 0.3048),
+    (3.048, "m", "ft", 10.0),
+    (98.6, "F", "C", 37.0),
+])
+def test_round_numbers_convert_exactly(value, from_unit, to_unit, expected):
+    # 比例保持为精确分数，不引入舍入后的系数误差
+    assert units.convert(value, from_unit, to_unit) == expected
+    assert units.convert([value] * 3, from_unit, to_unit) == [expected] * 3
+
+def test_registry_rejects_disconnected_units():
+    with pytest.raises(ValueError, match="not connected"):
+        UnitRegistry({"length": [("m", 1, None), ("ft", 12, "in")]}, {}, {})
+
+@pytest.mark.parametrize("value,from_unit,to_unit,expected", [
+    (1, "kg*m/s^2", "N", 1),
+    (1, "kN", "N", 1000),
+    (1, "kn", "km/h", 1.852),
+    (36, "km/h", "m/s", 10),
+    (1, "kWh", "MJ", 3.6),
+    (1, "N m", "J", 1),
+    (1, "g/cm^3", "kg/m3", 1000),
+    (1, "psi", "kPa", 6.894757293),
+    (4184, "J/(kg*K)", "cal/(g·C)", 1),
+    (1, "s^-1", "1/min", 60),
+])
+@pytest.mark.asyncio
+async def test_convert_compound_units(value, from_unit, to_unit, expected):
+    result = await convert(ConvertInput(value=value, from_unit=from_unit, to_unit=to_unit))
+    assert result == pytest.approx(expected)
+
+@pytest.mark.asyncio
+async def test_convert_fuel_economy_reciprocal():
+    result = await convert(ConvertInput(value=[30, 50], from_unit="mi/gal", to_unit="L/100km"))
+    assert result == pytest.approx([7.8404861, 4.7042917])
+    back = await convert(ConvertInput(value=result, from_unit="L/100km", to_unit="mi/gal"))
+    assert back == pytest.approx([30, 50])
+    with pytest.raises(ValueError, match="Cannot convert 0"):
+        await convert(ConvertInput(value=0, from_unit="mi/gal", to_unit="L/100km"))
+
+@pytest.mark.asyncio
+async def test_convert_compound_errors():
+    with pytest.raises(ValueError, match=r"Cannot convert force \(kg\*m/s\^2\) to energy"):
+        await convert(ConvertInput(value=1, from_unit="kg*m/s^2", to_unit="J"))
+    with pytest.raises(ValueError, match=r"m\^2·kg·s\^-2·K\^-1"):
+        await convert(ConvertInput(value=1, from_unit="J/K", to_unit="m"))
+    with pytest.raises(ValueError, match="Unbalanced"):
+        await convert(ConvertInput(value=1, from_unit="(m/s", to_unit="km/h"))
+    with pytest.raises(ValueError, match="integer"):
+        await convert(ConvertInput(value=1, from_unit="m^x", to_unit="m"))
+
+def test_parsed_units_are_interned():
+    unit = units.parse("kg*m/s^2")
+    assert units.parse("kg*m/s^2") is unit
+    assert unit.factor == 1 and unit.dims == (1, 1, -2, 0)
+    assert units.parse("L/100km").dims == (2, 0, 0, 0)
+    assert units.conversion("mi/h", "km/h") is units.conversion("mi/h", "km/h")
@@ -0,0 +1,41 @@
+import pytest
+from src.mcp_server.tools.dataset_tool import upload_dataset, append_dataset, drop_dataset
+from src.mcp_server.tools.statistics_tool import mean, median
+from src.mcp_server.models.schemas import (
+    DatasetUploadInput, DatasetAppendInput, DatasetRefInput, StatisticsInput
+)
+from src.mcp_server.state.datasets import DatasetRegistry
+
+@pytest.mark.asyncio
+async def test_upload_and_use_dataset():
+    registry = DatasetRegistry()
+    info = await upload_dataset(DatasetUploadInput(numbers=[1, 2, 3, 4]), registry)
+    assert info["count"] == 4
+    assert info["deduplicated"] is False
+    values = registry.get(info["dataset_id"]).values
+    input_data = StatisticsInput.model_construct(data=values)
+    assert await mean(input_data) == 2.5
+    assert await median(input_data) == 2.5
+
+@pytest.mark.asyncio
+async def test_append_dataset():
+    registry = DatasetRegistry()
+    info = await upload_dataset(DatasetUploadInput(numbers=[1, 2]), registry)
+    appended = await append_dataset(
+        DatasetAppendInput(dataset_id=info["dataset_id"], numbers=[3]), registry
+    )
+    assert appended["dataset_id"] == info["dataset_id"]
+    assert appended["count"] == 3
+
+@pytest.mark.asyncio
+async def test_drop_dataset():
+    registry = DatasetRegistry()
+    info = await upload_dataset(DatasetUploadInput(numbers=[1, 2]), registry)
+    result = await drop_dataset(DatasetRefInput(dataset_id=info["dataset_id"]), registry)
+    assert result["status"] == "dropped"
+    with pytest.raises(ValueError, match="Unknown dataset"):
+        await drop_dataset(DatasetRefInput(dataset_id=info["dataset_id"]), registry)
+
+def test_upload_requires_data():
+    with pytest.raises(ValueError):
+        DatasetUploadInput(numbers=[])
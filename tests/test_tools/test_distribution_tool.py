@@ -0,0 +1,92 @@
+import math
+import pytest
+from statistics import NormalDist
+from src.mcp_server.tools.distribution_tool import (
+    binomial_pmf, binomial_cdf, poisson_pmf, normal_cdf, normal_ppf,
+    binomial_pmf_values, binomial_cdf_values
+)
+from src.mcp_server.models.schemas import BinomialInput, PoissonInput, NormalInput, NormalPpfInput
+
+def _exact_pmf(n, p, k):
+    return math.comb(n, k) * p ** k * (1 - p) ** (n - k)
+
+@pytest.mark.asyncio
+async def test_binomial_pmf_scalar_and_list():
+    assert await binomial_pmf(BinomialInput(n=20, p=0.8, k=15)) == pytest.approx(_exact_pmf(20, 0.8, 15))
+    result = await binomial_pmf(BinomialInput(n=10, p=0.3, k=list(range(11))))
+    assert result == pytest.approx([_exact_pmf(10, 0.3, k) for k in range(11)])
+    assert math.fsum(result) == pytest.approx(1.0)
+
+def test_binomial_pmf_sparse_points_and_out_of_support():
+    ks = [0, 500, 999, -1, 1001]
+    result = binomial_pmf_values(1000, 0.5, ks)
+    assert result[:3] == pytest.approx([_exact_pmf(1000, 0.5, k) for k in ks[:3]], rel=1e-9)
+    assert result[3:] == [0.0, 0.0]
+
+def test_binomial_pmf_edge_probabilities():
+    assert binomial_pmf_values(5, 0.0, [0, 1]) == [1.0, 0.0]
+    assert binomial_pmf_values(5, 1.0, [4, 5]) == [0.0, 1.0]
+
+@pytest.mark.asyncio
+async def test_binomial_large_n_stays_finite():
+    n = 10 ** 6
+    result = await binomial_pmf(BinomialInput(n=n, p=0.5, k=[n // 2, n // 2 + 1000]))
+    # 正态近似: 1 / sqrt(2 pi n p q)
+    assert result[0] == pytest.approx(1 / math.sqrt(2 * math.pi * n * 0.25), rel=1e-5)
+    assert 0 < result[1] < result[0]
+
+@pytest.mark.asyncio
+async def test_binomial_cdf():
+    ks = list(range(-1, 12))
+    result = await binomial_cdf(BinomialInput(n=10, p=0.3, k=ks))
+    expected = [math.fsum(_exact_pmf(10, 0.3, j) for j in range(k + 1)) for k in ks]
+    assert result == pytest.approx(expected)
+    assert result[0] == 0.0 and result[-1] == 1.0
+
+def test_binomial_cdf_large_n_tails():
+    n = 10 ** 5
+    low, mid, high = binomial_cdf_values(n, 0.5, [1000, n // 2, n - 1000])
+    assert low == 0.0
+    assert mid == pytest.approx(0.5, abs=0.01)
+    assert high == 1.0
+
+@pytest.mark.parametrize("n, p", [(1000, 0.999), (1000, 0.001), (5000, 0.5), (200, 0.9999)])
+def test_binomial_cdf_never_below_pmf(n, p):
+    # 偏斜分布的长尾也在窗口内，CDF 单调且不小于 PMF
+    ks = list(range(n + 1))
+    pmf = binomial_pmf_values(n, p, ks)
+    cdf = binomial_cdf_values(n, p, ks)
+    assert all(c >= q for c, q in zip(cdf, pmf))
+    assert all(a <= b for a, b in zip(cdf, cdf[1:]))
+    assert cdf[-1] == 1.0
+
+@pytest.mark.asyncio
+async def test_poisson_pmf():
+    result = await poisson_pmf(PoissonInput(lam=3.5, k=[0, 1, 5, -1]))
+    expected = [math.exp(-3.5) * 3.5 ** k / math.factorial(k) for k in (0, 1, 5)]
+    assert result[:3] == pytest.approx(expected)
+    assert result[3] == 0.0
+    # 大 lam 时不会溢出
+    assert await poisson_pmf(PoissonInput(lam=1e6, k=10 ** 6)) == pytest.approx(
+        1 / math.sqrt(2 * math.pi * 1e6), rel=1e-4
+    )
+
+@pytest.mark.asyncio
+async def test_normal_cdf_and_ppf():
+    assert await normal_cdf(NormalInput(x=0)) == pytest.approx(0.5)
+    result = await normal_cdf(NormalInput(x=[90, 100, 110], mean=100, std=10))
+    assert result == pytest.approx([NormalDist(100, 10).cdf(x) for x in (90, 100, 110)])
+    assert await normal_ppf(NormalPpfInput(q=0.975)) == pytest.approx(1.959964, abs=1e-6)
+    assert await normal_ppf(NormalPpfInput(q=[0.5], mean=5, std=2)) == pytest.approx([5.0])
+    with pytest.raises(ValueError, match="strictly between 0 and 1"):
+        await normal_ppf(NormalPpfInput(q=[0.5, 1.0]))
+
+def test_input_validation():
+    with pytest.raises(ValueError):
+        BinomialInput(n=10, p=1.5, k=3)
+    with pytest.raises(ValueError):
+        BinomialInput(n=10, p=0.5, k=[])
+    with pytest.raises(ValueError):
+        PoissonInput(lam=0, k=1)
+    with pytest.raises(ValueError):
+        NormalInput(x=1, std=0)
@@ -0,0 +1,98 @@
+import pytest
+from src.mcp_server.tools import elementwise_tool
+from src.mcp_server.tools.elementwise_tool import (
+    add_many, subtract_many, multiply_many, divide_many, power_many, root_many
+)
+from src.mcp_server.tools.root_tool import root
+from src.mcp_server.models.schemas import ElementwiseInput, RootInput
+
+@pytest.mark.asyncio
+async def test_add_many_lists():
+    result = await add_many(ElementwiseInput(a=[1, 2, 3], b=[10, 20, 30]))
+    assert result == [11, 22, 33]
+
+@pytest.mark.asyncio
+async def test_broadcast_scalar_and_single_element():
+    assert await multiply_many(ElementwiseInput(a=[1, 2, 3], b=1.5)) == [1.5, 3.0, 4.5]
+    assert await subtract_many(ElementwiseInput(a=10, b=[1, 2])) == [9, 8]
+    assert await add_many(ElementwiseInput(a=[100], b=[1, 2])) == [101, 102]
+
+@pytest.mark.asyncio
+async def test_length_mismatch_raises():
+    with pytest.raises(ValueError, match="different lengths"):
+        await add_many(ElementwiseInput(a=[1, 2, 3], b=[1, 2]))
+
+@pytest.mark.asyncio
+async def test_divide_many_error_mask():
+    result = await divide_many(ElementwiseInput(a=[10, 5, 3], b=[2, 0, 4]))
+    assert result["result"] == [5, None, 0.75]
+    assert result["errors"] == [False, True, False]
+    assert result["error_count"] == 1
+    assert result["error"] == "Division by zero"
+    assert result["status"] == "partial"
+
+@pytest.mark.asyncio
+async def test_divide_many_success():
+    result = await divide_many(ElementwiseInput(a=[1, 2], b=4))
+    assert result["result"] == [0.25, 0.5]
+    assert result["status"] == "success"
+    assert result["error"] is None
+
+@pytest.mark.asyncio
+async def test_power_many():
+    assert await power_many(ElementwiseInput(a=[2, 3, 4], b=2)) == [4, 9, 16]
+    with pytest.raises(ValueError):
+        await power_many(ElementwiseInput(a=[-8], b=[0.5]))
+
+@pytest.mark.asyncio
+async def test_root_many():
+    result = await root_many(ElementwiseInput(a=[16, 27, -8], b=[2, 3, 3]))
+    assert result == pytest.approx([4, 3, -2])
+    with pytest.raises(ValueError, match="even root of negative number"):
+        await root_many(ElementwiseInput(a=[4, -4], b=2))
+
+def test_empty_operand_rejected():
+    with pytest.raises(ValueError):
+        ElementwiseInput(a=[], b=1)
+
+@pytest.mark.asyncio
+async def test_numpy_path_matches_python(monkeypatch):
+    pytest.importorskip("numpy")
+    a = [float(i) for i in range(1, 1001)]
+    b = [float(i % 7) for i in range(1000)]
+    monkeypatch.setattr(elementwise_tool, "NUMPY_MIN_SIZE", 10 ** 9)
+    expected = await divide_many(ElementwiseInput(a=a, b=b))
+    expected_root = await root_many(ElementwiseInput(a=a, b=3))
+    monkeypatch.setattr(elementwise_tool, "NUMPY_MIN_SIZE", 1)
+    assert await divide_many(ElementwiseInput(a=a, b=b)) == expected
+    assert await root_many(ElementwiseInput(a=a, b=3)) == pytest.approx(expected_root)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("numpy_min_size", [10 ** 9, 1])
+async def test_root_errors_match_scalar_batch_and_evaluate(monkeypatch, numpy_min_size):
+    from src.mcp_server.tools.batch_tool import run_operation
+    from src.mcp_server.tools.evaluate_tool import evaluate_expression
+    from src.mcp_server.tools.root_tool import root_value
+    if numpy_min_size == 1:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(elementwise_tool, "NUMPY_MIN_SIZE", numpy_min_size)
+    for number, degree in ((-4, 2), (4, 0), (-8, 2.5)):
+        with pytest.raises(ValueError) as scalar:
+            root_value(number, degree)
+        with pytest.raises(ValueError, match=str(scalar.value)):
+            await root_many(ElementwiseInput(a=[1, number], b=degree))
+        with pytest.raises(ValueError, match=str(scalar.value)):
+            await run_operation("root", {"number": number, "n": degree})
+        with pytest.raises(ValueError, match=str(scalar.value)):
+            evaluate_expression(f"root({number}, {degree})")
+
+@pytest.mark.asyncio
+async def test_root_negative_with_fractional_degree_matches_at_numpy_size():
+    pytest.importorskip("numpy")
+    size = elementwise_tool.NUMPY_MIN_SIZE
+    with pytest.raises(ValueError) as scalar:
+        await root(RootInput(number=-8, degree=2.5))
+    for numbers in ([-8.0] * size, [-8.0] * (size - 1)):
+        with pytest.raises(ValueError, match=str(scalar.value)):
+            await root_many(ElementwiseInput(a=numbers, b=2.5))
+    assert await root_many(ElementwiseInput(a=[-8.0] * size, b=3)) == pytest.approx([-2.0] * size)
@@ -0,0 +1,66 @@
+import math
+import pytest
+from src.mcp_server.tools.evaluate_tool import evaluate, evaluate_expression, compile_expression
+from src.mcp_server.models.schemas import EvaluateInput
+
+@pytest.mark.asyncio
+async def test_evaluate_arithmetic():
+    input_data = EvaluateInput(expression="(5 + 3) * 2 ** 3")
+    assert await evaluate(input_data) == 64
+
+@pytest.mark.asyncio
+async def test_evaluate_with_variables():
+    input_data = EvaluateInput(
+        expression="P * power(1 + r, t)",
+        variables={"P": 10000, "r": 0.05, "t": 3}
+    )
+    assert await evaluate(input_data) == pytest.approx(11576.25)
+
+@pytest.mark.parametrize("expression,expected", [
+    ("root(27, 3)", 3.0),
+    ("root(-8, 3)", -2.0),
+    ("sqrt(16)", 4.0),
+    ("mod(17, 5)", 2.0),
+    ("17 % 5", 2.0),
+    ("factorial(5) / factorial(3)", 20.0),
+    ("2 ^ 10", 1024.0),
+    ("-3 + +2", -1.0),
+    ("max(1, 7, 3) - min(4, 2)", 5.0),
+    ("divide(10, 4)", 2.5),
+    ("2 * pi", 2 * math.pi),
+])
+def test_evaluate_functions(expression, expected):
+    assert evaluate_expression(expression) == pytest.approx(expected)
+
+def test_loan_payment_formula():
+    formula = "P * (r * power(1 + r, n)) / (power(1 + r, n) - 1)"
+    payment = evaluate_expression(formula, {"P": 250000, "r": 0.045 / 12, "n": 360})
+    assert payment == pytest.approx(1266.71, abs=0.01)
+
+def test_compiled_expression_is_cached():
+    compile_expression.cache_clear()
+    evaluate_expression("a + b", {"a": 1, "b": 2})
+    evaluate_expression("a + b", {"a": 3, "b": 4})
+    info = compile_expression.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+@pytest.mark.parametrize("expression,message", [
+    ("1 / 0", "Division by zero"),
+    ("mod(5, 0)", "Divisor cannot be zero"),
+    ("root(-4, 2)", "Cannot calculate even root of negative number"),
+    ("factorial(2.5)", "non-negative integer"),
+    ("x + 1", "Unknown variable"),
+    ("__import__('os')", "Unsupported function"),
+    ("(1).real", "Unsupported expression element"),
+    ("'a' + 'b'", "Unsupported constant"),
+    ("1 +", "Invalid expression"),
+    ("10 ** 400", "Result too large"),
+])
+def test_evaluate_rejects_invalid(expression, message):
+    with pytest.raises(ValueError, match=message):
+        evaluate_expression(expression)
+
+def test_evaluate_input_validation():
+    with pytest.raises(ValueError):
+        EvaluateInput(expression="")
@@ -1,7 +1,9 @@
+import math
 import pytest
-from src.mcp_server.tools.factorial_tool import factorial
+from src.mcp_server.tools import factorial_tool
+from src.mcp_server.tools.factorial_tool import factorial, summarize
 from src.mcp_server.models.schemas import FactorialInput
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, call
 
 @pytest.mark.asyncio
 async def test_factorial_small():
@@ -31,8 +33,8 @@ async def test_factorial_large_with_progress():
     ctx = AsyncMock()
     result = await factorial(input_data, ctx)
     assert result == 1307674368000
-    # Should report progress for n > 10
-    assert ctx.report_progress.call_count == 15
+    # Progress is reported once the result is ready, not on every multiplication
+    ctx.report_progress.assert_called_once_with(15, 15)
 
 @pytest.mark.asyncio
 async def test_factorial_validation_negative():
@@ -42,9 +44,10 @@ async def test_factorial_validation_negative():
 
 @pytest.mark.asyncio
 async def test_factorial_validation_too_large():
-    # Test that numbers > 20 are rejected
+    # Test that numbers above the engine limit are rejected
+    FactorialInput(n=500_000)
     with pytest.raises(ValueError):
-        FactorialInput(n=21)
+        FactorialInput(n=500_001)
 
 @pytest.mark.parametrize("n,expected", [
     (2, 2),
@@ -57,4 +60,56 @@ async def test_factorial_values(n, expected):
     input_data = FactorialInput(n=n)
     ctx = AsyncMock()
     result = await factorial(input_data, ctx)
-    assert result == expected
\ No newline at end of file
+    assert result == expected
+
+def test_summarize_matches_decimal_representation():
+    for n in (0, 5, 25, 100, 999):
+        text = str(math.factorial(n))
+        summary = summarize(math.factorial(n), n)
+        stripped = text.rstrip("0")
+        assert summary["digits"] == len(text)
+        assert summary["leading_digits"] == text[:20]
+        assert summary["trailing_zeros"] == len(text) - len(stripped)
+        assert summary["trailing_digits"] == stripped[-20:]
+        assert summary["log10"] == pytest.approx(math.log10(math.factorial(n)) if n else 0.0)
+
+def test_summarize_large_value():
+    summary = summarize(math.factorial(3000), 3000)
+    assert summary["digits"] == 9131
+    assert summary["leading_digits"] == "41493596034378540855"
+    assert summary["trailing_zeros"] == 748
+
+@pytest.mark.asyncio
+async def test_factorial_auto_switches_to_summary():
+    ctx = AsyncMock()
+    exact = await factorial(FactorialInput(n=100), ctx)
+    assert exact == math.factorial(100)
+    summary = await factorial(FactorialInput(n=5000), ctx)
+    assert summary["digits"] == 16326
+    assert summary["trailing_zeros"] == 1249
+
+@pytest.mark.asyncio
+async def test_factorial_summary_output_for_small_n():
+    result = await factorial(FactorialInput(n=10, output="summary"), None)
+    assert result == {
+        "n": 10, "digits": 7, "log10": pytest.approx(math.log10(3628800)),
+        "leading_digits": "3628800", "trailing_zeros": 2, "trailing_digits": "36288"
+    }
+
+@pytest.mark.asyncio
+async def test_factorial_exact_too_large_raises():
+    with pytest.raises(ValueError, match="use output='summary'"):
+        await factorial(FactorialInput(n=5000, output="exact"), None)
+
+@pytest.mark.asyncio
+async def test_factorial_summary_in_worker_process(monkeypatch):
+    monkeypatch.setattr(factorial_tool, "PROCESS_THRESHOLD", 1000)
+    monkeypatch.setattr(factorial_tool.process_pool, "PROGRESS_INTERVAL", 0)
+    ctx = AsyncMock()
+    try:
+        result = await factorial(FactorialInput(n=3000, output="summary"), ctx)
+    finally:
+        factorial_tool.process_pool.shutdown()
+    assert result == summarize(math.factorial(3000), 3000)
+    # 不限频率时每个阶段完成后都报告一次
+    assert ctx.report_progress.call_args_list == [call(1, 3), call(2, 3), call(3, 3)]
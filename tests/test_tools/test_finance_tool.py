@@ -0,0 +1,100 @@
+import math
+import random
+import pytest
+from datetime import date
+from src.mcp_server.tools import finance_tool
+from src.mcp_server.tools.finance_tool import npv, irr, xirr, pmt, fv, pv, nper, npv_value
+from src.mcp_server.models.schemas import (
+    NpvInput, IrrInput, XirrInput, PmtInput, FvInput, PvInput, NperInput
+)
+
+CASHFLOWS = [-100, 39, 59, 55, 20]
+
+@pytest.mark.asyncio
+async def test_npv_single_and_batch():
+    assert await npv(NpvInput(rate=0.281, cashflows=CASHFLOWS)) == pytest.approx(-0.0084785916, abs=1e-9)
+    assert await npv(NpvInput(rate=0.0, cashflows=[[1, 2], [3]])) == [3.0, 3.0]
+    expected = math.fsum(c / 1.05 ** t for t, c in enumerate(CASHFLOWS))
+    assert npv_value(0.05, CASHFLOWS) == pytest.approx(expected)
+
+@pytest.mark.asyncio
+async def test_irr_known_values():
+    assert await irr(IrrInput(cashflows=CASHFLOWS)) == pytest.approx(0.2809484211599611)
+    assert await irr(IrrInput(cashflows=[-100, 0, 0, 74])) == pytest.approx(-0.0954958304)
+    rate = await irr(IrrInput(cashflows=[-5, 10.5, 1, -8, 1]))
+    assert rate == pytest.approx(0.0886, abs=1e-4)
+    assert npv_value(rate, [-5, 10.5, 1, -8, 1]) == pytest.approx(0.0, abs=1e-12)
+
+@pytest.mark.asyncio
+async def test_irr_falls_back_to_bracketing(monkeypatch):
+    monkeypatch.setattr(finance_tool, "_newton", lambda func, guess: None)
+    assert await irr(IrrInput(cashflows=CASHFLOWS)) == pytest.approx(0.2809484211599611, abs=1e-9)
+    # 两个根时取离 guess 最近的那个
+    rate = await irr(IrrInput(cashflows=[-1000] + [100] * 10 + [-5]))
+    assert -0.01 < rate < 0
+    assert npv_value(rate, [-1000] + [100] * 10 + [-5]) == pytest.approx(0.0, abs=1e-6)
+
+@pytest.mark.asyncio
+async def test_irr_batch_with_missing_roots():
+    rng = random.Random(0)
+    portfolios = [[-rng.uniform(50, 150)] + [rng.uniform(5, 40) for _ in range(10)] for _ in range(200)]
+    portfolios.append([100, 50])
+    rates = await irr(IrrInput(cashflows=portfolios))
+    assert len(rates) == 201
+    assert rates[-1] is None
+    for series, rate in zip(portfolios, rates[:-1]):
+        assert npv_value(rate, series) == pytest.approx(0.0, abs=1e-7)
+
+@pytest.mark.asyncio
+async def test_irr_requires_sign_change():
+    with pytest.raises(ValueError, match="positive and one negative"):
+        await irr(IrrInput(cashflows=[100, 50]))
+    with pytest.raises(ValueError):
+        IrrInput(cashflows=[])
+    with pytest.raises(ValueError):
+        IrrInput(cashflows=[[1, -1], []])
+
+@pytest.mark.asyncio
+async def test_xirr():
+    dates = ["2008-01-01", "2008-03-01", "2008-10-30", "2009-02-15", "2009-04-01"]
+    cashflows = [-10000, 2750, 4250, 3250, 2750]
+    assert await xirr(XirrInput(cashflows=cashflows, dates=dates)) == pytest.approx(0.373362535, abs=1e-8)
+    batch = await xirr(XirrInput(cashflows=[cashflows, [-100, 110]], dates=[dates, ["2020-01-01", "2021-01-01"]]))
+    assert batch[0] == pytest.approx(0.373362535, abs=1e-8)
+    assert batch[1] == pytest.approx(0.1, abs=1e-3)
+    with pytest.raises(ValueError, match="same length"):
+        await xirr(XirrInput(cashflows=[-1, 2], dates=[date(2020, 1, 1)]))
+
+@pytest.mark.asyncio
+async def test_annuity_functions():
+    assert await pmt(PmtInput(rate=0.075 / 12, nper=180, pv=200000)) == pytest.approx(-1854.0247200054619)
+    assert await fv(FvInput(rate=0.05 / 12, nper=120, pmt=-100, pv=-100)) == pytest.approx(15692.928894335748)
+    assert await pv(PvInput(rate=0.05 / 12, nper=120, pmt=-100, fv=15692.93)) == pytest.approx(-100.00067131625819)
+    assert await nper(NperInput(rate=0.07 / 12, pmt=-150, pv=8000)) == pytest.approx(64.07334877066185)
+
+@pytest.mark.asyncio
+async def test_annuity_functions_round_trip_and_zero_rate():
+    payment = await pmt(PmtInput(rate=0.01, nper=24, pv=5000, fv=-1000, when="begin"))
+    assert await nper(NperInput(rate=0.01, pmt=payment, pv=5000, fv=-1000, when="begin")) == pytest.approx(24)
+    assert await fv(FvInput(rate=0.01, nper=24, pmt=payment, pv=5000, when="begin")) == pytest.approx(-1000)
+    assert await pmt(PmtInput(rate=0, nper=10, pv=1000)) == -100
+    assert await nper(NperInput(rate=0, pmt=-100, pv=1000)) == 10
+    with pytest.raises(ValueError, match="never reach"):
+        await nper(NperInput(rate=0.1, pmt=-50, pv=1000))
+
+@pytest.mark.asyncio
+async def test_nper_payment_that_never_amortizes():
+    with pytest.raises(ValueError, match="never amortizes"):
+        await nper(NperInput(rate=0.1, pmt=-10, pv=100))
+    # 还款不足以支付利息时比值为负
+    with pytest.raises(ValueError, match="never reach"):
+        await nper(NperInput(rate=0.1, pmt=-5, pv=100))
+
+@pytest.mark.asyncio
+async def test_annuity_functions_overflow_raises_value_error():
+    with pytest.raises(ValueError, match="overflows for rate=1.0, nper=2000"):
+        await fv(FvInput(rate=1, nper=2000, pmt=-1))
+    with pytest.raises(ValueError, match="overflows"):
+        await pv(PvInput(rate=1, nper=2000, pmt=-1))
+    with pytest.raises(ValueError, match="overflows"):
+        await pmt(PmtInput(rate=1, nper=2000, pv=100))
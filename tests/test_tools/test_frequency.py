@@ -0,0 +1,81 @@
+import random
+from collections import Counter
+import pytest
+from src.mcp_server.tools.frequency import HyperLogLog, SpaceSaving, top_counts
+from src.mcp_server.tools.statistics_tool import frequencies, mode
+from src.mcp_server.models.schemas import StatisticsInput
+from src.mcp_server.state.summary_cache import SummaryCache
+
+def _skewed(count, seed):
+    rng = random.Random(seed)
+    return [float(int(rng.paretovariate(1.2))) for _ in range(count)]
+
+def test_top_counts():
+    counter = Counter([1.0, 2.0, 2.0, 3.0, 3.0, 3.0])
+    assert top_counts(counter, 2) == [{"value": 3.0, "count": 3}, {"value": 2.0, "count": 2}]
+    assert len(top_counts(counter)) == 3
+
+def test_space_saving_bounds():
+    values = _skewed(100_000, 1)
+    exact = Counter(values)
+    summary = SpaceSaving(20)
+    for start in range(0, len(values), 7000):
+        summary.add(values[start:start + 7000])
+    assert len(summary.counts) == 20
+    for item in summary.top():
+        true_count = exact[item["value"]]
+        assert item["count"] - item["error"] <= true_count <= item["count"]
+    # Every value above n/k occurrences is kept
+    for value, count in exact.items():
+        if count > len(values) / 20:
+            assert value in summary.counts
+    assert [item["value"] for item in summary.top(3)] == [value for value, _ in exact.most_common(3)]
+
+def test_space_saving_merge_and_round_trip():
+    values = _skewed(60_000, 2)
+    left, right = SpaceSaving(15), SpaceSaving(15)
+    left.add(values[:30_000])
+    right.add(values[30_000:])
+    left.merge(right)
+    exact = Counter(values)
+    for item in left.top(5):
+        assert item["count"] - item["error"] <= exact[item["value"]] <= item["count"]
+    restored = SpaceSaving.from_dict(left.to_dict())
+    assert restored.top() == left.top()
+    with pytest.raises(ValueError, match="more values than k"):
+        SpaceSaving.from_dict({**left.to_dict(), "k": 2})
+
+def test_hyperloglog_estimates_and_merges():
+    rng = random.Random(3)
+    values = [rng.random() for _ in range(50_000)]
+    sketch = HyperLogLog()
+    sketch.add(values + values[:10_000])
+    assert sketch.estimate() == pytest.approx(50_000, rel=0.05)
+    small = HyperLogLog()
+    small.add([1.0, 2.0, 3.0, 2.0])
+    assert small.estimate() == 3
+    left, right = HyperLogLog(), HyperLogLog()
+    left.add(values[:30_000])
+    right.add(values[20_000:])
+    left.merge(right)
+    assert left.registers == sketch.registers
+    assert HyperLogLog.from_dict(left.to_dict()).estimate() == left.estimate()
+    with pytest.raises(ValueError, match="precision"):
+        left.merge(HyperLogLog(10))
+
+@pytest.mark.asyncio
+async def test_frequencies_tool_and_mode_share_counts():
+    values = [1.0, 2.0, 2.0, 3.0, 3.0, 3.0]
+    result = await frequencies(StatisticsInput(numbers=values), 2)
+    assert result == {
+        "count": 6, "distinct": 3, "top": [{"value": 3.0, "count": 3}, {"value": 2.0, "count": 2}]
+    }
+    assert len((await frequencies(StatisticsInput(numbers=values), None))["top"]) == 3
+    cache = SummaryCache()
+    summary = cache.get("digest", values)
+    assert await mode(StatisticsInput(numbers=values), summary=summary) == 3.0
+    misses = cache.misses
+    await frequencies(StatisticsInput(numbers=values), summary=summary)
+    assert cache.misses == misses
+    with pytest.raises(ValueError, match="k must be"):
+        await frequencies(StatisticsInput(numbers=values), 0)
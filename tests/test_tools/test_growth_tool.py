@@ -0,0 +1,69 @@
+import math
+import pytest
+from src.mcp_server.tools.growth_tool import compound_growth, balance_series, sample_indices
+from src.mcp_server.models.schemas import CompoundGrowthInput
+
+def test_balance_series_matches_closed_form():
+    balances = balance_series(1000, 1.01, 120)
+    assert len(balances) == 121
+    for k in (0, 1, 60, 120):
+        assert balances[k] == pytest.approx(1000 * 1.01 ** k, rel=1e-12)
+    with_contributions = balance_series(0, 1.01, 12, contribution=100)
+    assert with_contributions[-1] == pytest.approx(100 * (1.01 ** 12 - 1) / 0.01)
+    in_advance = balance_series(0, 1.01, 12, contribution=100, when="begin")
+    assert in_advance[-1] == pytest.approx(with_contributions[-1] * 1.01)
+
+def test_sample_indices_keeps_ends():
+    assert sample_indices(5, None) == [0, 1, 2, 3, 4]
+    assert sample_indices(5, 10) == [0, 1, 2, 3, 4]
+    indices = sample_indices(36501, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 36500
+
+@pytest.mark.asyncio
+async def test_compound_growth_annual():
+    result = await compound_growth(CompoundGrowthInput(principal=1000, annual_rate=5, years=10, compounding="annually"))
+    assert result["final_balance"] == 1628.89
+    assert result["total_interest"] == 628.89
+    assert result["effective_annual_rate"] == pytest.approx(0.05)
+    assert result["series"]["period"] == list(range(11))
+    assert result["series"]["balance"][2] == 1102.5
+
+@pytest.mark.asyncio
+async def test_compound_growth_frequencies():
+    monthly = await compound_growth(CompoundGrowthInput(principal=1000, annual_rate=6, years=1))
+    assert monthly["periods"] == 12
+    assert monthly["effective_annual_rate"] == pytest.approx(1.005 ** 12 - 1)
+    continuous = await compound_growth(CompoundGrowthInput(principal=1000, annual_rate=5, years=10, compounding="continuous"))
+    assert continuous["final_balance"] == pytest.approx(1000 * math.exp(0.5), abs=0.01)
+    assert continuous["effective_annual_rate"] == pytest.approx(math.exp(0.05) - 1)
+
+@pytest.mark.asyncio
+async def test_compound_growth_contributions_and_downsample():
+    result = await compound_growth(CompoundGrowthInput(
+        principal=0, annual_rate=5, years=40, compounding="daily", contribution=10, downsample=100
+    ))
+    assert result["periods"] == 14600
+    assert result["total_contributions"] == 146000
+    series = result["series"]
+    assert len(series["period"]) == 100
+    assert series["period"][-1] == 14600 and series["years"][-1] == 40
+    assert series["balance"][-1] == result["final_balance"]
+    assert series["contributed"][-1] == 146000
+
+def test_compound_growth_validation():
+    with pytest.raises(ValueError):
+        CompoundGrowthInput(principal=1000, annual_rate=5, years=0)
+    with pytest.raises(ValueError):
+        CompoundGrowthInput(principal=1000, annual_rate=5, years=1, compounding="hourly")
+    with pytest.raises(ValueError):
+        CompoundGrowthInput(principal=1000, annual_rate=5, years=1, downsample=1)
+
+@pytest.mark.asyncio
+async def test_compound_growth_rejects_fractional_periods():
+    assert (await compound_growth(CompoundGrowthInput(principal=1000, annual_rate=6, years=2.25)))["periods"] == 27
+    assert (await compound_growth(CompoundGrowthInput(principal=1000, annual_rate=6, years=7 / 12)))["periods"] == 7
+    with pytest.raises(ValueError, match="whole number of annually periods"):
+        await compound_growth(CompoundGrowthInput(principal=1000, annual_rate=5, years=2.5, compounding="annually"))
+    with pytest.raises(ValueError, match="whole number of monthly periods"):
+        await compound_growth(CompoundGrowthInput(principal=1000, annual_rate=5, years=0.01))
@@ -0,0 +1,33 @@
+import pytest
+from datetime import datetime, timezone
+from src.mcp_server.tools.history_tool import query_history
+from src.mcp_server.models.schemas import HistoryQueryInput
+from src.mcp_server.state.history import HistoryStore
+
+@pytest.mark.asyncio
+async def test_query_history_returns_records():
+    store = HistoryStore()
+    store.record("add", {"a": 1, "b": 2}, 3.0)
+    store.record("quartiles", {"numbers": [1, 2, 3]}, {"Q1": 1.5, "Q2": 2, "Q3": 2.5})
+    result = await query_history(HistoryQueryInput(), store)
+    assert result["total"] == 2
+    assert result["records"][0]["operation"] == "quartiles"
+    assert result["records"][1]["result"] == 3.0
+    assert result["records"][1]["timestamp"].endswith("Z")
+
+@pytest.mark.asyncio
+async def test_query_history_filters():
+    store = HistoryStore()
+    store.record("add", {}, 1, timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp())
+    store.record("add", {}, 2, timestamp=datetime(2025, 1, 2, tzinfo=timezone.utc).timestamp())
+    store.record("mean", {}, 3, timestamp=datetime(2025, 1, 3, tzinfo=timezone.utc).timestamp())
+    query = HistoryQueryInput(operation="add", since="2025-01-02T00:00:00")
+    result = await query_history(query, store)
+    assert result["total"] == 1
+    assert result["records"][0]["result"] == 2
+
+def test_history_query_limit_validation():
+    with pytest.raises(ValueError):
+        HistoryQueryInput(limit=0)
+    with pytest.raises(ValueError):
+        HistoryQueryInput(offset=-1)
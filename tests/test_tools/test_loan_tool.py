@@ -0,0 +1,123 @@
+import pytest
+from src.mcp_server.tools.loan_tool import amortization_schedule, build_schedule, compare_loans, periodic_payment
+from src.mcp_server.models.schemas import AmortizationInput, LoanComparisonInput
+
+def test_periodic_payment_matches_formula():
+    r, n = 0.005, 360
+    expected = 200000 * r * (1 + r) ** n / ((1 + r) ** n - 1)
+    assert periodic_payment(200000, r, n) == pytest.approx(expected)
+    assert periodic_payment(1200, 0.0, 12) == 100
+
+def test_build_schedule_balances_in_cents():
+    payment, columns = build_schedule(200000, 0.005, 360)
+    assert payment == 119910
+    assert len(columns["payment"]) == 360
+    assert columns["balance"][-1] == 0
+    assert sum(columns["principal"]) == 20_000_000
+    for paid, interest, principal in zip(columns["payment"], columns["interest"], columns["principal"]):
+        assert paid == interest + principal
+    assert columns["interest"][0] == 100000
+
+@pytest.mark.asyncio
+async def test_amortization_summary():
+    result = await amortization_schedule(AmortizationInput(
+        principal=200000, annual_rate=6, term_years=30, output="summary"
+    ))
+    assert result["payment"] == 1199.10
+    assert result["payoff_period"] == result["periods"] == 360
+    assert result["total_interest"] == pytest.approx(result["total_paid"] - 200000)
+    assert "schedule" not in result
+
+@pytest.mark.asyncio
+async def test_amortization_rows_page():
+    result = await amortization_schedule(AmortizationInput(
+        principal=200000, annual_rate=6, term_years=30, offset=10, limit=3
+    ))
+    assert result["total"] == 360
+    assert result["offset"] == 10
+    assert [row["period"] for row in result["schedule"]] == [11, 12, 13]
+    assert set(result["schedule"][0]) == {"period", "payment", "interest", "principal", "balance"}
+
+@pytest.mark.asyncio
+async def test_amortization_columns_match_rows():
+    loan = dict(principal=50000, annual_rate=4.5, term_years=5, payments_per_year=26)
+    rows = await amortization_schedule(AmortizationInput(**loan))
+    columns = await amortization_schedule(AmortizationInput(**loan, output="columns"))
+    assert columns["schedule"]["period"] == list(range(1, 131))
+    for name in ("payment", "interest", "principal", "balance"):
+        assert columns["schedule"][name] == [row[name] for row in rows["schedule"]]
+
+@pytest.mark.asyncio
+async def test_amortization_extra_payment_pays_off_early():
+    base = await amortization_schedule(AmortizationInput(
+        principal=200000, annual_rate=6, term_years=30, output="summary"
+    ))
+    extra = await amortization_schedule(AmortizationInput(
+        principal=200000, annual_rate=6, term_years=30, extra_payment=200, output="summary"
+    ))
+    assert extra["payoff_period"] < 360
+    assert extra["total_interest"] < base["total_interest"]
+
+@pytest.mark.asyncio
+async def test_amortization_zero_rate_and_offset_past_end():
+    result = await amortization_schedule(AmortizationInput(principal=1200, annual_rate=0, term_years=1))
+    assert [row["payment"] for row in result["schedule"]] == [100.0] * 12
+    assert result["total_interest"] == 0
+    with pytest.raises(ValueError, match="past the end"):
+        await amortization_schedule(AmortizationInput(principal=1200, annual_rate=0, term_years=1, offset=12))
+
+def test_amortization_validation():
+    with pytest.raises(ValueError):
+        AmortizationInput(principal=0, annual_rate=5, term_years=30)
+    with pytest.raises(ValueError):
+        AmortizationInput(principal=1000, annual_rate=5, term_years=30, payments_per_year=7)
+    with pytest.raises(ValueError):
+        AmortizationInput(principal=1000, annual_rate=5, term_years=30, limit=0)
+
+@pytest.mark.asyncio
+async def test_compare_loans_grid_order_and_count():
+    result = await compare_loans(LoanComparisonInput(
+        principals=[100000, 200000], annual_rates=[5, 6], term_years=[15, 30], extra_payments=[0, 100]
+    ))
+    assert result["count"] == 16
+    keys = [(s["principal"], s["annual_rate"], s["term_years"], s["extra_payment"]) for s in result["scenarios"]]
+    assert keys[:3] == [(100000, 5, 15, 0), (100000, 5, 15, 100), (100000, 5, 30, 0)]
+    assert keys[-1] == (200000, 6, 30, 100)
+
+@pytest.mark.asyncio
+async def test_compare_loans_matches_schedule():
+    result = await compare_loans(LoanComparisonInput(
+        principals=[200000], annual_rates=[6], term_years=[30], extra_payments=[0, 200], output="columns"
+    ))
+    scenarios = result["scenarios"]
+    for index, extra in enumerate([0, 200]):
+        schedule = await amortization_schedule(AmortizationInput(
+            principal=200000, annual_rate=6, term_years=30, extra_payment=extra, output="summary"
+        ))
+        assert scenarios["payoff_period"][index] == schedule["payoff_period"]
+        assert scenarios["total_interest"][index] == pytest.approx(schedule["total_interest"], abs=5)
+    assert scenarios["payment"] == [1199.10, 1199.10]
+    assert scenarios["periods_saved"] == [0, 108]
+    assert scenarios["interest_saved"][1] == pytest.approx(
+        scenarios["total_interest"][0] - scenarios["total_interest"][1], abs=0.02
+    )
+
+@pytest.mark.asyncio
+async def test_compare_loans_zero_rate_and_large_extra():
+    result = await compare_loans(LoanComparisonInput(
+        principals=[1200], annual_rates=[0], term_years=[1], extra_payments=[50, 5000]
+    ))
+    first, second = result["scenarios"]
+    assert first["payoff_period"] == 8 and first["total_interest"] == 0
+    assert second["payoff_period"] == 1
+
+def test_compare_loans_validation():
+    with pytest.raises(ValueError):
+        LoanComparisonInput(principals=[-1], annual_rates=[5], term_years=[30])
+    with pytest.raises(ValueError):
+        LoanComparisonInput(principals=[1000], annual_rates=[5], term_years=[60])
+    with pytest.raises(ValueError, match="scenarios"):
+        LoanComparisonInput(
+            principals=list(range(1, 101)), annual_rates=list(range(1, 101)), term_years=list(range(1, 11)),
+            extra_payments=[0, 1]
+        )
@@ -0,0 +1,82 @@
+import random
+import statistics
+import pytest
+from src.mcp_server.tools.order_statistics import select_ranks, percentiles, median
+
+def _reference_percentile(data, p):
+    sorted_data = sorted(data)
+    k = (len(sorted_data) - 1) * p / 100
+    f = int(k)
+    c = k - f
+    if f + 1 < len(sorted_data):
+        return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
+    return sorted_data[f]
+
+def test_select_ranks_matches_sorted():
+    rng = random.Random(7)
+    data = [rng.uniform(-1000, 1000) for _ in range(5000)]
+    ranks = [0, 1, 1249, 2500, 4998, 4999]
+    result = select_ranks(data, ranks)
+    sorted_data = sorted(data)
+    assert result == {rank: sorted_data[rank] for rank in ranks}
+
+def test_select_ranks_with_duplicates():
+    data = [3, 1, 3, 3, 2, 3, 3, 1] * 50
+    sorted_data = sorted(data)
+    result = select_ranks(data, range(len(data)))
+    assert [result[i] for i in range(len(data))] == sorted_data
+
+def test_select_ranks_does_not_modify_input():
+    data = [5, 4, 3, 2, 1] * 20
+    original = list(data)
+    select_ranks(data, [10, 50])
+    assert data == original
+
+def test_select_ranks_out_of_range():
+    with pytest.raises(IndexError):
+        select_ranks([1, 2, 3], [3])
+
+def test_percentiles_vector():
+    rng = random.Random(11)
+    data = [rng.gauss(0, 1) for _ in range(2001)]
+    ps = [1, 5, 25, 50, 75, 95, 99, 33.3]
+    result = percentiles(data, ps)
+    for p, value in zip(ps, result):
+        assert value == pytest.approx(_reference_percentile(data, p))
+
+@pytest.mark.parametrize("data", [[42], [1, 2], [3, 1, 2], [4, 1, 3, 2], list(range(1000, 0, -1))])
+def test_median_matches_statistics(data):
+    assert median(data) == statistics.median(data)
+
+def _count_sorts(monkeypatch):
+    from src.mcp_server.tools import order_statistics
+    calls = []
+    original = order_statistics._sorted_ranks
+    def counting(data, wanted):
+        calls.append(len(wanted))
+        return original(data, wanted)
+    monkeypatch.setattr(order_statistics, "_sorted_ranks", counting)
+    return calls
+
+def test_select_ranks_chooses_selection_or_sort(monkeypatch):
+    # 随机数据的中位数只排序一小段；有序数据和大量秩交给 Timsort
+    calls = _count_sorts(monkeypatch)
+    rng = random.Random(5)
+    data = [rng.random() for _ in range(50000)]
+    assert median(data) == statistics.median(data)
+    assert percentiles(data, [25, 50, 75]) == [_reference_percentile(data, p) for p in (25, 50, 75)]
+    assert calls == []
+    ordered = sorted(data)
+    assert median(ordered) == statistics.median(data)
+    assert median(ordered[::-1]) == statistics.median(data)
+    ps = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+    assert percentiles(data, ps) == [_reference_percentile(data, p) for p in ps]
+    assert len(calls) == 3
+
+def test_select_ranks_large_input_with_duplicates():
+    from array import array
+    rng = random.Random(9)
+    data = array("d", (rng.randint(0, 9) for _ in range(30000)))
+    sorted_data = sorted(data)
+    ranks = [0, 14999, 15000, 29999]
+    assert select_ranks(data, ranks) == {rank: sorted_data[rank] for rank in ranks}
@@ -0,0 +1,71 @@
+import base64
+import struct
+from array import array
+
+import pytest
+from src.mcp_server.tools.packed import pack, unpack
+from src.mcp_server.tools import statistics_tool
+from src.mcp_server.tools.batch_tool import run_operation
+from src.mcp_server.tools.stream_tool import stats_stream_open, stats_stream_push, stats_stream_result
+from src.mcp_server.state.streams import StreamRegistry
+from src.mcp_server.models.schemas import StatisticsInput, StreamOpenInput, StreamPushInput, StreamRefInput
+
+
+def test_unpack_base64_little_endian_float64():
+    payload = base64.b64encode(struct.pack("<3d", 1.5, -2.0, 1e300)).decode()
+    values = unpack(payload)
+    assert isinstance(values, array) and values.typecode == "d"
+    assert list(values) == [1.5, -2.0, 1e300]
+    assert unpack(pack([0.1, 0.2, 0.3])).tolist() == [0.1, 0.2, 0.3]
+
+
+def test_unpack_text():
+    assert unpack("1, 2.5;3e2\n-4", "text").tolist() == [1.0, 2.5, 300.0, -4.0]
+
+
+@pytest.mark.parametrize("data, encoding, message", [
+    ("AAAA", "base64", "multiple of 8"),
+    ("not base64!", "base64", "Invalid base64"),
+    ("1, two, 3", "text", "Invalid packed text"),
+    (" , ", "text", "At least one data point"),
+    ("1", "hex", "Unknown encoding"),
+])
+def test_unpack_errors(data, encoding, message):
+    with pytest.raises(ValueError, match=message):
+        unpack(data, encoding)
+
+
+@pytest.mark.asyncio
+async def test_statistics_on_unpacked_buffer_match_list():
+    numbers = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0]
+    packed = StatisticsInput.model_construct(data=unpack(pack(numbers)))
+    plain = StatisticsInput(numbers=numbers)
+    for func in (statistics_tool.mean, statistics_tool.median, statistics_tool.stddev,
+                 statistics_tool.mode, statistics_tool.quartiles, statistics_tool.describe):
+        assert await func(packed) == await func(plain)
+
+
+def test_statistics_input_keeps_one_copy():
+    assert StatisticsInput(numbers=[1, 2]).numbers is None
+
+
+@pytest.mark.asyncio
+async def test_batch_packed_argument():
+    packed = {"data": pack([1, 2, 3, 4])}
+    assert await run_operation("mean", {"packed": packed}) == 2.5
+    assert await run_operation("median", {"packed": {"data": "5 1 3", "encoding": "text"}}) == 3
+    with pytest.raises(ValueError, match="numbers or packed, not both"):
+        await run_operation("sum", {"numbers": [1], "packed": packed})
+    with pytest.raises(ValueError, match="Provide numbers, packed or dataset_id"):
+        await run_operation("sum", {})
+
+
+@pytest.mark.asyncio
+async def test_stream_push_unpacked_chunk():
+    registry = StreamRegistry()
+    info = await stats_stream_open(StreamOpenInput(quantiles=True, top_k=2), registry)
+    chunk = unpack(pack([2, 4, 4, 4, 5, 5, 7, 9]))
+    await stats_stream_push(StreamPushInput.model_construct(stream_id=info["stream_id"], numbers=chunk), registry)
+    result = await stats_stream_result(StreamRefInput(stream_id=info["stream_id"]), registry)
+    assert result["mean"] == 5.0
+    assert result["stddev"] == pytest.approx(2.138089935299395)
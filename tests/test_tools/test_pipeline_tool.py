@@ -0,0 +1,114 @@
+import pytest
+from src.mcp_server.tools import batch_tool, pipeline_tool
+from src.mcp_server.tools.pipeline_tool import pipeline, plan
+from src.mcp_server.models.schemas import PipelineInput
+
+LOAN_STEPS = {
+    "growth": ["add", 1, "$r"],
+    "cf": ["power", "$growth", "$n"],
+    "num": ["multiply", "$r", "$cf"],
+    "den": ["subtract", "$cf", 1],
+    "ratio": ["divide", "$num", "$den"],
+    "payment": ["multiply", "$P", "$ratio"],
+}
+
+@pytest.mark.asyncio
+async def test_pipeline_loan_payment_returns_intermediates():
+    result = await pipeline(PipelineInput(
+        steps=LOAN_STEPS, inputs={"P": 200000, "r": 0.005, "n": 360}
+    ))
+    assert result["status"] == "success"
+    assert result["errors"] == {}
+    assert set(result["results"]) == set(LOAN_STEPS)
+    assert result["results"]["payment"] == pytest.approx(1199.10, abs=0.01)
+    order = result["order"]
+    assert order.index("cf") < order.index("num") < order.index("ratio") < order.index("payment")
+
+@pytest.mark.asyncio
+async def test_pipeline_dict_steps_and_field_references():
+    result = await pipeline(PipelineInput(steps={
+        "q": {"op": "quartiles", "args": {"numbers": [1, 2, 3, 4, 5]}},
+        "spread": ["subtract", "$q.Q3", "$q.Q1"],
+        "values": ["add_many", [1, 2, 3], "$spread"],
+        "avg": ["mean", "$values"],
+    }))
+    assert result["results"]["spread"] == 2
+    assert result["results"]["values"] == [3, 4, 5]
+    assert result["results"]["avg"] == 4
+
+@pytest.mark.asyncio
+async def test_pipeline_memoizes_identical_steps(monkeypatch):
+    calls = []
+    original = batch_tool.run_operation
+
+    async def counting(op, args, resolve_dataset=None):
+        calls.append(op)
+        return await original(op, args, resolve_dataset)
+
+    monkeypatch.setattr(pipeline_tool, "run_operation", counting)
+    result = await pipeline(PipelineInput(steps={
+        "a": ["power", 1.005, 360],
+        "b": ["power", 1.005, 360],
+        "c": ["add", "$a", "$b"],
+    }))
+    assert result["results"]["a"] == result["results"]["b"]
+    assert calls.count("power") == 1
+
+@pytest.mark.asyncio
+async def test_pipeline_failure_propagates_to_dependents_only():
+    result = await pipeline(PipelineInput(steps={
+        "bad": ["divide", 1, 0],
+        "after": ["add", "$bad", 1],
+        "ok": ["add", 1, 1],
+    }))
+    assert result["status"] == "partial"
+    assert result["errors"]["bad"] == "Division by zero"
+    assert "bad" in result["errors"]["after"]
+    assert result["results"] == {"ok": 2}
+
+@pytest.mark.asyncio
+async def test_pipeline_missing_field_reference():
+    result = await pipeline(PipelineInput(steps={
+        "x": ["add", 1, 2],
+        "y": ["add", "$x.Q1", 1],
+    }))
+    assert "no field" in result["errors"]["y"]
+
+def test_plan_rejects_cycles_and_unknown_references():
+    with pytest.raises(ValueError, match="cycle"):
+        plan(PipelineInput(steps={"a": ["add", "$b", 1], "b": ["add", "$a", 1]}).steps)
+    with pytest.raises(ValueError, match=r"unknown reference\(s\): \$missing"):
+        plan(PipelineInput(steps={"a": ["add", "$missing", 1]}).steps)
+    with pytest.raises(ValueError, match="unknown operation"):
+        plan(PipelineInput(steps={"a": ["frobnicate", 1]}).steps)
+    with pytest.raises(ValueError, match="at most 2"):
+        plan(PipelineInput(steps={"a": ["add", 1, 2, 3]}).steps)
+    with pytest.raises(ValueError, match="both inputs and steps"):
+        plan(PipelineInput(steps={"a": ["add", 1, 2]}).steps, {"a": 1})
+
+def test_pipeline_input_validation():
+    with pytest.raises(ValueError):
+        PipelineInput(steps={"a.b": ["add", 1, 2]})
+    with pytest.raises(ValueError):
+        PipelineInput(steps={"a": []})
+
+@pytest.mark.asyncio
+async def test_pipeline_malformed_step_fails_alone():
+    result = await pipeline(PipelineInput(steps={
+        "bad": {"op": "describe", "args": {"numbers": [1, 2], "stats": 5}},
+        "ok": ["add", 1, 1],
+    }))
+    assert result["status"] == "partial"
+    assert "bad" in result["errors"]
+    assert result["results"] == {"ok": 2}
+
+def test_list_steps_follow_the_batch_operation_table(monkeypatch):
+    _, steps, _ = plan({"p": ["percentile", [1, 2, 3], 50]})
+    assert steps["p"] == ("percentile", {"numbers": [1, 2, 3], "p": 50})
+    # 仅限关键字的参数不能按位置传入
+    with pytest.raises(ValueError, match="takes at most 1 argument"):
+        plan({"m": ["mean", [1, 2], "python"]})
+    handler, _, keyword_only = batch_tool.OPERATIONS["mean"]
+    monkeypatch.setitem(batch_tool.OPERATIONS, "mean", (handler, (), keyword_only))
+    with pytest.raises(ValueError, match="no positional arguments"):
+        plan({"m": ["mean", [1, 2]]})
@@ -20,4 +20,9 @@ async def test_power_operations(base, exponent, expected):
 async def test_power_zero_base():
     input_data = PowerInput(base=0, exponent=5)
     result = await power(input_data)
-    assert result == 0
\ No newline at end of file
+    assert result == 0
+
+@pytest.mark.asyncio
+async def test_power_overflow_raises_value_error():
+    with pytest.raises(ValueError, match="Result too large"):
+        await power(PowerInput(base=10, exponent=400))
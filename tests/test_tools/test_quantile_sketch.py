@@ -0,0 +1,70 @@
+import bisect
+import json
+import random
+import pytest
+from src.mcp_server.tools.quantile_sketch import TDigest
+from src.mcp_server.tools import order_statistics
+from src.mcp_server.tools.statistics_tool import percentile
+from src.mcp_server.models.schemas import StatisticsInput
+from src.mcp_server.state.summary_cache import SummaryCache
+
+def _rank_error(sorted_values, estimate, p):
+    return abs(bisect.bisect_left(sorted_values, estimate) / len(sorted_values) * 100 - p)
+
+def test_small_inputs_match_exact_percentiles():
+    values = [3, 1, 2, 10, 7, 7, 4]
+    digest = TDigest.of(values)
+    ps = (0, 10, 25, 50, 90, 100)
+    assert digest.percentiles(ps) == pytest.approx(order_statistics.percentiles(values, ps))
+
+def test_large_stream_stays_small_and_accurate():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 1) for _ in range(200_000)]
+    digest = TDigest()
+    for start in range(0, len(values), 5000):
+        digest.add(values[start:start + 5000])
+    digest.compress()
+    assert len(digest.means) <= 100
+    ordered = sorted(values)
+    for p in (0.1, 1, 10, 50, 90, 99, 99.9):
+        assert _rank_error(ordered, digest.percentile(p), p) < 0.2
+    assert digest.percentile(0) == ordered[0] and digest.percentile(100) == ordered[-1]
+
+def test_merge_matches_single_digest():
+    rng = random.Random(11)
+    values = [rng.gauss(0, 1) for _ in range(50_000)]
+    shards = [TDigest.of(values[i::4]) for i in range(4)]
+    merged = TDigest()
+    for shard in shards:
+        merged.merge(shard)
+    assert merged.count == 50_000
+    ordered = sorted(values)
+    for p in (1, 25, 50, 75, 99):
+        assert _rank_error(ordered, merged.percentile(p), p) < 0.3
+
+def test_serialization_round_trip():
+    digest = TDigest.of([float(i) for i in range(10_000)], compression=50)
+    state = json.loads(json.dumps(digest.to_dict()))
+    restored = TDigest.from_dict(state)
+    assert restored.percentiles([5, 50, 95]) == digest.percentiles([5, 50, 95])
+    state["weights"][0] += 1
+    with pytest.raises(ValueError, match="Invalid digest state"):
+        TDigest.from_dict(state)
+
+def test_digest_errors():
+    with pytest.raises(ValueError, match="empty"):
+        TDigest().percentile(50)
+    with pytest.raises(ValueError, match="compression"):
+        TDigest(5)
+
+@pytest.mark.asyncio
+async def test_percentile_approximate_mode():
+    values = [float(i) for i in range(1, 10_001)]
+    exact = await percentile(StatisticsInput(numbers=values), 90)
+    approximate = await percentile(StatisticsInput(numbers=values), 90, approximate=True)
+    assert approximate == pytest.approx(exact, rel=2e-3)
+    summary = SummaryCache().get("digest", values)
+    await percentile(StatisticsInput(numbers=values), 50, summary=summary, approximate=True)
+    misses = summary._cache.misses
+    await percentile(StatisticsInput(numbers=values), 75, summary=summary, approximate=True)
+    assert summary._cache.misses == misses
@@ -0,0 +1,121 @@
+import math
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+from src.mcp_server.tools import simulate_tool
+from src.mcp_server.tools.simulate_tool import simulate, run_shard, merge_shards, shard_seed
+from src.mcp_server.models.schemas import SimulateInput
+
+@pytest.mark.asyncio
+async def test_simulate_same_seed_same_result():
+    first = await simulate(SimulateInput(experiment="dice", dice=2, trials=20_000, seed=7))
+    second = await simulate(SimulateInput(experiment="dice", dice=2, trials=20_000, seed=7))
+    assert first == second
+    other = await simulate(SimulateInput(experiment="dice", dice=2, trials=20_000, seed=8))
+    assert other["mean"] != first["mean"]
+
+@pytest.mark.asyncio
+async def test_simulate_random_seed_is_reported():
+    result = await simulate(SimulateInput(experiment="dice", trials=1000))
+    again = await simulate(SimulateInput(experiment="dice", trials=1000, seed=result["seed"]))
+    assert again == result
+
+@pytest.mark.asyncio
+async def test_simulate_dice_distribution():
+    result = await simulate(SimulateInput(experiment="dice", trials=60_000, seed=1))
+    assert result["min"] == 1 and result["max"] == 6
+    assert [row["value"] for row in result["distribution"]] == [1, 2, 3, 4, 5, 6]
+    assert sum(row["count"] for row in result["distribution"]) == 60_000
+    for row in result["distribution"]:
+        assert row["probability"] == pytest.approx(1 / 6, abs=0.01)
+    assert result["mean"] == pytest.approx(3.5, abs=0.05)
+    assert result["variance"] == pytest.approx(35 / 12, rel=0.03)
+
+@pytest.mark.asyncio
+async def test_simulate_binomial_and_discrete_moments():
+    binomial = await simulate(SimulateInput(experiment="binomial", n=20, p=0.3, trials=50_000, seed=3))
+    assert binomial["mean"] == pytest.approx(6.0, abs=0.1)
+    assert binomial["variance"] == pytest.approx(4.2, rel=0.05)
+    discrete = await simulate(SimulateInput(
+        experiment="discrete", values=[0, 10], weights=[3, 1], draws=2, trials=50_000, seed=3
+    ))
+    assert discrete["mean"] == pytest.approx(5.0, abs=0.15)
+    assert {row["value"] for row in discrete["distribution"]} == {0, 10, 20}
+
+@pytest.mark.asyncio
+async def test_simulate_draw_without_replacement():
+    result = await simulate(SimulateInput(
+        experiment="draw", values=[1, 2, 3, 4], draws=4, replace=False, trials=1000, seed=5
+    ))
+    assert result["min"] == result["max"] == 10
+    assert result["variance"] == 0.0
+
+def test_merge_shards_matches_single_pass():
+    spec = {"experiment": "binomial", "n": 10_000, "p": 0.5}
+    shards = [run_shard(spec, 5000, shard_seed(11, i)) for i in range(3)]
+    count, mean, m2, low, high, counts = merge_shards(shards)
+    outcomes = [value for shard in shards for value, n in shard[5].items() for _ in range(n)]
+    expected_mean = math.fsum(outcomes) / len(outcomes)
+    assert count == 15_000
+    assert mean == pytest.approx(expected_mean)
+    assert m2 == pytest.approx(math.fsum((x - expected_mean) ** 2 for x in outcomes))
+    assert (low, high) == (min(outcomes), max(outcomes))
+
+@pytest.mark.asyncio
+async def test_simulate_many_distinct_outcomes_omits_distribution(monkeypatch):
+    monkeypatch.setattr(simulate_tool, "MAX_DISTINCT", 10)
+    result = await simulate(SimulateInput(experiment="dice", dice=5, trials=5000, seed=2))
+    assert result["distribution"] is None
+    assert result["mean"] == pytest.approx(17.5, abs=0.2)
+
+@pytest.mark.asyncio
+async def test_simulate_worker_processes_match_in_process(monkeypatch):
+    input_data = SimulateInput(experiment="dice", dice=3, trials=4000, seed=42)
+    monkeypatch.setattr(simulate_tool, "SHARD_TRIALS", 1000)
+    in_process = await simulate(input_data)
+    monkeypatch.setattr(simulate_tool, "PROCESS_THRESHOLD", 100)
+    ctx = AsyncMock()
+    try:
+        pooled = await simulate(input_data, ctx)
+    finally:
+        simulate_tool.process_pool.shutdown()
+    assert pooled == in_process
+    ctx.report_progress.assert_called_with(4, 4)
+
+@pytest.mark.asyncio
+async def test_simulate_offloads_by_total_samples(monkeypatch):
+    used = []
+
+    def executor():
+        used.append(True)
+        return ThreadPoolExecutor(max_workers=2)
+
+    monkeypatch.setattr(simulate_tool.process_pool, "get_executor", executor)
+    # 试验次数少但每次 100 个骰子: 共 50 万个样本，不在事件循环中运行
+    await simulate(SimulateInput(experiment="dice", dice=100, trials=5000, seed=1))
+    assert used
+    used.clear()
+    await simulate(SimulateInput(experiment="dice", dice=2, trials=5000, seed=1))
+    assert not used
+
+@pytest.mark.asyncio
+async def test_simulate_draws_in_blocks_gives_same_result(monkeypatch):
+    input_data = SimulateInput(experiment="discrete", values=[1, 2, 5], weights=[3, 2, 1], draws=7, trials=3000, seed=4)
+    whole = await simulate(input_data)
+    # 每块只生成 50 个样本 (7 次试验)
+    monkeypatch.setattr(simulate_tool, "BLOCK_DRAWS", 50)
+    assert await simulate(input_data) == whole
+
+def test_simulate_validation():
+    with pytest.raises(ValueError):
+        SimulateInput(experiment="draw")
+    with pytest.raises(ValueError):
+        SimulateInput(experiment="discrete", values=[1, 2], weights=[1])
+    with pytest.raises(ValueError):
+        SimulateInput(experiment="discrete", values=[1, 2], weights=[0, 0])
+    with pytest.raises(ValueError):
+        SimulateInput(experiment="draw", values=[1, 2], draws=3, replace=False)
+    with pytest.raises(ValueError):
+        SimulateInput(experiment="dice", trials=0)
+    with pytest.raises(ValueError):
+        SimulateInput(experiment="binomial", p=1.5)
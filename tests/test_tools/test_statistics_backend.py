@@ -0,0 +1,84 @@
+import random
+
+import pytest
+from src.mcp_server.tools import statistics_backend, statistics_tool
+from src.mcp_server.tools.batch_tool import run_operation
+from src.mcp_server.models.schemas import StatisticsInput
+
+
+@pytest.fixture(autouse=True)
+def restore_default():
+    yield
+    statistics_backend._default = "auto"
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError, match="Unknown statistics backend"):
+        statistics_backend.configure("fortran")
+    with pytest.raises(ValueError, match="Unknown statistics backend"):
+        statistics_backend.use_numpy("fortran", 10)
+
+
+def test_numpy_backend_requires_numpy(monkeypatch):
+    monkeypatch.setattr(statistics_backend, "np", None)
+    with pytest.raises(ValueError, match="needs NumPy"):
+        statistics_backend.configure("numpy")
+    # auto 在没有 NumPy 时退回 Python
+    assert statistics_backend.use_numpy("auto", 10 ** 6) is False
+
+
+def test_auto_uses_python_for_small_inputs():
+    assert statistics_backend.use_numpy(None, statistics_backend.NUMPY_MIN_SIZE - 1) is False
+    assert statistics_backend.use_numpy("python", 10 ** 6) is False
+    statistics_backend.configure("python")
+    assert statistics_backend.default_backend() == "python"
+    assert statistics_backend.use_numpy(None, 10 ** 6) is False
+
+
+@pytest.mark.asyncio
+async def test_python_backend_and_batch_argument():
+    data = StatisticsInput(data=[1, 2, 2, 3])
+    assert await statistics_tool.mean(data, backend="python") == 2
+    assert await run_operation("median", {"numbers": [3, 1, 2], "backend": "python"}) == 2
+    with pytest.raises(ValueError, match="Unknown statistics backend"):
+        await run_operation("mean", {"numbers": [1, 2], "backend": "fortran"})
+
+
+def _assert_close(actual, expected):
+    # describe 的结果含嵌套字典 (quartiles)，逐键比较
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            _assert_close(actual[key], expected[key])
+    else:
+        assert actual == pytest.approx(expected, rel=statistics_backend.TOLERANCE)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("func", [
+    statistics_tool.mean, statistics_tool.median, statistics_tool.stddev,
+    statistics_tool.variance, statistics_tool.min_value, statistics_tool.max_value,
+    statistics_tool.sum_values, statistics_tool.range_values, statistics_tool.mode,
+    statistics_tool.quartiles, statistics_tool.iqr, statistics_tool.geometric_mean,
+    statistics_tool.harmonic_mean, statistics_tool.describe,
+])
+async def test_numpy_matches_python(func):
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    # 含重复值，使众数和频数有意义
+    data = StatisticsInput(data=[round(rng.lognormvariate(0, 1), 2) for _ in range(2000)])
+    expected = await func(data, backend="python")
+    actual = await func(data, backend="numpy")
+    _assert_close(actual, expected)
+
+
+@pytest.mark.asyncio
+async def test_numpy_frequencies_and_percentiles_match_python():
+    pytest.importorskip("numpy")
+    rng = random.Random(11)
+    data = StatisticsInput(data=[float(rng.randint(0, 50)) for _ in range(1000)])
+    assert (await statistics_tool.frequencies(data, 5, backend="numpy")
+            == await statistics_tool.frequencies(data, 5, backend="python"))
+    for p in (0, 12.5, 50, 99.9, 100):
+        assert (await statistics_tool.percentile(data, p, backend="numpy")
+                == await statistics_tool.percentile(data, p, backend="python"))
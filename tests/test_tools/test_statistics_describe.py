@@ -0,0 +1,49 @@
+import pytest
+from src.mcp_server.tools.statistics_tool import (
+    describe, mean, median, stddev, variance, quartiles, iqr, DESCRIBE_STATS
+)
+from src.mcp_server.models.schemas import StatisticsInput
+
+@pytest.mark.asyncio
+async def test_describe_all_stats():
+    input_data = StatisticsInput(data=[1, 2, 3, 4, 5, 6, 7, 8])
+    result = await describe(input_data)
+    assert set(result) == set(DESCRIBE_STATS)
+    assert result["count"] == 8
+    assert result["sum"] == 36
+    assert result["min_value"] == 1
+    assert result["max_value"] == 8
+    assert result["range_stat"] == 7
+
+@pytest.mark.asyncio
+async def test_describe_matches_individual_tools():
+    input_data = StatisticsInput(data=[3.5, 1.25, 9.0, 4.75, 2.0, 7.5, 6.25])
+    result = await describe(input_data)
+    assert result["mean"] == pytest.approx(await mean(input_data))
+    assert result["median"] == pytest.approx(await median(input_data))
+    assert result["stddev"] == pytest.approx(await stddev(input_data))
+    assert result["variance"] == pytest.approx(await variance(input_data))
+    assert result["iqr"] == pytest.approx(await iqr(input_data))
+    expected = await quartiles(input_data)
+    for key in ("Q1", "Q2", "Q3"):
+        assert result["quartiles"][key] == pytest.approx(expected[key])
+
+@pytest.mark.asyncio
+async def test_describe_selected_stats():
+    input_data = StatisticsInput(data=[1, 2, 3, 4, 5])
+    result = await describe(input_data, ["mean", "iqr"])
+    assert result == {"mean": 3.0, "iqr": pytest.approx(2.0)}
+
+@pytest.mark.asyncio
+async def test_describe_single_value():
+    input_data = StatisticsInput(data=[42])
+    result = await describe(input_data)
+    assert result["variance"] is None
+    assert result["stddev"] is None
+    assert result["quartiles"] == {"Q1": 42, "Q2": 42, "Q3": 42}
+
+@pytest.mark.asyncio
+async def test_describe_unknown_stat_raises():
+    input_data = StatisticsInput(data=[1, 2, 3])
+    with pytest.raises(ValueError, match="Unknown statistic"):
+        await describe(input_data, ["mean", "kurtosis"])
@@ -0,0 +1,57 @@
+import pytest
+import statistics
+from array import array
+from src.mcp_server.tools import statistics_tool
+from src.mcp_server.models.schemas import StatisticsInput
+from src.mcp_server.state.summary_cache import SummaryCache
+
+DATA = [3.5, 1.25, 9.0, 4.75, 2.0, 7.5, 6.25, 4.75]
+
+def _cached():
+    values = array("d", DATA)
+    cache = SummaryCache()
+    return StatisticsInput.model_construct(data=values), cache.get("digest", values), cache
+
+@pytest.mark.parametrize("name", [
+    "mean", "median", "stddev", "min_value", "max_value", "sum_values",
+    "count_values", "range_values", "variance", "mode", "quartiles", "iqr",
+    "geometric_mean", "harmonic_mean",
+])
+@pytest.mark.asyncio
+async def test_summary_results_match_direct(name):
+    input_data, summary, _ = _cached()
+    func = getattr(statistics_tool, name)
+    expected = await func(StatisticsInput(data=DATA))
+    assert await func(input_data, summary=summary) == pytest.approx(expected)
+
+@pytest.mark.asyncio
+async def test_summary_percentile_matches_direct():
+    input_data, summary, _ = _cached()
+    for p in (0, 10, 50, 90, 100):
+        expected = await statistics_tool.percentile(StatisticsInput(data=DATA), p)
+        assert await statistics_tool.percentile(input_data, p, summary=summary) == pytest.approx(expected)
+
+@pytest.mark.asyncio
+async def test_order_statistics_share_sorted_view():
+    input_data, summary, cache = _cached()
+    await statistics_tool.median(input_data, summary=summary)
+    misses = cache.misses
+    await statistics_tool.quartiles(input_data, summary=summary)
+    await statistics_tool.iqr(input_data, summary=summary)
+    await statistics_tool.percentile(input_data, 90, summary=summary)
+    assert cache.misses == misses
+
+@pytest.mark.asyncio
+async def test_stddev_after_mean_reuses_sum():
+    input_data, summary, cache = _cached()
+    assert await statistics_tool.mean(input_data, summary=summary) == statistics.mean(DATA)
+    await statistics_tool.stddev(input_data, summary=summary)
+    assert cache.hits >= 1
+
+@pytest.mark.asyncio
+async def test_describe_with_summary():
+    input_data, summary, _ = _cached()
+    expected = await statistics_tool.describe(StatisticsInput(data=DATA))
+    result = await statistics_tool.describe(input_data, summary=summary)
+    for key in ("count", "sum", "mean", "median", "stddev", "variance", "iqr"):
+        assert result[key] == pytest.approx(expected[key])
@@ -0,0 +1,114 @@
+import statistics
+import pytest
+from src.mcp_server.tools.stream_tool import (
+    stats_stream_open, stats_stream_push, stats_stream_result, stats_stream_merge, stats_stream_close,
+    stats_stream_percentile, stats_stream_export, stats_stream_import, stats_stream_frequencies
+)
+from src.mcp_server.models.schemas import (
+    StreamOpenInput, StreamPushInput, StreamRefInput, StreamMergeInput, StreamPercentileInput, StreamImportInput,
+    StreamFrequenciesInput
+)
+from src.mcp_server.state.streams import StreamRegistry
+
+@pytest.mark.asyncio
+async def test_stream_push_and_result():
+    registry = StreamRegistry()
+    info = await stats_stream_open(StreamOpenInput(), registry)
+    assert info["count"] == 0 and info["higher_moments"] is False
+    stream_id = info["stream_id"]
+    await stats_stream_push(StreamPushInput(stream_id=stream_id, numbers=[2, 4, 4, 4]), registry)
+    pushed = await stats_stream_push(StreamPushInput(stream_id=stream_id, numbers=[5, 5, 7, 9]), registry)
+    assert pushed["count"] == 8
+    result = await stats_stream_result(StreamRefInput(stream_id=stream_id), registry)
+    assert result["mean"] == 5.0
+    assert result["sum"] == 40.0
+    assert result["variance"] == pytest.approx(statistics.variance([2, 4, 4, 4, 5, 5, 7, 9]))
+    assert (result["min_value"], result["max_value"]) == (2, 9)
+    assert "skewness" not in result
+
+@pytest.mark.asyncio
+async def test_stream_merge_and_close():
+    registry = StreamRegistry()
+    shards = [[1, 2, 3], [4, 5], [6, 7, 8, 9]]
+    ids = []
+    for shard in shards:
+        info = await stats_stream_open(StreamOpenInput(higher_moments=True), registry)
+        await stats_stream_push(StreamPushInput(stream_id=info["stream_id"], numbers=shard), registry)
+        ids.append(info["stream_id"])
+    merged = await stats_stream_merge(StreamMergeInput(stream_ids=ids), registry)
+    assert merged["count"] == 9 and merged["higher_moments"] is True
+    result = await stats_stream_result(StreamRefInput(stream_id=merged["stream_id"]), registry)
+    assert result["mean"] == pytest.approx(5.0)
+    assert result["variance"] == pytest.approx(7.5)
+    assert result["skewness"] == pytest.approx(0.0, abs=1e-12)
+    # Sources are unchanged
+    first = await stats_stream_result(StreamRefInput(stream_id=ids[0]), registry)
+    assert first["count"] == 3
+    closed = await stats_stream_close(StreamRefInput(stream_id=ids[0]), registry)
+    assert closed["status"] == "closed"
+    with pytest.raises(ValueError, match="Unknown stream"):
+        await stats_stream_push(StreamPushInput(stream_id=ids[0], numbers=[1]), registry)
+
+@pytest.mark.asyncio
+async def test_stream_quantiles_merge_and_export():
+    registry = StreamRegistry()
+    ids = []
+    for start in (0, 500):
+        info = await stats_stream_open(StreamOpenInput(quantiles=True, compression=50), registry)
+        assert info["quantiles"] is True
+        numbers = [float(i) for i in range(start, start + 500)]
+        await stats_stream_push(StreamPushInput(stream_id=info["stream_id"], numbers=numbers), registry)
+        ids.append(info["stream_id"])
+    merged = await stats_stream_merge(StreamMergeInput(stream_ids=ids), registry)
+    assert merged["quantiles"] is True
+    median = await stats_stream_percentile(StreamPercentileInput(stream_id=merged["stream_id"], p=50), registry)
+    assert median == pytest.approx(499.5, abs=5)
+    state = await stats_stream_export(StreamRefInput(stream_id=merged["stream_id"]), registry)
+    restored = await stats_stream_import(StreamImportInput(state=state), registry)
+    assert restored["count"] == 1000 and restored["stream_id"] != merged["stream_id"]
+    assert await stats_stream_percentile(
+        StreamPercentileInput(stream_id=restored["stream_id"], p=[50, 90]), registry
+    ) == await stats_stream_percentile(StreamPercentileInput(stream_id=merged["stream_id"], p=[50, 90]), registry)
+    result = await stats_stream_result(StreamRefInput(stream_id=restored["stream_id"]), registry)
+    assert result["mean"] == pytest.approx(499.5)
+
+@pytest.mark.asyncio
+async def test_stream_percentile_requires_quantiles():
+    registry = StreamRegistry()
+    info = await stats_stream_open(StreamOpenInput(), registry)
+    await stats_stream_push(StreamPushInput(stream_id=info["stream_id"], numbers=[1, 2]), registry)
+    with pytest.raises(ValueError, match="quantiles=True"):
+        await stats_stream_percentile(StreamPercentileInput(stream_id=info["stream_id"], p=50), registry)
+
+@pytest.mark.asyncio
+async def test_stream_frequencies_merge_and_export():
+    registry = StreamRegistry()
+    ids = []
+    for chunk in ([1, 1, 1, 2, 5], [1, 2, 2, 3, 4]):
+        info = await stats_stream_open(StreamOpenInput(top_k=3, distinct=True), registry)
+        assert info["top_k"] == 3 and info["distinct"] is True
+        await stats_stream_push(StreamPushInput(stream_id=info["stream_id"], numbers=chunk), registry)
+        ids.append(info["stream_id"])
+    merged = await stats_stream_merge(StreamMergeInput(stream_ids=ids), registry)
+    result = await stats_stream_frequencies(StreamFrequenciesInput(stream_id=merged["stream_id"], k=2), registry)
+    assert result["count"] == 10
+    assert [item["value"] for item in result["top"]] == [1.0, 2.0]
+    assert result["top"][0]["count"] - result["top"][0]["error"] <= 4 <= result["top"][0]["count"]
+    assert result["distinct"] == 5
+    state = await stats_stream_export(StreamRefInput(stream_id=merged["stream_id"]), registry)
+    restored = await stats_stream_import(StreamImportInput(state=state), registry)
+    again = await stats_stream_frequencies(StreamFrequenciesInput(stream_id=restored["stream_id"], k=2), registry)
+    assert again["top"] == result["top"] and again["distinct"] == 5
+    plain = await stats_stream_open(StreamOpenInput(), registry)
+    with pytest.raises(ValueError, match="top_k or distinct"):
+        await stats_stream_frequencies(StreamFrequenciesInput(stream_id=plain["stream_id"]), registry)
+
+def test_stream_validation():
+    with pytest.raises(ValueError):
+        StreamPushInput(stream_id="x", numbers=[])
+    with pytest.raises(ValueError):
+        StreamMergeInput(stream_ids=["x"])
+    with pytest.raises(ValueError):
+        StreamPercentileInput(stream_id="x", p=[50, 101])
+    with pytest.raises(ValueError):
+        StreamOpenInput(quantiles=True, compression=5)